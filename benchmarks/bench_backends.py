@@ -0,0 +1,135 @@
+"""
+Compara os backends de inferência em CPU: tempo de carga, latência, fator de
+tempo real, tamanho dos pesos e divergência da transcrição (WER entre as
+palavras de cada backend e as do backend de referência).
+
+Uso:
+    python -m benchmarks.bench_backends --model base --audio input/ligacao.wav
+    python -m benchmarks.bench_backends --model tiny --random-init   # offline, sem os pesos oficiais
+
+Com --random-init os pesos são aleatórios (mesma arquitetura): a velocidade é
+representativa, mas a divergência só tem sentido com os pesos reais.
+"""
+import argparse
+import copy
+import io
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.harness import environment_info
+from benchmarks.stub_model import load_wav, make_synthetic_audio
+from src.core.audio import SAMPLE_RATE
+from src.core.backends import BACKENDS, create_backend
+
+# Dimensões dos checkpoints oficiais, para --random-init
+MODEL_DIMENSIONS = {
+    "tiny": (384, 6, 4),
+    "base": (512, 8, 6),
+    "small": (768, 12, 12),
+}
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Distância de edição entre palavras, normalizada pelo tamanho da referência"""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        current = [i]
+        for j, other in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != other)))
+        previous = current
+    return previous[-1] / len(ref) if ref else float(bool(hyp))
+
+
+def weights_mb(model) -> float:
+    """Tamanho serializado do state_dict (inclui os pesos int8 empacotados)"""
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1024 / 1024
+
+
+def random_model(name: str):
+    import torch
+    from whisper.model import ModelDimensions, Whisper
+
+    state, heads, layers = MODEL_DIMENSIONS[name]
+    torch.manual_seed(0)
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=state, n_audio_head=heads, n_audio_layer=layers,
+        n_vocab=51865, n_text_ctx=448, n_text_state=state, n_text_head=heads, n_text_layer=layers,
+    )
+    return Whisper(dims).eval()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="base", help="Modelo Whisper")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Backends (o primeiro é a referência)")
+    parser.add_argument("--audio", action="append", help="WAV 16 kHz mono (repetível; padrão: áudio sintético)")
+    parser.add_argument("--duration", type=float, default=20, help="Duração do áudio sintético (s)")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetições por arquivo")
+    parser.add_argument("--threads", type=int, help="Threads intra-op do backend cpu-int8")
+    parser.add_argument("--interop-threads", type=int, help="Threads inter-op do backend cpu-int8")
+    parser.add_argument("--language", default="pt", help="Idioma do áudio")
+    parser.add_argument("--random-init", action="store_true", help="Pesos aleatórios (sem download)")
+    parser.add_argument("--output", help="Arquivo JSON com o relatório")
+    args = parser.parse_args()
+
+    audios = [load_wav(path) for path in args.audio] if args.audio else [make_synthetic_audio(args.duration)]
+    audio_seconds = sum(len(a) for a in audios) / SAMPLE_RATE
+    params = {"language": args.language, "fp16": False, "temperature": 0.0, "condition_on_previous_text": False}
+    base_model = random_model(args.model) if args.random_init else None
+
+    report = {"environment": environment_info(), "parameters": vars(args), "backends": {}}
+    reference: List[str] = []
+    for name in args.backends.split(","):
+        options = {}
+        if name == "cpu-int8":
+            options = {"intra_op_threads": args.threads, "inter_op_threads": args.interop_threads}
+        backend = create_backend(name, **options)
+
+        start = time.perf_counter()
+        if base_model is not None:
+            backend.configure()
+            model = backend.prepare(copy.deepcopy(base_model))
+        else:
+            model = backend.load_model(args.model, device="cpu")
+        load_seconds = time.perf_counter() - start
+
+        texts: List[str] = []
+        latencies: List[float] = []
+        for audio in audios:
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                result = model.transcribe(audio, **params)
+                latencies.append(time.perf_counter() - start)
+            texts.append(result["text"])
+        reference = reference or texts
+
+        row: Dict[str, float] = {
+            "load_seconds": round(load_seconds, 3),
+            "weights_mb": round(weights_mb(model), 1),
+            "latency_mean": round(float(np.mean(latencies)), 3),
+            "realtime_factor": round(sum(latencies) / args.repeats / audio_seconds, 4),
+            "wer_vs_reference": round(float(np.mean([word_error_rate(r, t) for r, t in zip(reference, texts)])), 4),
+        }
+        report["backends"][name] = {**row, "info": backend.get_info(), "texts": texts}
+        print(
+            f"{name:>10}: carga {row['load_seconds']:>6.2f}s  pesos {row['weights_mb']:>7.1f} MB  "
+            f"latência {row['latency_mean']:>7.3f}s  RTF {row['realtime_factor']:.4f}  "
+            f"WER vs. referência {row['wer_vs_reference']:.2%}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Relatório gravado em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compara vazão e latência de clipes curtos concorrentes transcritos um a um e
+com o micro-batcher, para diferentes tamanhos máximos de lote.
+
+O stub cobra um custo fixo por passada do modelo (`--overhead`, a leitura dos
+pesos que domina a inferência em lotes pequenos) mais um custo por segundo de
+áudio; com um modelo Whisper real, use `--model` e `--real`.
+
+Uso:
+    python -m benchmarks.bench_batching --concurrency 8 --batch-sizes 1,2,4,8 --max-wait-ms 20
+"""
+import argparse
+import json
+
+from benchmarks.harness import environment_info, run_load
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio
+from src.core.batching import MicroBatcher
+from src.core.model_pool import ModelPool
+from src.core.transcriber import AudioTranscriber
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=64, help="Clipes medidos por configuração")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requisições simultâneas")
+    parser.add_argument("--batch-sizes", default="1,2,4,8", help="Tamanhos máximos de lote (1 = sem batching)")
+    parser.add_argument("--max-wait-ms", type=float, default=20, help="Espera máxima para completar um lote")
+    parser.add_argument("--duration", type=float, default=5, help="Duração de cada clipe (s)")
+    parser.add_argument("--overhead", type=float, default=0.05, help="CPU (s) fixa por passada do stub")
+    parser.add_argument("--cost", type=float, default=0.002, help="CPU (s) por segundo de áudio no stub")
+    parser.add_argument("--model", default="base", help="Modelo Whisper (com --real)")
+    parser.add_argument("--real", action="store_true", help="Usa os pesos reais do Whisper")
+    parser.add_argument("--output", help="Arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    factory = None if args.real else make_stub_factory(cost_per_second=args.cost, pass_overhead=args.overhead)
+    pool = ModelPool(model_factory=factory)
+    clips = [make_synthetic_audio(args.duration, seed=i) for i in range(8)]
+
+    results = {"environment": environment_info(), "parameters": vars(args), "scenarios": {}}
+    for size in [int(s) for s in args.batch_sizes.split(",")]:
+        batcher = MicroBatcher(pool, max_batch_size=size, max_wait_ms=args.max_wait_ms) if size > 1 else None
+        transcriber = AudioTranscriber(model_name=args.model, model_pool=pool, result_cache=False, batcher=batcher)
+        try:
+            row = run_load(
+                lambda i: transcriber.transcribe(clips[i % len(clips)]),
+                args.requests, args.concurrency, warmup=1, units=lambda _: args.duration,
+            )
+            if batcher is not None:
+                row["mean_batch_size"] = batcher.get_stats()["mean_batch_size"]
+        finally:
+            if batcher is not None:
+                batcher.shutdown(wait=True)
+        results["scenarios"][f"batch@{size}"] = row
+        print(
+            f"lote máx. {size:>3}: {row['throughput_rps']:>8.2f} req/s  "
+            f"{row['units_per_second']:>8.1f} s de áudio/s  p50 {row.get('latency_p50', 0) * 1000:>8.1f} ms  "
+            f"p99 {row.get('latency_p99', 0) * 1000:>8.1f} ms  lote médio {row.get('mean_batch_size', 1):>5.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Compara a aplicação de correções do motor compilado com a implementação
+anterior (laço de palavras + re.sub não compilado) em transcrições longas.
+
+Uso:
+    python -m benchmarks.bench_corrections --entries 10000 --words 200000
+"""
+import argparse
+import itertools
+import json
+import random
+import re
+import string
+import time
+
+from src.utils.correction_engine import COMMON_PATTERNS, CorrectionEngine
+from src.utils.suggestion_engine import SuggestionEngine
+
+
+def legacy_apply_corrections(text, custom_dict, common_patterns):
+    """Implementação anterior de TextProcessor.apply_corrections"""
+    words = text.split()
+    corrected_words = []
+    for word in words:
+        word_lower = word.lower()
+        if word_lower in custom_dict:
+            if word.isupper():
+                corrected_words.append(custom_dict[word_lower].upper())
+            elif word[0].isupper():
+                corrected_words.append(custom_dict[word_lower].capitalize())
+            else:
+                corrected_words.append(custom_dict[word_lower])
+        else:
+            corrected_words.append(word)
+    text = ' '.join(corrected_words)
+    for pattern, replacement in common_patterns.items():
+        text = re.sub(pattern, replacement, text)
+    return text.strip()
+
+
+def random_word(rng, min_len=2, max_len=9):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(min_len, max_len)))
+
+
+def build_dictionary(rng, entries, phrase_ratio=0.1):
+    corrections = {}
+    while len(corrections) < entries:
+        words = 2 if rng.random() < phrase_ratio else 1
+        corrections[" ".join(random_word(rng) for _ in range(words))] = random_word(rng)
+    return corrections
+
+
+def build_transcript(rng, corrections, words, hit_ratio=0.05, vocabulary_size=5000, punctuation_ratio=0.1):
+    """
+    Gera uma transcrição cujas palavras vêm de um vocabulário disjunto do
+    dicionário (frequências tipo Zipf), com `hit_ratio` de termos do dicionário.
+    """
+    keys = list(corrections)
+    first_words = {key.split()[0] for key in keys}
+    vocabulary = []
+    while len(vocabulary) < vocabulary_size:
+        word = random_word(rng, 3, 10)
+        if word not in first_words:
+            vocabulary.append(word)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, vocabulary_size + 1)))
+
+    tokens = []
+    for word in rng.choices(vocabulary, cum_weights=cum_weights, k=words):
+        if rng.random() < hit_ratio:
+            tokens.extend(rng.choice(keys).split())
+        elif rng.random() < punctuation_ratio:
+            tokens.append(word + rng.choice(",.?!"))
+        else:
+            tokens.append(word)
+    return " ".join(tokens)
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10000, help="Entradas no dicionário")
+    parser.add_argument("--words", type=int, default=200000, help="Palavras na transcrição")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (usa o melhor tempo)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Imprime resultados em JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corrections = build_dictionary(rng, args.entries)
+    text = build_transcript(rng, corrections, args.words)
+
+    start = time.perf_counter()
+    engine = CorrectionEngine(corrections)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(1000):
+        engine.add(f"novo termo {i}", "x")
+    add_seconds = (time.perf_counter() - start) / 1000
+
+    # Sem limite de sugestões, para medir o custo do índice em todas as palavras
+    suggester = SuggestionEngine(corrections, max_suggestions=args.words)
+    tokens = engine.apply_tokens(text)
+
+    results = {
+        "entries": args.entries,
+        "words": args.words,
+        "legacy_seconds": round(timed(lambda: legacy_apply_corrections(text, corrections, COMMON_PATTERNS), args.repeat), 4),
+        "engine_seconds": round(timed(lambda: engine.apply(text), args.repeat), 4),
+        "engine_build_seconds": round(build_seconds, 4),
+        "engine_add_microseconds": round(add_seconds * 1e6, 2),
+        "suggest_cold_seconds": round(timed(lambda: suggester.suggest(tokens), 1), 4),
+        "suggest_seconds": round(timed(lambda: suggester.suggest(tokens), args.repeat), 4),
+    }
+    results["speedup"] = round(results["legacy_seconds"] / results["engine_seconds"], 2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for key, value in results.items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == "__main__":
+    main()
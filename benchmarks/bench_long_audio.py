@@ -0,0 +1,57 @@
+"""
+Mede o ganho de tempo de parede da transcrição em janelas paralelas em
+função do número de processos, usando o modelo stub.
+
+Uso:
+    python -m benchmarks.bench_long_audio --duration 1200 --window 120 --workers 1,2,4
+"""
+import argparse
+import json
+
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio
+from src.core.long_audio import transcribe_long_audio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=1200, help="Duração do áudio sintético (s)")
+    parser.add_argument("--window", type=float, default=120, help="Duração de cada janela (s)")
+    parser.add_argument("--overlap", type=float, default=2, help="Sobreposição entre janelas (s)")
+    parser.add_argument("--workers", default="1,2,4", help="Lista de números de processos")
+    parser.add_argument("--cost", type=float, default=0.005, help="CPU (s) por segundo de áudio no stub")
+    parser.add_argument("--json", action="store_true", help="Imprime resultados em JSON")
+    args = parser.parse_args()
+
+    audio = make_synthetic_audio(args.duration)
+    factory = make_stub_factory(cost_per_second=args.cost)
+    rows = []
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        result = transcribe_long_audio(
+            audio,
+            model_name="stub",
+            model_factory=factory,
+            workers=workers,
+            window_seconds=args.window,
+            overlap_seconds=args.overlap,
+            search_seconds=min(5, args.window / 4),
+        )
+        baseline = baseline or result["wall_seconds"]
+        rows.append({
+            "workers": workers,
+            "windows": result["windows"],
+            "wall_seconds": result["wall_seconds"],
+            "speedup": round(baseline / result["wall_seconds"], 2),
+            "segments": len(result["segments"]),
+        })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'workers':>8} {'janelas':>8} {'tempo (s)':>10} {'speedup':>8} {'segmentos':>10}")
+    for row in rows:
+        print(f"{row['workers']:>8} {row['windows']:>8} {row['wall_seconds']:>10.2f} {row['speedup']:>8.2f} {row['segments']:>10}")
+
+
+if __name__ == "__main__":
+    main()
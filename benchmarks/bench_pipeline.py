@@ -0,0 +1,138 @@
+"""
+Benchmark de ponta a ponta do pipeline de transcrição com o modelo stub
+(roda offline, sem os pesos do Whisper): AudioTranscriber, TextProcessor e
+as duas aplicações FastAPI, sob concorrência configurável.
+
+Uso:
+    python -m benchmarks.bench_pipeline --concurrency 1,4 --requests 20 --output bench.json
+    python -m benchmarks.bench_pipeline --baseline bench_anterior.json
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from benchmarks.bench_corrections import build_dictionary, build_transcript
+from benchmarks.harness import compare, environment_info, run_load
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio, write_wav
+
+SCENARIOS = ("transcriber", "text_processor", "web_upload", "api_transcribe")
+
+# Métricas comparadas com a linha de base
+COMPARED_KEYS = ["throughput_rps", "latency_p50", "latency_p95", "latency_p99", "peak_rss_mb", "cpu_utilisation"]
+
+
+def _use_stub_model(app, factory) -> None:
+    """Faz o pool da aplicação (compartilhado pelas rotas web e /api/v1) carregar o stub"""
+    pool = app.state.services.model_pool
+    pool.clear()
+    pool.model_factory = factory
+
+
+def build_scenarios(work_dir: Path, args) -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """Retorna, para cada cenário, uma função que prepara e devolve (operação, unidades)"""
+    audio_path = work_dir / "audio.wav"
+    write_wav(str(audio_path), make_synthetic_audio(args.duration))
+    audio_bytes = audio_path.read_bytes()
+    factory = make_stub_factory(cost_per_second=args.cost)
+
+    def transcriber():
+        from src.core.model_pool import ModelPool
+        from src.core.transcriber import AudioTranscriber
+        from src.utils.text_processor import TextProcessor
+
+        instance = AudioTranscriber(model_name="base", model_pool=ModelPool(model_factory=factory), result_cache=False)
+        instance.text_processor = TextProcessor(custom_dict_path=str(work_dir / "dict.json"))
+        return (lambda i: instance.transcribe(str(audio_path))), (lambda _: args.duration)
+
+    def text_processor():
+        from src.utils.text_processor import TextProcessor
+
+        rng = random.Random(42)
+        corrections = build_dictionary(rng, args.entries)
+        text = build_transcript(rng, corrections, args.words)
+        processor = TextProcessor(custom_dict_path=str(work_dir / "bench_dict.json"))
+        processor.import_corrections(corrections, replace=True)
+        return (lambda i: processor.apply_corrections(text)), (lambda _: args.words)
+
+    def upload_operation(app, path, fields):
+        from fastapi.testclient import TestClient
+
+        client = TestClient(app)
+
+        def operation(i):
+            response = client.post(path, files={"file": ("audio.wav", audio_bytes, "audio/wav")}, data=fields)
+            if response.status_code != 200 or response.json().get("status") == "error":
+                raise RuntimeError(response.text)
+            return response
+
+        return operation, (lambda _: args.duration)
+
+    def web_upload():
+        from src.main import app
+
+        _use_stub_model(app, factory)
+        return upload_operation(app, "/upload", {"model": "base"})
+
+    def api_transcribe():
+        from app.main import app
+
+        _use_stub_model(app, factory)
+        return upload_operation(app, "/api/v1/transcribe?model_size=base", {})
+
+    return {
+        "transcriber": transcriber,
+        "text_processor": text_processor,
+        "web_upload": web_upload,
+        "api_transcribe": api_transcribe,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Cenários separados por vírgula")
+    parser.add_argument("--requests", type=int, default=20, help="Requisições medidas por cenário")
+    parser.add_argument("--concurrency", default="1,4", help="Lista de níveis de concorrência")
+    parser.add_argument("--duration", type=float, default=30, help="Duração do áudio sintético (s)")
+    parser.add_argument("--cost", type=float, default=0.002, help="CPU (s) por segundo de áudio no stub")
+    parser.add_argument("--entries", type=int, default=5000, help="Entradas no dicionário (text_processor)")
+    parser.add_argument("--words", type=int, default=20000, help="Palavras por transcrição (text_processor)")
+    parser.add_argument("--output", help="Arquivo JSON com os resultados")
+    parser.add_argument("--baseline", help="Resultados anteriores para comparação")
+    args = parser.parse_args()
+
+    # Resultados em cache mascarariam o custo real da inferência
+    os.environ["RESULT_CACHE_ENABLED"] = "false"
+
+    results = {"environment": environment_info(), "parameters": vars(args), "scenarios": {}}
+    with tempfile.TemporaryDirectory(prefix="bench_") as temp_dir:
+        scenarios = build_scenarios(Path(temp_dir), args)
+        for name in args.scenarios.split(","):
+            operation, units = scenarios[name]()
+            for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                key = f"{name}@{concurrency}"
+                results["scenarios"][key] = run_load(operation, args.requests, concurrency, units=units)
+                row = results["scenarios"][key]
+                print(
+                    f"{key:>22}: {row['throughput_rps']:>8.2f} req/s  p50 {row.get('latency_p50', 0) * 1000:>8.1f} ms  "
+                    f"p99 {row.get('latency_p99', 0) * 1000:>8.1f} ms  CPU {row['cpu_utilisation']:>5.2f}  "
+                    f"RSS {row['peak_rss_mb']:>7.1f} MB  erros {row['errors']}"
+                )
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            results["comparison"] = compare(results, json.load(f), COMPARED_KEYS)
+        for key, deltas in results["comparison"].items():
+            print(f"{key:>22}: " + "  ".join(f"{k} {v:+.1f}%" for k, v in deltas.items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
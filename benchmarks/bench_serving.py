@@ -0,0 +1,81 @@
+"""
+Mede a memória dos workers do pool de inferência multiprocesso: com os pesos
+carregados no processo pai e herdados por fork, a memória privada de cada
+worker deve ficar muito abaixo do tamanho do modelo.
+
+Uso (Linux):
+    python -m benchmarks.bench_serving --processes 4 --weights-mb 300
+"""
+import argparse
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.stub_model import StubWhisperModel, make_synthetic_audio
+from src.core.audio import open_audio
+from src.core.inference_pool import InferencePool
+from src.core.model_pool import ModelPool
+
+
+class WeightedStubModel(StubWhisperModel):
+    def __init__(self, name: str, weights_mb: float):
+        super().__init__(name)
+        # Simula os pesos do modelo, lidos (não escritos) a cada inferência
+        self.weights = np.ones(int(weights_mb * 1024 * 1024 / 4), dtype=np.float32)
+
+    def transcribe(self, audio, **params):
+        float(self.weights[::4096].sum())
+        return super().transcribe(audio, **params)
+
+
+def memory_of(pid: int) -> dict:
+    """Rss, Pss e memória privada (MB) de um processo, via /proc/<pid>/smaps_rollup"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0].rstrip(":") in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": round(values.get("Rss", 0), 1),
+        "pss_mb": round(values.get("Pss", 0), 1),
+        "private_mb": round(values.get("Private_Clean", 0) + values.get("Private_Dirty", 0), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=4, help="Processos de inferência")
+    parser.add_argument("--weights-mb", type=float, default=300, help="Tamanho simulado dos pesos (MB)")
+    parser.add_argument("--requests", type=int, default=16, help="Transcrições executadas")
+    args = parser.parse_args()
+
+    factory = lambda name, device=None: WeightedStubModel(name, args.weights_mb)  # noqa: E731
+    pool = InferencePool(args.processes, ["base"], model_pool=ModelPool(model_factory=factory)).start()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio = open_audio(make_synthetic_audio(10), os.path.join(temp_dir, "audio.f32"))
+            for _ in range(args.requests):
+                pool.transcribe("base", audio)
+            workers = {pid: memory_of(pid) for pid in pool.get_stats()["worker_pids"]}
+            parent = memory_of(os.getpid())
+    finally:
+        pool.shutdown(wait=True)
+
+    result = {
+        "weights_mb": args.weights_mb,
+        "processes": args.processes,
+        "parent": parent,
+        "workers": workers,
+        "total_pss_mb": round(parent["pss_mb"] + sum(w["pss_mb"] for w in workers.values()), 1),
+        "memory_vs_single_process": round(
+            (parent["pss_mb"] + sum(w["pss_mb"] for w in workers.values())) / max(parent["rss_mb"], 1), 2
+        ),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
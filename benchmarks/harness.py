@@ -0,0 +1,125 @@
+"""
+Utilitários de medição compartilhados pelos benchmarks: execução com
+concorrência configurável, percentis de latência, pico de RSS e uso de CPU.
+"""
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.metrics import Histogram
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_load(
+    operation: Callable[[int], Any],
+    requests: int,
+    concurrency: int = 1,
+    warmup: int = 1,
+    units: Optional[Callable[[Any], float]] = None,
+) -> Dict[str, Any]:
+    """
+    Executa `operation(i)` `requests` vezes com `concurrency` threads.
+
+    Args:
+        operation: Função chamada com o índice da requisição
+        requests (int): Número de chamadas medidas
+        concurrency (int): Chamadas simultâneas
+        warmup (int): Chamadas prévias não medidas (ex.: carregar o modelo)
+        units: Extrai do retorno a quantidade processada (ex.: segundos de
+            áudio), usada na vazão em unidades por segundo
+
+    Returns:
+        Dict com vazão, percentis de latência, CPU e pico de RSS
+    """
+    for i in range(warmup):
+        operation(-1 - i)
+
+    latencies = Histogram(reservoir_size=max(requests, 1))
+    processed = 0.0
+    errors = 0
+    lock = threading.Lock()
+
+    def call(i: int) -> None:
+        nonlocal processed, errors
+        start = time.perf_counter()
+        try:
+            result = operation(i)
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.observe(elapsed)
+            if units is not None:
+                processed += units(result)
+
+    cpu_start = os.times()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(requests)))
+    wall = time.perf_counter() - wall_start
+    cpu_end = os.times()
+    cpu_seconds = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
+
+    quantiles = latencies.quantiles()
+    result = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round(latencies.count / wall, 3) if wall else 0.0,
+        "latency_mean": round(latencies.sum / latencies.count, 6) if latencies.count else None,
+        **{f"latency_p{int(q * 100)}": round(v, 6) for q, v in quantiles.items() if v == v},
+        "cpu_seconds": round(cpu_seconds, 3),
+        # Fração da capacidade total de CPU usada durante a medição
+        "cpu_utilisation": round(cpu_seconds / wall / (os.cpu_count() or 1), 3) if wall else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    if units is not None:
+        result["units_per_second"] = round(processed / wall, 3) if wall else 0.0
+    return result
+
+
+def environment_info() -> Dict[str, Any]:
+    """Identificação do ambiente e do commit, para comparar execuções"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], keys: List[str]) -> Dict[str, Dict[str, float]]:
+    """Variação relativa (%) das métricas de cada cenário em relação à linha de base"""
+    deltas = {}
+    for name, result in current.get("scenarios", {}).items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        deltas[name] = {
+            key: round(100 * (result[key] - previous[key]) / previous[key], 1)
+            for key in keys
+            if result.get(key) is not None and previous.get(key)
+        }
+    return deltas
@@ -0,0 +1,122 @@
+"""
+Modelo stub compatível com a interface do Whisper, usado nos benchmarks e
+testes para rodar sem os pesos do modelo.
+"""
+import functools
+import time
+import wave
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def load_wav(path: str) -> np.ndarray:
+    """Lê um WAV PCM 16 bits mono como float32"""
+    with wave.open(path, "rb") as wav:
+        frames = wav.readframes(wav.getnframes())
+    return np.frombuffer(frames, np.int16).astype(np.float32) / 32768.0
+
+
+def make_synthetic_audio(seconds: float, speech_seconds: float = 4.0, pause_seconds: float = 1.0, seed: int = 0) -> np.ndarray:
+    """
+    Gera áudio sintético alternando trechos de "fala" (ruído modulado) e
+    pausas silenciosas.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    period = speech_seconds + pause_seconds
+    position = 0.0
+    while position < seconds:
+        start = int(position * SAMPLE_RATE)
+        end = min(total, int((position + speech_seconds) * SAMPLE_RATE))
+        audio[start:end] = rng.normal(0, 0.1, end - start).astype(np.float32)
+        position += period
+    return audio
+
+
+def write_wav(path: str, audio: np.ndarray) -> None:
+    """Grava amostras float32 como WAV PCM 16 bits mono 16 kHz"""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes())
+
+
+def _burn_cpu(seconds: float) -> None:
+    """Consome tempo de CPU (segurando o GIL), como a inferência real"""
+    # Tempo da própria thread: com process_time, threads concorrentes
+    # somariam a CPU umas das outras e terminariam cedo demais
+    deadline = time.thread_time() + seconds
+    while time.thread_time() < deadline:
+        pass
+
+
+class StubWhisperModel:
+    def __init__(self, name: str = "stub", cost_per_second: float = 0.0, segment_seconds: float = 5.0,
+                 pass_overhead: float = 0.0):
+        """
+        Args:
+            name (str): Nome do modelo simulado
+            cost_per_second (float): Segundos de CPU gastos por segundo de áudio
+            segment_seconds (float): Duração de cada segmento gerado
+            pass_overhead (float): Segundos de CPU fixos por passada do modelo
+                (leitura dos pesos), pagos uma vez por lote em transcribe_batch
+        """
+        self.name = name
+        self.cost_per_second = cost_per_second
+        self.segment_seconds = segment_seconds
+        self.pass_overhead = pass_overhead
+        self.calls = 0
+        self.batch_sizes: List[int] = []
+
+    def transcribe(self, audio: Union[str, np.ndarray], **params) -> Dict[str, Any]:
+        if isinstance(audio, str):
+            audio = load_wav(audio)
+        self.calls += 1
+        _burn_cpu(self.pass_overhead + len(audio) / SAMPLE_RATE * self.cost_per_second)
+        return self._result(audio, params)
+
+    def transcribe_batch(self, audios: List[np.ndarray], **params) -> List[Dict[str, Any]]:
+        self.calls += 1
+        self.batch_sizes.append(len(audios))
+        _burn_cpu(self.pass_overhead + sum(len(a) for a in audios) / SAMPLE_RATE * self.cost_per_second)
+        return [self._result(audio, params) for audio in audios]
+
+    def _result(self, audio: np.ndarray, params: Dict[str, Any]) -> Dict[str, Any]:
+        duration = len(audio) / SAMPLE_RATE
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + self.segment_seconds)
+            chunk = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+            if len(chunk) and float(np.abs(chunk).mean()) > 1e-3:
+                segments.append({
+                    "id": len(segments),
+                    "start": round(start, 3),
+                    "end": round(end, 3),
+                    "text": f" trecho de {end - start:.1f} segundos",
+                    "avg_logprob": -0.3,
+                    "no_speech_prob": 0.01,
+                })
+            start = end
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": params.get("language") or "pt",
+        }
+
+
+def _build_stub(model_name: str, device=None, cost_per_second: float = 0.0, segment_seconds: float = 5.0,
+                pass_overhead: float = 0.0) -> StubWhisperModel:
+    return StubWhisperModel(model_name, cost_per_second, segment_seconds, pass_overhead)
+
+
+def make_stub_factory(cost_per_second: float = 0.0, segment_seconds: float = 5.0, pass_overhead: float = 0.0):
+    """Retorna uma fábrica picklable compatível com ModelPool"""
+    return functools.partial(
+        _build_stub, cost_per_second=cost_per_second, segment_seconds=segment_seconds, pass_overhead=pass_overhead
+    )
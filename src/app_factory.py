@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from loguru import logger
+
+from .config import Settings, configure_settings, get_settings
+from .routes import api, web
+from .services import Services
+from .utils.helpers import check_ffmpeg, configure_logging, setup_directories, shutdown_logging
+
+# Get the base directory
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Build the application: the web pages and routes plus the /api/v1 API,
+    sharing one transcriber, model pool, job queue and scheduler.
+
+    Args:
+        settings (Settings): Configuration (default: read once from the environment and .env)
+    """
+    settings = configure_settings(settings) if settings is not None else get_settings()
+
+    app = FastAPI(
+        title="Audio Transcription API",
+        description="API for transcribing audio files using Whisper",
+        version="1.0.0"
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Mount static files and templates
+    app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+    app.state.templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+
+    setup_directories([settings.input_dir, BASE_DIR / "output", BASE_DIR / "logs", BASE_DIR / "models"])
+
+    # Shared components (models load on first use or via MODEL_WARMUP)
+    services = Services(settings)
+    services.register_gauges()
+    app.state.services = services
+
+    app.include_router(web.router)
+    app.include_router(api.router)
+
+    @app.on_event("startup")
+    async def startup_event():
+        """Configure logging, check system requirements and start the model warm-up"""
+        # Fork the inference workers first, before the log queue or any executor starts a thread
+        services.start_inference_pool()
+        log = services.settings
+        configure_logging(log.log_file, log.log_level, log.log_json, log.log_enqueue, log.log_sample_every)
+        services.startup_state["ffmpeg"] = check_ffmpeg()
+        if not services.startup_state["ffmpeg"]:
+            logger.error("FFmpeg not found. Only 16 kHz PCM WAV uploads can be decoded.")
+        services.start()
+        services.startup_state["started"] = True
+        logger.info("Application started successfully")
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Stop background transcription workers and compact the dictionary journal"""
+        services.shutdown()
+        shutdown_logging()
+
+    return app
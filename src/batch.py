@@ -0,0 +1,265 @@
+"""
+Transcrição em lote de um diretório.
+
+Uso:
+    python -m src.batch input/ --output output/ --workers 2 --model base
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from loguru import logger
+
+from src.config import Settings, configure_settings, get_settings
+from src.core.audio import decode_audio
+from src.core.backends import get_inference_backend
+from src.core.model_pool import ModelPool
+from src.core.search_index import SearchIndex, get_search_index
+from src.core.transcriber import AudioTranscriber
+from src.utils.helpers import configure_logging
+from src.utils.subtitles import iter_srt, iter_vtt, write_stream
+
+MANIFEST_NAME = ".batch_manifest.json"
+
+# Transcritor de cada processo worker
+_worker_transcriber: Optional[AudioTranscriber] = None
+
+
+def find_audio_files(directory: Union[str, Path], extensions: Optional[Iterable[str]] = None) -> List[Path]:
+    """Lista recursivamente os arquivos de áudio suportados (padrão: ALLOWED_EXTENSIONS), em ordem estável"""
+    directory = Path(directory)
+    extensions = set(extensions if extensions is not None else get_settings().allowed_extensions)
+    return sorted(
+        path for path in directory.rglob("*")
+        if path.is_file() and path.suffix.lower() in extensions and not path.name.startswith("temp_")
+    )
+
+
+class BatchManifest:
+    def __init__(self, path: Union[str, Path]):
+        """
+        Registro dos arquivos já transcritos, usado para retomar execuções
+        interrompidas. Um arquivo é considerado concluído enquanto seu
+        tamanho e data de modificação não mudarem.
+
+        Args:
+            path: Caminho do manifesto JSON
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                logger.error(f"Manifesto inválido ignorado {self.path}: {e}")
+
+    @staticmethod
+    def _fingerprint(source: Path) -> Dict[str, int]:
+        stat = source.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_done(self, key: str, source: Path) -> bool:
+        entry = self.entries.get(key)
+        return bool(entry) and all(entry.get(k) == v for k, v in self._fingerprint(source).items())
+
+    def mark_done(self, key: str, source: Path, **info) -> None:
+        """Registra o arquivo como concluído e grava o manifesto atomicamente"""
+        self.entries[key] = {**self._fingerprint(source), **info}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def write_outputs(result: Dict[str, Any], base_path: Path,
+                  transcriber: Optional[AudioTranscriber] = None) -> List[str]:
+    """
+    Grava <stem>_transcription.txt/.json/.srt/.vtt e retorna os caminhos.
+    Com `transcriber`, as legendas levam o texto corrigido, como o .txt.
+    """
+    base_path.parent.mkdir(parents=True, exist_ok=True)
+    segments = result.get("segments", [])
+    # Legendas gravadas bloco a bloco, sem montar o arquivo inteiro em memória
+    outputs = {
+        ".txt": [result["corrected_text"]],
+        ".json": [json.dumps(result, ensure_ascii=False, indent=2, default=str)],
+        ".srt": iter_srt(transcriber.corrected_segments(segments) if transcriber else segments),
+        ".vtt": iter_vtt(transcriber.corrected_segments(segments) if transcriber else segments),
+    }
+    paths = []
+    for suffix, chunks in outputs.items():
+        path = base_path.with_name(base_path.name + suffix)
+        with open(path, "w", encoding="utf-8") as f:
+            write_stream(chunks, f)
+        paths.append(str(path))
+    return paths
+
+
+def _init_worker(model_name: str, model_factory: Optional[Callable[..., Any]], settings: Settings) -> None:
+    """
+    Cria o transcritor do processo worker com as mesmas configurações do
+    servidor: backend de INFERENCE_BACKEND (também na chave do cache) e pool
+    de modelos limitado por MODEL_POOL_MAX_MEMORY_MB.
+    """
+    global _worker_transcriber
+    # Processos spawn releriam o ambiente: usam as configurações do processo principal
+    configure_settings(settings)
+    backend = get_inference_backend(settings)
+    pool = ModelPool(
+        max_memory_mb=settings.model_pool_max_memory_mb,
+        model_factory=model_factory or backend.load_model,
+    )
+    _worker_transcriber = AudioTranscriber(model_name=model_name, model_pool=pool, backend=backend)
+
+
+def _transcribe_one(source: str, base_path: str, language: str) -> Dict[str, Any]:
+    """Decodifica, transcreve e grava as saídas de um arquivo"""
+    start = time.perf_counter()
+    with decode_audio(source) as decoded:
+        duration = decoded.duration
+        result = _worker_transcriber.transcribe(decoded, language=language)
+    result["duration"] = round(duration, 3)
+    outputs = write_outputs(result, Path(base_path), _worker_transcriber)
+    return {"duration": duration, "outputs": outputs, "seconds": time.perf_counter() - start}
+
+
+def run_batch(
+    input_dir: Union[str, Path],
+    output_dir: Union[str, Path] = "output",
+    model_name: str = "base",
+    workers: int = 1,
+    language: str = "pt",
+    force: bool = False,
+    model_factory: Optional[Callable[..., Any]] = None,
+    search_index: Optional[SearchIndex] = None,
+) -> Dict[str, Any]:
+    """
+    Transcreve todos os áudios de um diretório, em paralelo.
+
+    Args:
+        input_dir: Diretório varrido recursivamente
+        output_dir: Diretório das saídas (mantém a estrutura de subpastas)
+        model_name (str): Modelo Whisper
+        workers (int): Processos paralelos (cada um carrega seu modelo)
+        language (str): Idioma do áudio
+        force (bool): Ignora o manifesto e reprocessa tudo
+        model_factory (Callable): Fábrica de modelos (precisa ser picklable; padrão: o backend configurado)
+        search_index (SearchIndex): Índice atualizado a cada arquivo concluído
+
+    Returns:
+        Dict com contagens, falhas e vazão (segundos de áudio por segundo)
+    """
+    settings = get_settings()
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    manifest = BatchManifest(output_dir / MANIFEST_NAME)
+
+    pending = []
+    skipped = 0
+    for source in find_audio_files(input_dir, settings.allowed_extensions):
+        key = source.relative_to(input_dir).as_posix()
+        if not force and manifest.is_done(key, source):
+            skipped += 1
+            continue
+        base_path = output_dir / source.relative_to(input_dir).parent / f"{source.stem}_transcription"
+        pending.append((key, source, base_path))
+
+    logger.info(f"Lote: {len(pending)} arquivos a transcrever, {skipped} já concluídos")
+    start = time.perf_counter()
+    audio_seconds = 0.0
+    failed: Dict[str, str] = {}
+
+    def finish(key: str, source: Path, outcome: Dict[str, Any]) -> None:
+        nonlocal audio_seconds
+        audio_seconds += outcome["duration"]
+        manifest.mark_done(key, source, duration=round(outcome["duration"], 3), outputs=outcome["outputs"])
+        if search_index is not None:
+            # Indexado no processo principal: um único escritor no índice
+            json_output = next(path for path in outcome["outputs"] if path.endswith(".json"))
+            try:
+                search_index.add_file(json_output)
+            except Exception as e:
+                logger.error(f"Erro ao indexar {json_output}: {e}")
+        logger.info(f"Concluído {key} ({outcome['duration']:.0f}s de áudio em {outcome['seconds']:.1f}s)")
+
+    def fail(key: str, error: Exception) -> None:
+        failed[key] = str(error)
+        logger.error(f"Falha ao transcrever {key}: {error}")
+
+    workers = max(1, min(workers, len(pending) or 1))
+    if workers == 1:
+        _init_worker(model_name, model_factory, settings)
+        for key, source, base_path in pending:
+            try:
+                finish(key, source, _transcribe_one(str(source), str(base_path), language))
+            except Exception as e:
+                fail(key, e)
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(model_name, model_factory, settings),
+        ) as executor:
+            futures = {
+                executor.submit(_transcribe_one, str(source), str(base_path), language): (key, source)
+                for key, source, base_path in pending
+            }
+            for future in as_completed(futures):
+                key, source = futures[future]
+                try:
+                    finish(key, source, future.result())
+                except Exception as e:
+                    fail(key, e)
+
+    wall_seconds = time.perf_counter() - start
+    return {
+        "transcribed": len(pending) - len(failed),
+        "skipped": skipped,
+        "failed": failed,
+        "workers": workers,
+        "audio_seconds": round(audio_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput": round(audio_seconds / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Transcreve em lote todos os áudios de um diretório")
+    parser.add_argument("input_dir", nargs="?", default="input", help="Diretório de entrada (recursivo)")
+    parser.add_argument("--output", default="output", help="Diretório de saída")
+    parser.add_argument("--model", default=get_settings().default_model, help="Modelo Whisper")
+    parser.add_argument("--workers", type=int, default=1, help="Processos paralelos")
+    parser.add_argument("--language", default="pt", help="Idioma do áudio")
+    parser.add_argument("--force", action="store_true", help="Reprocessa arquivos já concluídos")
+    parser.add_argument("--no-index", action="store_true", help="Não atualiza o índice de busca")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    search_index = None if args.no_index else get_search_index()
+    summary = run_batch(args.input_dir, args.output, args.model, args.workers, args.language, args.force,
+                        search_index=search_index)
+    print(
+        f"Transcritos: {summary['transcribed']} | Já concluídos: {summary['skipped']} | "
+        f"Falhas: {len(summary['failed'])}"
+    )
+    print(
+        f"{summary['audio_seconds']:.1f}s de áudio em {summary['wall_seconds']:.1f}s "
+        f"({summary['throughput']:.2f} s de áudio/s, {summary['workers']} workers)"
+    )
+    for key, error in summary["failed"].items():
+        print(f"  falha: {key}: {error}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
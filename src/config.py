@@ -0,0 +1,187 @@
+"""
+Configuração única da aplicação, lida do ambiente (e do .env) uma vez.
+
+Todas as opções de desempenho (modelo, limites, workers, caches, agendador)
+ficam em Settings; as fábricas compartilhadas (get_model_pool, get_job_manager,
+...) e a fábrica da aplicação (create_app) leem daqui em vez de consultar o
+ambiente a cada uso. Veja .env.example para a lista de variáveis.
+"""
+import os
+import threading
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from dotenv import load_dotenv
+
+_TRUE = ("1", "true", "yes")
+_LOG_LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+
+
+def _text(name: str, default: str) -> str:
+    value = os.getenv(name)
+    return value.strip() if value and value.strip() else default
+
+
+def _int(name: str, default: int) -> int:
+    value = _text(name, "")
+    try:
+        return int(value) if value else default
+    except ValueError:
+        raise ValueError(f"{name} deve ser um número inteiro (recebido: {value!r})")
+
+
+def _float(name: str, default: Optional[float]) -> Optional[float]:
+    value = _text(name, "")
+    try:
+        return float(value) if value else default
+    except ValueError:
+        raise ValueError(f"{name} deve ser um número (recebido: {value!r})")
+
+
+def _flag(name: str, default: bool) -> bool:
+    value = _text(name, "")
+    return value.lower() in _TRUE if value else default
+
+
+def _list(name: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+    value = _text(name, "")
+    if not value:
+        return default
+    return tuple(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Modelos e arquivos aceitos
+    default_model: str = "base"
+    allowed_models: Tuple[str, ...] = ("tiny", "base", "small", "medium", "large")
+    allowed_extensions: Tuple[str, ...] = (".mp3", ".wav", ".m4a", ".flac")
+    max_file_size_mb: int = 50
+    max_transcription_time_minutes: Optional[float] = None
+    input_dir: str = "input"
+    cors_origins: Tuple[str, ...] = ("*",)
+
+    # Modelos e inferência
+    model_pool_max_memory_mb: Optional[float] = None
+    model_warmup: str = ""
+    inference_backend: str = "pytorch"
+    inference_threads: Optional[int] = None
+    inference_interop_threads: Optional[int] = None
+    serving_processes: int = 0
+    serving_models: Tuple[str, ...] = ("base",)
+    micro_batch_max_size: int = 1
+    micro_batch_max_wait_ms: float = 20.0
+    vad_enabled: bool = False
+    long_audio_workers: int = 0
+
+    # Filas e agendamento
+    job_workers: int = 2
+    job_queue_size: int = 16
+    decode_workers: int = 2
+    max_audio_duration_seconds: Optional[float] = None
+    scheduler_max_concurrent: Optional[int] = None
+    client_max_concurrent: int = 1
+    client_rate_per_minute: float = 0.0
+    client_burst: Optional[int] = None
+    scheduler_aging_rate: float = 1.0
+
+    # Caches, índice e uploads
+    result_cache_enabled: bool = True
+    result_cache_dir: str = "output/cache"
+    result_cache_memory_entries: int = 256
+    search_index_enabled: bool = True
+    search_index_path: str = "output/.search_index.db"
+    upload_dir: str = "temp/uploads"
+    max_upload_size_mb: int = 2048
+    upload_part_size_mb: int = 8
+
+    # Logging
+    log_file: str = "logs/app.log"
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_enqueue: bool = True
+    log_sample_every: int = 100
+
+    # Variáveis de ambiente de cada campo (as demais usam o nome em maiúsculas)
+    _ENV_NAMES = {"default_model": "DEFAULT_MODEL_SIZE"}
+
+    def __post_init__(self):
+        # Normaliza e valida as opções de logging antes de qualquer sink ser criado
+        object.__setattr__(self, "log_level", self.log_level.upper())
+        object.__setattr__(self, "log_format", self.log_format.lower())
+        if self.log_level not in _LOG_LEVELS:
+            raise ValueError(f"LOG_LEVEL deve ser um de {', '.join(_LOG_LEVELS)} (recebido: {self.log_level!r})")
+        if self.log_format not in ("json", "text"):
+            raise ValueError(f"LOG_FORMAT deve ser json ou text (recebido: {self.log_format!r})")
+        if self.log_sample_every < 1:
+            raise ValueError(f"LOG_SAMPLE_EVERY deve ser maior que zero (recebido: {self.log_sample_every})")
+
+    @classmethod
+    def from_env(cls, env_file: Union[str, Path, None] = ".env") -> "Settings":
+        """
+        Lê as configurações do ambiente. Se `env_file` existir, ele é
+        carregado antes, sem sobrescrever variáveis já definidas.
+
+        Raises:
+            ValueError: Se um valor numérico for inválido
+        """
+        if env_file and Path(env_file).is_file():
+            load_dotenv(env_file, override=False)
+        defaults = cls()
+        values: Dict[str, Any] = {}
+        for item in fields(cls):
+            name = cls._ENV_NAMES.get(item.name, item.name.upper())
+            default = getattr(defaults, item.name)
+            if isinstance(default, bool):
+                values[item.name] = _flag(name, default)
+            elif isinstance(default, tuple):
+                values[item.name] = _list(name, default)
+            elif item.type is int:
+                values[item.name] = _int(name, default)
+            elif item.type is str:
+                values[item.name] = _text(name, default)
+            elif item.type == Optional[int]:
+                values[item.name] = _int(name, 0) or None
+            else:
+                values[item.name] = _float(name, default)
+        return cls(**values)
+
+    @property
+    def log_json(self) -> bool:
+        """Um objeto JSON por linha no arquivo de log (LOG_FORMAT=json)"""
+        return self.log_format == "json"
+
+    @property
+    def max_file_size(self) -> int:
+        return self.max_file_size_mb * 1024 * 1024
+
+    @property
+    def max_transcription_seconds(self) -> Optional[float]:
+        minutes = self.max_transcription_time_minutes
+        return minutes * 60 if minutes else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Configuração efetiva (para diagnóstico)"""
+        return {item.name: getattr(self, item.name) for item in fields(self)}
+
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Retorna as configurações do processo, lidas do ambiente na primeira chamada"""
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings.from_env()
+        return _settings
+
+
+def configure_settings(settings: Settings) -> Settings:
+    """Define as configurações do processo (ex.: as passadas a create_app)"""
+    global _settings
+    with _settings_lock:
+        _settings = settings
+        return settings
@@ -0,0 +1,216 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from loguru import logger
+
+from ..config import get_settings
+
+SAMPLE_RATE = 16000
+MIN_DURATION_SECONDS = 0.1
+
+
+class AudioDecodeError(ValueError):
+    """Levantada quando o áudio está corrompido ou fora dos limites aceitos"""
+
+
+class DecodedAudio:
+    def __init__(self, samples: np.ndarray, source_path: Optional[Union[str, Path]] = None,
+                 temp_dir: Optional[str] = None):
+        """
+        Áudio decodificado para PCM float32 mono 16 kHz, normalmente mapeado
+        em memória a partir de um arquivo temporário.
+
+        Args:
+            samples: Amostras (np.memmap ou np.ndarray)
+            source_path: Arquivo de origem (usado na chave do cache de resultados)
+            temp_dir (str): Diretório temporário removido em close()
+        """
+        self.samples = samples
+        self.source_path = str(source_path) if source_path is not None else None
+        self._temp_dir = temp_dir
+        self.decode_seconds = 0.0
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / SAMPLE_RATE
+
+    def close(self) -> None:
+        """Libera o buffer e remove o arquivo PCM temporário"""
+        self.samples = None
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _pcm_wav_params(audio_path: Union[str, Path]):
+    """Retorna os parâmetros de um WAV PCM 16 bits ou None se não for o caso"""
+    if Path(audio_path).suffix.lower() != ".wav":
+        return None
+    try:
+        with wave.open(str(audio_path), "rb") as wav:
+            if wav.getsampwidth() != 2 or wav.getframerate() != SAMPLE_RATE or wav.getnchannels() > 2:
+                return None
+            return wav.getnchannels(), wav.getnframes()
+    except (wave.Error, EOFError):
+        return None
+
+
+def _decode_wav(audio_path: Union[str, Path], output_path: str, chunk_frames: int = 1 << 18) -> None:
+    """Converte um WAV PCM 16 bits / 16 kHz no próprio processo, sem ffmpeg"""
+    with wave.open(str(audio_path), "rb") as wav, open(output_path, "wb") as out:
+        channels = wav.getnchannels()
+        while True:
+            frames = wav.readframes(chunk_frames)
+            if not frames:
+                break
+            samples = np.frombuffer(frames, np.int16).astype(np.float32) / 32768.0
+            if channels == 2:
+                samples = samples.reshape(-1, 2).mean(axis=1)
+            out.write(samples.tobytes())
+
+
+def _decode_ffmpeg(audio_path: Union[str, Path], output_path: str, chunk_size: int = 1 << 20) -> None:
+    """Decodifica qualquer formato suportado pelo ffmpeg, em blocos"""
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", str(audio_path),
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-",
+    ]
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise AudioDecodeError("FFmpeg não encontrado para decodificar o áudio")
+
+    # stderr é drenado em paralelo para não bloquear o ffmpeg
+    stderr_chunks = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    drain.start()
+    leftover = b""
+    with open(output_path, "wb") as out:
+        while True:
+            data = process.stdout.read(chunk_size)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - (len(data) % 2)
+            leftover = data[usable:]
+            samples = np.frombuffer(data[:usable], np.int16).astype(np.float32) / 32768.0
+            out.write(samples.tobytes())
+    drain.join()
+    if process.wait() != 0:
+        stderr = b"".join(stderr_chunks).decode(errors="ignore").strip().splitlines()
+        raise AudioDecodeError(f"Arquivo de áudio inválido ou corrompido: {stderr[-1] if stderr else ''}")
+
+
+def decode_to_memmap(audio_path: Union[str, Path], output_path: Union[str, Path]) -> np.memmap:
+    """
+    Decodifica um arquivo de áudio para PCM float32 mono 16 kHz em disco,
+    sem manter o áudio completo na memória.
+
+    WAVs PCM 16 bits a 16 kHz são convertidos no próprio processo; os demais
+    formatos passam pelo ffmpeg.
+
+    Returns:
+        np.memmap: Buffer somente leitura com as amostras
+    """
+    if _pcm_wav_params(audio_path) is not None:
+        _decode_wav(audio_path, str(output_path))
+    else:
+        _decode_ffmpeg(audio_path, str(output_path))
+    if os.path.getsize(output_path) == 0:
+        raise AudioDecodeError("Arquivo de áudio sem amostras")
+    return np.memmap(output_path, dtype=np.float32, mode="r")
+
+
+def open_audio(audio: Union[str, Path, np.ndarray], pcm_path: Union[str, Path]) -> np.ndarray:
+    """Materializa o áudio (arquivo ou amostras) como PCM float32 mapeado em memória"""
+    if isinstance(audio, DecodedAudio):
+        return audio.samples
+    if isinstance(audio, np.memmap) and audio.filename and audio.dtype == np.float32:
+        return audio
+    if isinstance(audio, np.ndarray):
+        audio.astype(np.float32, copy=False).tofile(pcm_path)
+        return np.memmap(pcm_path, dtype=np.float32, mode="r")
+    return decode_to_memmap(audio, pcm_path)
+
+
+def decode_audio(audio_path: Union[str, Path], max_duration: Optional[float] = None) -> DecodedAudio:
+    """
+    Decodifica e valida um arquivo antes de ocupar um modelo.
+
+    Args:
+        audio_path: Arquivo de áudio
+        max_duration (float): Duração máxima aceita em segundos (None = sem limite)
+
+    Raises:
+        AudioDecodeError: Se o arquivo estiver corrompido, vazio ou longo demais
+    """
+    start = time.perf_counter()
+    temp_dir = tempfile.mkdtemp(prefix="audio_")
+    try:
+        samples = decode_to_memmap(audio_path, os.path.join(temp_dir, "audio.f32"))
+        decoded = DecodedAudio(samples, source_path=audio_path, temp_dir=temp_dir)
+        decoded.decode_seconds = time.perf_counter() - start
+        if decoded.duration < MIN_DURATION_SECONDS:
+            raise AudioDecodeError("Áudio curto demais para transcrição")
+        if max_duration is not None and decoded.duration > max_duration:
+            raise AudioDecodeError(
+                f"Áudio longo demais: {decoded.duration:.0f}s (máximo {max_duration:.0f}s)"
+            )
+        return decoded
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+
+class AudioPipeline:
+    def __init__(self, workers: int = 2, max_duration: Optional[float] = None):
+        """
+        Decodifica áudios em um pool próprio, de modo que a decodificação do
+        próximo job ocorra enquanto o anterior ainda está na inferência.
+
+        Args:
+            workers (int): Decodificações simultâneas
+            max_duration (float): Duração máxima aceita em segundos
+        """
+        self.max_duration = max_duration
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decode")
+
+    def submit(self, audio_path: Union[str, Path]) -> "Future[DecodedAudio]":
+        """Agenda a decodificação e retorna um Future com o DecodedAudio"""
+        return self._executor.submit(decode_audio, audio_path, self.max_duration)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_pipeline: Optional[AudioPipeline] = None
+_default_pipeline_lock = threading.Lock()
+
+
+def get_audio_pipeline() -> AudioPipeline:
+    """Retorna o pipeline de decodificação compartilhado (DECODE_WORKERS, MAX_AUDIO_DURATION_SECONDS)"""
+    global _default_pipeline
+    with _default_pipeline_lock:
+        if _default_pipeline is None:
+            settings = get_settings()
+            _default_pipeline = AudioPipeline(
+                workers=settings.decode_workers,
+                max_duration=settings.max_audio_duration_seconds,
+            )
+            logger.info("Pipeline de decodificação de áudio inicializado")
+        return _default_pipeline
@@ -0,0 +1,149 @@
+import threading
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from ..config import Settings, get_settings
+
+
+class InferenceBackend:
+    """
+    Backend padrão: pesos fp32 do PyTorch, fp16 apenas em CUDA e o número de
+    threads escolhido pelo torch.
+    """
+
+    name = "pytorch"
+    # Precisão dos pesos; entra na chave do cache de resultados
+    compute_type = "float32"
+
+    def load_model(self, model_name: str, device: Optional[str] = None):
+        """Fábrica compatível com ModelPool: (model_name, device) -> modelo"""
+        import whisper
+
+        self.configure()
+        return self.prepare(whisper.load_model(model_name, device=device))
+
+    def configure(self) -> None:
+        """Ajustes do processo (threads etc.) feitos antes de carregar o modelo"""
+
+    def prepare(self, model):
+        """Transforma o modelo carregado (ex.: quantização)"""
+        return model
+
+    def default_params(self, device: str) -> Dict[str, Any]:
+        """Parâmetros de inferência que dependem do backend"""
+        return {"fp16": device == "cuda"}
+
+    def cache_identity(self) -> Dict[str, Any]:
+        """O que distingue os resultados deste backend no cache compartilhado"""
+        return {"name": self.name, "compute_type": self.compute_type}
+
+    def get_info(self) -> Dict[str, Any]:
+        return {"name": self.name}
+
+
+class CPUInt8Backend(InferenceBackend):
+    """
+    Backend otimizado para CPU: quantização dinâmica int8 das camadas
+    lineares (pesos em int8, ativações quantizadas em tempo de execução) e
+    controle explícito das threads intra-op e inter-op do torch.
+    """
+
+    name = "cpu-int8"
+    compute_type = "int8"
+
+    def __init__(self, intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None):
+        """
+        Args:
+            intra_op_threads (int): Threads de cada operação (None = padrão do torch)
+            inter_op_threads (int): Threads entre operações independentes (None = padrão)
+        """
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self._configured = False
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Picklable para os workers de áudio longo; cada processo reconfigura
+        state = self.__dict__.copy()
+        state["_configured"] = False
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def load_model(self, model_name: str, device: Optional[str] = None):
+        # A quantização dinâmica só roda em CPU
+        return super().load_model(model_name, device="cpu")
+
+    def prepare(self, model):
+        import torch
+        from whisper.model import Linear
+
+        # quantize_dynamic só reconhece nn.Linear exato; o Linear do Whisper
+        # apenas converte o dtype dos pesos no forward, sem efeito em fp32
+        for module in model.modules():
+            if type(module) is Linear:
+                module.__class__ = torch.nn.Linear
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        logger.info("Modelo quantizado para int8 (camadas lineares)")
+        return model.eval()
+
+    def configure(self) -> None:
+        import torch
+
+        with self._lock:
+            if self._configured:
+                return
+            if self.intra_op_threads:
+                torch.set_num_threads(self.intra_op_threads)
+            if self.inter_op_threads:
+                try:
+                    torch.set_num_interop_threads(self.inter_op_threads)
+                except RuntimeError as e:
+                    # Só pode ser definido antes do primeiro trabalho paralelo
+                    logger.warning(f"Threads inter-op mantidas em {torch.get_num_interop_threads()}: {e}")
+            self._configured = True
+
+    def default_params(self, device: str) -> Dict[str, Any]:
+        return {"fp16": False}
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+        }
+
+
+BACKENDS = {
+    InferenceBackend.name: InferenceBackend,
+    CPUInt8Backend.name: CPUInt8Backend,
+}
+
+
+def create_backend(name: str, **options) -> InferenceBackend:
+    """Instancia o backend pelo nome ('pytorch' ou 'cpu-int8')"""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Backend de inferência desconhecido: {name} (disponíveis: {', '.join(BACKENDS)})")
+    return backend_class(**options)
+
+
+def get_inference_backend(settings: Optional[Settings] = None) -> InferenceBackend:
+    """
+    Backend configurado em INFERENCE_BACKEND (padrão "pytorch"); as threads
+    do cpu-int8 vêm de INFERENCE_THREADS e INFERENCE_INTEROP_THREADS.
+    """
+    settings = settings or get_settings()
+    name = settings.inference_backend.strip().lower()
+    if name != CPUInt8Backend.name:
+        return create_backend(name)
+    return create_backend(
+        name,
+        intra_op_threads=settings.inference_threads,
+        inter_op_threads=settings.inference_interop_threads,
+    )
@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ..config import Settings, get_settings
+from .audio import SAMPLE_RATE
+from .metrics import get_metrics
+from .model_pool import ModelPool, get_model_pool
+
+# Janela de áudio que o encoder do Whisper processa de uma vez
+WINDOW_SECONDS = 30.0
+# Opções respeitadas pela decodificação em lote; qualquer outra (ex.:
+# word_timestamps) mudaria o formato do resultado e segue o caminho normal
+BATCHED_PARAMS = frozenset({"task", "language", "initial_prompt", "fp16"})
+
+BatchKey = Tuple[str, str]
+
+
+class _Request:
+    __slots__ = ("audio", "future", "enqueued")
+
+    def __init__(self, audio: np.ndarray):
+        self.audio = audio
+        self.future: Future = Future()
+        self.enqueued = time.monotonic()
+
+
+def transcribe_batch(model, audios: List[np.ndarray], **params) -> List[Dict[str, Any]]:
+    """
+    Transcreve vários clipes curtos em uma única passada do modelo.
+
+    Modelos com `transcribe_batch` (ex.: stubs) são chamados diretamente; no
+    Whisper, os mels de 30 s de cada clipe são empilhados e codificados e
+    decodificados juntos. Outros modelos caem para uma chamada por clipe.
+    """
+    if hasattr(model, "transcribe_batch"):
+        return model.transcribe_batch(audios, **params)
+    if hasattr(model, "dims") and hasattr(model, "decode"):
+        return _whisper_batch(model, audios, **params)
+    return [model.transcribe(audio, **params) for audio in audios]
+
+
+def _whisper_batch(model, audios: List[np.ndarray], **params) -> List[Dict[str, Any]]:
+    """
+    Decodificação gulosa (temperatura 0) do lote de mels; cada clipe vira um
+    único segmento, já que cabe inteiro em uma janela.
+    """
+    import torch
+    import whisper
+
+    mels = torch.stack([
+        whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))),
+            n_mels=model.dims.n_mels,
+        )
+        for audio in audios
+    ]).to(model.device)
+    options = whisper.DecodingOptions(
+        task=params.get("task", "transcribe"),
+        language=params.get("language"),
+        prompt=params.get("initial_prompt"),
+        fp16=bool(params.get("fp16")) and model.device.type == "cuda",
+        without_timestamps=True,
+    )
+    results = []
+    for audio, decoded in zip(audios, whisper.decode(model, mels, options)):
+        text = decoded.text
+        # Mesmo critério de silêncio do whisper.transcribe
+        if decoded.no_speech_prob > 0.6 and decoded.avg_logprob < -1.0:
+            text = ""
+        segments = [{
+            "id": 0,
+            "start": 0.0,
+            "end": round(len(audio) / SAMPLE_RATE, 3),
+            "text": text,
+            "avg_logprob": decoded.avg_logprob,
+            "no_speech_prob": decoded.no_speech_prob,
+        }] if text else []
+        results.append({"text": text, "segments": segments, "language": decoded.language})
+    return results
+
+
+class MicroBatcher:
+    def __init__(self, model_pool: Optional[ModelPool] = None, max_batch_size: int = 8, max_wait_ms: float = 20.0,
+                 max_clip_seconds: float = WINDOW_SECONDS):
+        """
+        Agrupa requisições concorrentes de clipes curtos para o mesmo modelo e
+        parâmetros (idioma, tarefa...) em uma única inferência. Um lote é
+        executado quando atinge `max_batch_size` ou quando a requisição mais
+        antiga esperou `max_wait_ms`; os resultados voltam por Futures.
+
+        Args:
+            model_pool (ModelPool): Pool de onde os modelos são obtidos
+            max_batch_size (int): Clipes por lote
+            max_wait_ms (float): Espera máxima para completar um lote
+            max_clip_seconds (float): Clipes mais longos não são agrupados
+        """
+        self.model_pool = model_pool or get_model_pool()
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_clip_seconds = min(max_clip_seconds, WINDOW_SECONDS)
+        self._pending: Dict[BatchKey, List[_Request]] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+        self._thread = threading.Thread(target=self._collect, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def accepts(self, audio: np.ndarray) -> bool:
+        """Só clipes que cabem em uma janela do encoder podem ser agrupados"""
+        return len(audio) <= self.max_clip_seconds * SAMPLE_RATE
+
+    @staticmethod
+    def supports(params: Dict[str, Any]) -> bool:
+        """Só parâmetros padrão de decodificação (sem timestamps por palavra etc.) podem ser agrupados"""
+        return all(key in BATCHED_PARAMS or value in (None, False) for key, value in params.items())
+
+    def submit(self, model_name: str, audio: np.ndarray, **params) -> Future:
+        """Enfileira o clipe; o Future resolve com o resultado do modelo"""
+        if not self.accepts(audio):
+            raise ValueError(f"Clipe com mais de {self.max_clip_seconds:.0f}s não pode ser agrupado")
+        key = (model_name, json.dumps(params, sort_keys=True, default=str))
+        request = _Request(np.asarray(audio, dtype=np.float32))
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Micro-batcher encerrado")
+            self._pending.setdefault(key, []).append(request)
+            self._condition.notify()
+        return request.future
+
+    def transcribe(self, model_name: str, audio: np.ndarray, **params) -> Dict[str, Any]:
+        return self.submit(model_name, audio, **params).result()
+
+    def _next_batch(self) -> Optional[Tuple[BatchKey, List[_Request]]]:
+        """Espera até que o grupo mais antigo esteja cheio ou vencido"""
+        with self._condition:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return None
+                    self._condition.wait()
+                    continue
+                key, requests = min(self._pending.items(), key=lambda item: item[1][0].enqueued)
+                remaining = requests[0].enqueued + self.max_wait - time.monotonic()
+                if len(requests) < self.max_batch_size and remaining > 0 and not self._closed:
+                    self._condition.wait(remaining)
+                    continue
+                batch = requests[:self.max_batch_size]
+                if len(requests) > len(batch):
+                    self._pending[key] = requests[len(batch):]
+                else:
+                    del self._pending[key]
+                return key, batch
+
+    def _collect(self) -> None:
+        while True:
+            item = self._next_batch()
+            if item is None:
+                return
+            self._run(*item)
+
+    def _run(self, key: BatchKey, batch: List[_Request]) -> None:
+        model_name, params = key[0], json.loads(key[1])
+        metrics = get_metrics()
+        metrics.observe("micro_batch_size", len(batch))
+        for request in batch:
+            metrics.observe_stage("batch_wait", time.monotonic() - request.enqueued)
+        try:
+            model = self.model_pool.get(model_name)
+            results = transcribe_batch(model, [r.audio for r in batch], **params)
+        except Exception as e:
+            logger.error(f"Erro no lote de {len(batch)} clipes ({model_name}): {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        self._batches += 1
+        self._items += len(batch)
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            pending = sum(len(requests) for requests in self._pending.values())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "mean_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "pending": pending,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Executa os lotes pendentes e encerra a thread coletora"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            self._thread.join()
+
+
+def get_micro_batcher(model_pool: Optional[ModelPool] = None,
+                      settings: Optional[Settings] = None) -> Optional[MicroBatcher]:
+    """
+    Cria o micro-batcher quando MICRO_BATCH_MAX_SIZE > 1 (espera máxima em
+    MICRO_BATCH_MAX_WAIT_MS). Retorna None se desabilitado.
+    """
+    settings = settings or get_settings()
+    if settings.micro_batch_max_size <= 1:
+        return None
+    return MicroBatcher(
+        model_pool,
+        max_batch_size=settings.micro_batch_max_size,
+        max_wait_ms=settings.micro_batch_max_wait_ms,
+    )
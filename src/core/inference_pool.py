@@ -0,0 +1,172 @@
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+from ..config import Settings, get_settings
+from .model_pool import ModelPool, get_model_pool
+
+# Estado herdado pelos workers no fork (os pesos não são copiados)
+_shared_pool: Optional[ModelPool] = None
+_worker_counter = None
+_worker_pids = None
+_cores_per_worker = 1
+
+
+def _init_worker() -> None:
+    """Fixa o worker em um subconjunto de núcleos e ajusta as threads do torch"""
+    with _worker_counter.get_lock():
+        index = _worker_counter.value
+        _worker_counter.value += 1
+
+    if hasattr(os, "sched_getaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+        start = (index * _cores_per_worker) % len(cores)
+        assigned = cores[start:start + _cores_per_worker] or cores
+        try:
+            os.sched_setaffinity(0, assigned)
+        except OSError:
+            pass
+    os.environ["OMP_NUM_THREADS"] = str(_cores_per_worker)
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(_cores_per_worker)
+    # Cada worker informa o próprio pid ao processo pai
+    _worker_pids.put(os.getpid())
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _infer(model_name: str, audio: Union[str, np.ndarray], params: Dict[str, Any], pcm: bool,
+           window: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    """Executa a inferência no worker com o modelo herdado do processo pai"""
+    if pcm:
+        samples = np.memmap(audio, dtype=np.float32, mode="r")
+        audio = np.array(samples[window[0]:window[1]] if window else samples)
+    model = _shared_pool.get(model_name)
+    result = model.transcribe(audio, **params)
+    result["worker_pid"] = os.getpid()
+    return result
+
+
+class InferencePool:
+    def __init__(self, processes: int, model_names: List[str], model_pool: Optional[ModelPool] = None):
+        """
+        Serviço de inferência multiprocesso: o processo pai carrega os modelos
+        uma vez e cria os workers por fork, que compartilham os pesos em
+        copy-on-write (tensores do torch vão para memória compartilhada).
+        O executor distribui os jobs entre os workers, cada um fixado em
+        um subconjunto dos núcleos.
+
+        Args:
+            processes (int): Número de processos de inferência
+            model_names (List[str]): Modelos carregados antes do fork
+            model_pool (ModelPool): Pool onde os modelos são carregados
+        """
+        self.processes = processes
+        self.model_names = list(model_names)
+        self.model_pool = model_pool or get_model_pool()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pids: List[int] = []
+
+    def start(self) -> "InferencePool":
+        """
+        Carrega os modelos no pai e cria todos os workers imediatamente.
+        Deve rodar antes de qualquer outra thread do processo (fila do log,
+        executores, threads do torch): um fork com threads ativas pode
+        herdar locks ocupados e travar os workers.
+        """
+        global _shared_pool, _worker_counter, _worker_pids, _cores_per_worker
+        with self._lock:
+            if self._executor is not None:
+                return self
+            threads = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+            if threads:
+                logger.warning(f"Pool de inferência criado com outras threads ativas (risco no fork): {threads}")
+            for name in self.model_names:
+                model = self.model_pool.get(name)
+                share_memory = getattr(model, "share_memory", None)
+                if callable(share_memory):
+                    share_memory()
+
+            context = multiprocessing.get_context("fork")
+            _shared_pool = self.model_pool
+            _worker_counter = context.Value("i", 0)
+            _worker_pids = context.Queue()
+            _cores_per_worker = max(1, (os.cpu_count() or 1) // self.processes)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=context, initializer=_init_worker
+            )
+            # Com fork, o primeiro submit cria todos os workers de uma vez
+            self._executor.submit(_ping).result()
+            try:
+                self._pids = sorted(_worker_pids.get(timeout=60) for _ in range(self.processes))
+            except queue.Empty:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                raise RuntimeError("Os workers de inferência não concluíram a inicialização")
+        logger.info(
+            f"Pool de inferência iniciado: {self.processes} processos, "
+            f"{_cores_per_worker} núcleo(s) cada, modelos {self.model_names}"
+        )
+        return self
+
+    def transcribe(self, model_name: str, audio: Union[str, np.ndarray, np.memmap], **params) -> Dict[str, Any]:
+        """
+        Transcreve em um dos workers. Buffers mapeados em memória são passados
+        pelo caminho do arquivo, sem serializar as amostras.
+        """
+        if self._executor is None:
+            self.start()
+        if model_name not in self.model_names:
+            logger.warning(f"Modelo {model_name} não pré-carregado: cada worker carregará sua própria cópia")
+        pcm = isinstance(audio, np.memmap) and bool(audio.filename)
+        payload = audio.filename if pcm else audio
+        return self._executor.submit(_infer, model_name, payload, params, pcm).result()
+
+    def submit_window(self, model_name: str, pcm_path: str, start: int, end: int,
+                      params: Dict[str, Any]) -> Future:
+        """Janela de um áudio longo: o worker lê só as amostras [start, end) do buffer em disco"""
+        if self._executor is None:
+            self.start()
+        return self._executor.submit(_infer, model_name, pcm_path, params, True, (start, end))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "processes": self.processes,
+            "models": self.model_names,
+            "cores_per_worker": _cores_per_worker,
+            "worker_pids": list(self._pids),
+            "running": self._executor is not None,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+
+def get_inference_pool(model_pool: Optional[ModelPool] = None,
+                       settings: Optional[Settings] = None) -> Optional[InferencePool]:
+    """
+    Cria o pool multiprocesso quando SERVING_PROCESSES > 0 (modelos em
+    SERVING_MODELS, padrão "base"). Retorna None se desabilitado ou se a
+    plataforma não suportar fork.
+    """
+    settings = settings or get_settings()
+    if settings.serving_processes <= 0:
+        return None
+    if "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Plataforma sem fork: serviço multiprocesso desabilitado")
+        return None
+    return InferencePool(settings.serving_processes, list(settings.serving_models), model_pool)
@@ -0,0 +1,230 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+from ..config import get_settings
+from .metrics import get_metrics
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Levantada quando a fila de jobs atingiu a profundidade máxima"""
+
+
+class Job:
+    def __init__(self, job_id: str, metadata: Optional[Dict[str, Any]] = None):
+        self.id = job_id
+        self.status = JOB_QUEUED
+        self.metadata = metadata or {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._created_counter = time.perf_counter()
+        self._started_counter: Optional[float] = None
+        self._finished_counter: Optional[float] = None
+
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        if self._started_counter is None:
+            return None
+        return self._started_counter - self._created_counter
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        if self._started_counter is None or self._finished_counter is None:
+            return None
+        return self._finished_counter - self._started_counter
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representação serializável do job"""
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "metadata": self.metadata,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "timing": {
+                "queue_seconds": _round(self.queue_seconds),
+                "run_seconds": _round(self.run_seconds),
+            },
+        }
+        if self.status == JOB_COMPLETED:
+            data["result"] = _expand(self.result)
+        if self.status == JOB_FAILED:
+            data["error"] = self.error
+        return data
+
+
+# Job executado pela thread atual (definido por JobManager._run)
+_current_job: ContextVar[Optional[Job]] = ContextVar("current_job", default=None)
+
+
+def current_job() -> Optional[Job]:
+    """Job em execução na thread atual, ou None fora de um job"""
+    return _current_job.get()
+
+
+def _expand(result: Any) -> Any:
+    """Converte estruturas compactas do resultado (ex.: SegmentArray) em listas serializáveis"""
+    if isinstance(result, dict):
+        return {key: value.to_list() if hasattr(value, "to_list") else value for key, value in result.items()}
+    return result
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 2, max_queue_size: int = 16, max_finished_jobs: int = 1000):
+        """
+        Executa transcrições fora do event loop em um pool de threads limitado.
+
+        Args:
+            max_workers (int): Número máximo de jobs executando simultaneamente
+            max_queue_size (int): Número máximo de jobs aguardando execução
+            max_finished_jobs (int): Quantos jobs finalizados manter para consulta
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcription")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+    def submit(self, func: Callable[..., Any], *args, metadata: Optional[Dict[str, Any]] = None,
+               start_after: Optional[Future] = None, cleanup: Optional[Callable[[], None]] = None,
+               **kwargs) -> Job:
+        """
+        Enfileira uma função para execução em segundo plano.
+
+        Args:
+            start_after (Future): O job só vai para os workers quando este
+                Future for concluído (ex.: a vaga concedida pelo agendador);
+                se for cancelado ou falhar, o job falha sem executar
+            cleanup (Callable): Chamada quando o job falha sem executar, para
+                liberar o que a função liberaria (arquivo enviado, áudio decodificado)
+
+        Raises:
+            QueueFullError: Se a fila já estiver cheia
+        """
+        with self._lock:
+            if self._queued >= self.max_queue_size:
+                raise QueueFullError(
+                    f"Fila de transcrição cheia ({self.max_queue_size} jobs aguardando)"
+                )
+            job = Job(uuid.uuid4().hex, metadata)
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._trim_finished()
+
+        if start_after is None:
+            self._executor.submit(self._run, job, func, args, kwargs)
+        else:
+            start_after.add_done_callback(lambda future: self._start(job, future, func, args, kwargs, cleanup))
+        return job
+
+    def _start(self, job: Job, future: Future, func: Callable[..., Any], args, kwargs,
+               cleanup: Optional[Callable[[], None]] = None) -> None:
+        if not future.cancelled() and future.exception() is None:
+            try:
+                self._executor.submit(self._run, job, func, args, kwargs)
+                return
+            except RuntimeError:
+                pass  # pool já encerrado
+        with self._lock:
+            self._queued -= 1
+        job.error = "Job cancelado antes de iniciar"
+        job.status = JOB_FAILED
+        job.finished_at = time.time()
+        if cleanup is not None:
+            try:
+                cleanup()
+            except Exception as e:
+                logger.bind(job_id=job.id).error(f"Erro na limpeza do job {job.id}: {e}")
+
+    def _run(self, job: Job, func: Callable[..., Any], args, kwargs) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        job._started_counter = time.perf_counter()
+        get_metrics().observe_stage("queue", job.queue_seconds)
+        token = _current_job.set(job)
+        try:
+            # Todos os registros de log emitidos pelo job carregam o job_id
+            with logger.contextualize(job_id=job.id):
+                job.result = func(*args, **kwargs)
+            job.status = JOB_COMPLETED
+        except Exception as e:
+            logger.bind(job_id=job.id).error(f"Erro no job {job.id}: {e}")
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            _current_job.reset(token)
+            job._finished_counter = time.perf_counter()
+            job.finished_at = time.time()
+            with self._lock:
+                self._running -= 1
+
+    def _trim_finished(self) -> None:
+        """Descarta os jobs finalizados mais antigos além do limite"""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in (JOB_COMPLETED, JOB_FAILED)
+        ]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Retorna o job pelo identificador"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna profundidade da fila e ocupação dos workers"""
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "tracked_jobs": len(self._jobs),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Encerra o pool de workers"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_manager: Optional[JobManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Retorna o gerenciador de jobs compartilhado pelas aplicações"""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            settings = get_settings()
+            _default_manager = JobManager(
+                max_workers=settings.job_workers,
+                max_queue_size=settings.job_queue_size,
+            )
+        return _default_manager
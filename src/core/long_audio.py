@@ -0,0 +1,286 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+from ..config import get_settings
+from .audio import SAMPLE_RATE, decode_to_memmap, open_audio  # noqa: F401 (reexportados)
+
+# Estado de cada processo worker (um pool de modelos por processo)
+_worker_pool = None
+
+
+def find_quiet_point(audio: np.ndarray, start: int, end: int, frame_size: int = 320) -> int:
+    """
+    Retorna o índice da amostra de menor energia no intervalo [start, end),
+    usado para cortar janelas em pausas em vez de no meio de palavras.
+    """
+    start = max(0, start)
+    end = min(len(audio), end)
+    num_frames = (end - start) // frame_size
+    if num_frames <= 1:
+        return end
+    frames = np.asarray(audio[start:start + num_frames * frame_size]).reshape(num_frames, frame_size)
+    energy = np.square(frames, dtype=np.float32).mean(axis=1)
+    # Em empate (ex.: silêncio contínuo) prefere o ponto mais próximo do fim
+    quietest = num_frames - 1 - int(np.argmin(energy[::-1]))
+    return start + quietest * frame_size + frame_size // 2
+
+
+def plan_windows(
+    audio: np.ndarray,
+    window_seconds: float = 300.0,
+    overlap_seconds: float = 5.0,
+    search_seconds: float = 10.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Tuple[int, int]]:
+    """
+    Divide o áudio em janelas sobrepostas, cortando em pontos de silêncio.
+
+    Args:
+        audio: Amostras mono
+        window_seconds (float): Duração máxima de cada janela
+        overlap_seconds (float): Sobreposição entre janelas consecutivas
+        search_seconds (float): Quanto antes do fim nominal procurar silêncio
+
+    Returns:
+        Lista de (amostra_inicial, amostra_final)
+    """
+    window = int(window_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    search = int(min(search_seconds, window_seconds / 2) * sample_rate)
+    if overlap >= window - search:
+        raise ValueError("A sobreposição deve ser menor que a janela menos a busca de silêncio")
+
+    total = len(audio)
+    windows = []
+    position = 0
+    while True:
+        nominal_end = position + window
+        if nominal_end >= total:
+            windows.append((position, total))
+            break
+        cut = find_quiet_point(audio, nominal_end - search, nominal_end)
+        windows.append((position, cut))
+        position = cut - overlap
+    return windows
+
+
+def _init_worker(model_factory: Optional[Callable[..., Any]], num_threads: Optional[int],
+                 max_memory_mb: Optional[float]) -> None:
+    """Inicializa o processo worker com seu próprio pool de modelos"""
+    global _worker_pool
+    from .model_pool import ModelPool
+
+    if num_threads:
+        # Vale para o torch importado depois (pela fábrica de modelos)
+        os.environ.setdefault("OMP_NUM_THREADS", str(num_threads))
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            torch.set_num_threads(num_threads)
+    _worker_pool = ModelPool(max_memory_mb=max_memory_mb, model_factory=model_factory)
+
+
+def _transcribe_window(model_name: str, pcm_path: str, start: int, end: int, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Transcreve uma janela lendo apenas suas amostras do buffer em disco"""
+    audio = np.memmap(pcm_path, dtype=np.float32, mode="r")
+    window = np.array(audio[start:end])
+    model = _worker_pool.get(model_name)
+    return model.transcribe(window, **params)
+
+
+class LongAudioPool:
+    def __init__(self, workers: Optional[int] = None, model_factory: Optional[Callable[..., Any]] = None,
+                 max_memory_mb: Optional[float] = None):
+        """
+        Processos (spawn) que transcrevem as janelas dos áudios longos.
+        Criados no primeiro uso e mantidos entre as requisições: cada worker
+        carrega o modelo uma vez, com o mesmo orçamento de memória do pool
+        principal, e o reaproveita nas chamadas seguintes.
+
+        Args:
+            workers (int): Número de processos (padrão: nº de CPUs)
+            model_factory (Callable): Fábrica de modelos (precisa ser picklable)
+            max_memory_mb (float): Orçamento do pool de modelos de cada worker
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.model_factory = model_factory
+        self.max_memory_mb = max_memory_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit_window(self, model_name: str, pcm_path: str, start: int, end: int,
+                      params: Dict[str, Any]) -> Future:
+        """Enfileira a transcrição das amostras [start, end) do buffer em disco"""
+        with self._lock:
+            if self._executor is None:
+                num_threads = max(1, (os.cpu_count() or 1) // self.workers)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_factory, num_threads, self.max_memory_mb),
+                )
+            executor = self._executor
+        return executor.submit(_transcribe_window, model_name, pcm_path, start, end, params)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "running": self._executor is not None}
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+
+def iter_stitched_segments(
+    windows: List[Tuple[int, int]],
+    results: Iterable[Dict[str, Any]],
+    sample_rate: int = SAMPLE_RATE,
+    max_repeat_words: int = 8,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Costura os resultados das janelas à medida que chegam (em ordem),
+    gerando cada segmento já no tempo absoluto do áudio.
+
+    Na região sobreposta mantém os segmentos da janela anterior até o ponto
+    médio da sobreposição e os da janela seguinte a partir dele; palavras
+    repetidas na emenda são removidas.
+    """
+    previous: Optional[Dict[str, Any]] = None
+    count = 0
+    for index, result in enumerate(results):
+        start, end = windows[index]
+        offset = start / sample_rate
+        lower = 0.0
+        upper = float("inf")
+        if index > 0:
+            previous_end = windows[index - 1][1] / sample_rate
+            lower = (offset + previous_end) / 2
+        if index < len(windows) - 1:
+            upper = (windows[index + 1][0] / sample_rate + end / sample_rate) / 2
+
+        first_in_window = True
+        for segment in result.get("segments", []):
+            seg_start = segment["start"] + offset
+            seg_end = segment["end"] + offset
+            midpoint = (seg_start + seg_end) / 2
+            if not lower <= midpoint < upper:
+                continue
+            text = segment["text"].strip()
+            if first_in_window and previous is not None:
+                text = _drop_repeated_prefix(previous["text"], text, max_repeat_words)
+            if not text:
+                continue
+            first_in_window = False
+            if previous is not None:
+                # Mantém os timestamps monotônicos na emenda entre janelas
+                seg_start = max(seg_start, previous["end"])
+                seg_end = max(seg_end, seg_start)
+            stitched = {k: v for k, v in segment.items() if k not in ("tokens", "id", "seek")}
+            stitched.update({"id": count, "start": round(seg_start, 3), "end": round(seg_end, 3), "text": text})
+            if segment.get("words"):
+                stitched["words"] = [
+                    {**word, "start": round(word["start"] + offset, 3), "end": round(word["end"] + offset, 3)}
+                    for word in segment["words"]
+                ]
+            count += 1
+            previous = stitched
+            yield stitched
+
+
+def stitch_results(
+    windows: List[Tuple[int, int]],
+    results: List[Dict[str, Any]],
+    sample_rate: int = SAMPLE_RATE,
+    max_repeat_words: int = 8,
+) -> Dict[str, Any]:
+    """Junta os resultados de todas as janelas em uma única transcrição"""
+    segments = list(iter_stitched_segments(windows, results, sample_rate, max_repeat_words))
+    language = next((r.get("language") for r in results if r.get("language")), "")
+    return {
+        "text": " ".join(s["text"] for s in segments),
+        "segments": segments,
+        "language": language,
+    }
+
+
+def _drop_repeated_prefix(previous: str, current: str, max_words: int) -> str:
+    """Remove do início de `current` as palavras que repetem o fim de `previous`"""
+    previous_words = previous.lower().split()
+    current_words = current.split()
+    lowered = [w.lower() for w in current_words]
+    for size in range(min(max_words, len(previous_words), len(current_words)), 0, -1):
+        if previous_words[-size:] == lowered[:size]:
+            return " ".join(current_words[size:])
+    return current
+
+
+def transcribe_long_audio(
+    audio: Union[str, Path, np.ndarray],
+    model_name: str = "base",
+    model_factory: Optional[Callable[..., Any]] = None,
+    workers: Optional[int] = None,
+    window_seconds: float = 300.0,
+    overlap_seconds: float = 5.0,
+    search_seconds: float = 10.0,
+    pool=None,
+    **params,
+) -> Dict[str, Any]:
+    """
+    Transcreve áudios longos em janelas paralelas usando um pool de processos.
+
+    Args:
+        audio: Arquivo de áudio, DecodedAudio ou amostras float32 mono 16 kHz
+        model_name (str): Modelo Whisper
+        model_factory (Callable): Fábrica de modelos (precisa ser picklable)
+        workers (int): Número de processos (padrão: LONG_AUDIO_WORKERS ou nº de CPUs)
+        window_seconds (float): Duração máxima de cada janela
+        overlap_seconds (float): Sobreposição entre janelas
+        search_seconds (float): Janela de busca por silêncio antes de cada corte
+        pool: Pool persistente com submit_window (LongAudioPool ou InferencePool);
+            sem ele, um LongAudioPool temporário é criado só para esta chamada
+        **params: Parâmetros repassados a model.transcribe
+
+    Returns:
+        Dict com text, segments, language e estatísticas das janelas
+    """
+    start_time = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="long_audio_") as temp_dir:
+        pcm_path = os.path.join(temp_dir, "audio.f32")
+        audio = open_audio(audio, pcm_path)
+        # Áudio já decodificado: os workers leem direto do buffer existente
+        pcm_path = audio.filename
+        windows = plan_windows(audio, window_seconds, overlap_seconds, search_seconds)
+        duration = len(audio) / SAMPLE_RATE
+        del audio
+
+        owned = pool is None
+        if owned:
+            workers = workers or get_settings().long_audio_workers or os.cpu_count() or 1
+            pool = LongAudioPool(min(workers, len(windows)), model_factory)
+        workers = getattr(pool, "workers", None) or getattr(pool, "processes", 1)
+        logger.info(f"Transcrevendo {duration:.0f}s de áudio em {len(windows)} janelas com {workers} processos")
+        try:
+            futures = [pool.submit_window(model_name, pcm_path, start, end, params) for start, end in windows]
+            results = [future.result() for future in futures]
+        finally:
+            if owned:
+                pool.shutdown(wait=True)
+
+    stitched = stitch_results(windows, results)
+    stitched["duration"] = round(duration, 3)
+    stitched["windows"] = len(windows)
+    stitched["workers"] = workers
+    stitched["wall_seconds"] = round(time.perf_counter() - start_time, 3)
+    return stitched
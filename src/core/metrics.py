@@ -0,0 +1,260 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, reservoir_size: int = 2048):
+        """
+        Distribuição de observações: contagem e soma totais mais uma janela
+        das observações recentes usada no cálculo dos percentis.
+
+        Args:
+            reservoir_size (int): Observações recentes mantidas para os percentis
+        """
+        self.count = 0
+        self.sum = 0.0
+        self._recent: deque = deque(maxlen=reservoir_size)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self._recent.append(value)
+
+    def quantiles(self, quantiles=QUANTILES) -> Dict[float, float]:
+        """Percentis (interpolação linear) das observações recentes"""
+        values = sorted(self._recent)
+        if not values:
+            return {q: math.nan for q in quantiles}
+        result = {}
+        for q in quantiles:
+            position = q * (len(values) - 1)
+            lower = int(position)
+            upper = min(lower + 1, len(values) - 1)
+            result[q] = values[lower] + (values[upper] - values[lower]) * (position - lower)
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self, reservoir_size: int = 2048):
+        """
+        Registro de métricas compartilhado pelas duas aplicações: histogramas
+        de latência por etapa, contadores e gauges (valores fixos ou lidos
+        sob demanda de callbacks, como a profundidade da fila).
+        """
+        self.reservoir_size = reservoir_size
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauge_callbacks: Dict[str, Callable[[], float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Registra uma observação em um histograma"""
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.reservoir_size)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        """Incrementa um contador"""
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Define o valor atual de um gauge"""
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def register_gauge(self, name: str, callback: Callable[[], float], help_text: Optional[str] = None) -> None:
+        """Registra um gauge lido sob demanda a cada coleta"""
+        with self._lock:
+            self._gauge_callbacks[name] = callback
+        if help_text:
+            self.describe(name, help_text)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Mede a duração de uma etapa no histograma de etapas"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.observe("transcription_stage_seconds", seconds, stage=stage)
+
+    def observe_realtime_factor(self, processing_seconds: float, audio_seconds: Optional[float]) -> None:
+        """Registra o fator de tempo real (tempo de processamento / duração do áudio)"""
+        if not audio_seconds:
+            return
+        factor = processing_seconds / audio_seconds
+        self.observe("transcription_realtime_factor", factor)
+        self.set_gauge("transcription_realtime_factor_last", factor)
+        self.inc("transcription_audio_seconds_total", audio_seconds)
+
+    def _collect_gauges(self) -> Dict[str, Dict[LabelKey, float]]:
+        with self._lock:
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            callbacks = list(self._gauge_callbacks.items())
+        for name, callback in callbacks:
+            try:
+                gauges[name] = {(): float(callback())}
+            except Exception:
+                continue
+        return gauges
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Retorna todas as métricas como dicionário serializável"""
+        with self._lock:
+            histograms = {
+                name: {_label_string(key) or "total": _histogram_dict(h) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+            counters = {
+                name: {_label_string(key) or "total": value for key, value in series.items()}
+                for name, series in self._counters.items()
+            }
+        gauges = {
+            name: {_label_string(key) or "value": value for key, value in series.items()}
+            for name, series in self._collect_gauges().items()
+        }
+        return {"histograms": histograms, "counters": counters, "gauges": gauges}
+
+    def render_prometheus(self) -> str:
+        """Formata as métricas no formato de exposição de texto do Prometheus"""
+        lines: List[str] = []
+        with self._lock:
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        for name, series in sorted(histograms.items()):
+            self._header(lines, name, "summary")
+            with self._lock:
+                rows = [(key, h.quantiles(), h.sum, h.count) for key, h in series.items()]
+            for key, quantiles, total, count in rows:
+                for q, value in quantiles.items():
+                    lines.append(f"{name}{_labels(key + (('quantile', str(q)),))} {_number(value)}")
+                lines.append(f"{name}_sum{_labels(key)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(key)} {count}")
+        for name, series in sorted(counters.items()):
+            self._header(lines, name, "counter")
+            for key, value in series.items():
+                lines.append(f"{name}{_labels(key)} {_number(value)}")
+        for name, series in sorted(self._collect_gauges().items()):
+            self._header(lines, name, "gauge")
+            for key, value in series.items():
+                lines.append(f"{name}{_labels(key)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, metric_type: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    def reset(self) -> None:
+        """Descarta as observações (os gauges registrados são mantidos)"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+def _histogram_dict(histogram: Histogram) -> Dict[str, float]:
+    quantiles = histogram.quantiles()
+    return {
+        "count": histogram.count,
+        "sum": round(histogram.sum, 6),
+        **{f"p{int(q * 100)}": (None if math.isnan(v) else round(v, 6)) for q, v in quantiles.items()},
+    }
+
+
+def _label_string(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key)
+
+
+def _labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in key) + "}"
+
+
+def _escape_label(value: str) -> str:
+    """Escapa barra invertida (primeiro), aspas e quebras de linha, como exige o formato texto"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class StageTimer:
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        Cronômetro de uma requisição: mede cada etapa com perf_counter,
+        guarda o detalhamento para a resposta e alimenta o registro global.
+        """
+        self.registry = registry or get_metrics()
+        self.start_time = time.perf_counter()
+        self.steps: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Registra uma etapa medida externamente (acumula se repetida)"""
+        self.steps[name] = self.steps.get(name, 0.0) + seconds
+        self.registry.observe_stage(name, seconds)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def get_summary(self) -> Dict:
+        """Duração de cada etapa e tempo total, em segundos"""
+        return {
+            "steps": {name: {"step_duration": round(seconds, 4)} for name, seconds in self.steps.items()},
+            "total_time_seconds": round(self.elapsed, 4),
+        }
+
+
+_default_registry = MetricsRegistry()
+_default_registry.describe("transcription_stage_seconds", "Duração de cada etapa da transcrição")
+_default_registry.describe("transcription_realtime_factor", "Tempo de processamento / duração do áudio")
+_default_registry.describe("transcription_audio_seconds_total", "Segundos de áudio transcritos")
+
+
+def get_metrics() -> MetricsRegistry:
+    """Retorna o registro de métricas compartilhado pelas aplicações"""
+    return _default_registry
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
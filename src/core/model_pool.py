@@ -0,0 +1,271 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from ..config import get_settings
+
+# Tamanho aproximado (MB, fp32) de cada modelo Whisper, usado quando o modelo
+# carregado não expõe seus parâmetros (ex.: modelos stub nos testes)
+MODEL_MEMORY_ESTIMATES_MB = {
+    "tiny": 150,
+    "base": 290,
+    "small": 970,
+    "medium": 3050,
+    "large": 6200,
+}
+
+
+def _default_model_factory(model_name: str, device: Optional[str] = None):
+    """Carrega um modelo Whisper a partir dos pesos oficiais"""
+    import whisper
+
+    return whisper.load_model(model_name, device=device)
+
+
+def estimate_model_memory_mb(model: Any, model_name: str) -> float:
+    """
+    Estima a memória ocupada por um modelo carregado.
+
+    Args:
+        model: Modelo carregado
+        model_name (str): Nome do modelo, usado como fallback
+
+    Returns:
+        float: Memória estimada em MB
+    """
+    parameters = getattr(model, "parameters", None)
+    if callable(parameters):
+        try:
+            total = sum(p.numel() * p.element_size() for p in parameters())
+            if total:
+                return total / 1024 / 1024
+        except Exception:
+            pass
+    base_name = model_name.split(".")[0].split("-")[0]
+    return float(MODEL_MEMORY_ESTIMATES_MB.get(base_name, 0))
+
+
+class ModelPool:
+    def __init__(
+        self,
+        max_memory_mb: Optional[float] = None,
+        model_factory: Optional[Callable[..., Any]] = None,
+        device: Optional[str] = None,
+    ):
+        """
+        Registro compartilhado de modelos com carregamento sob demanda e
+        remoção LRU quando o orçamento de memória é excedido.
+
+        Args:
+            max_memory_mb (float): Orçamento de memória em MB (None = sem limite)
+            model_factory (Callable): Função (model_name, device) -> modelo
+            device (str): Dispositivo onde os modelos são carregados
+        """
+        self.max_memory_mb = max_memory_mb
+        self.model_factory = model_factory or _default_model_factory
+        self.device = device
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "load_count": 0,
+            "load_time_seconds": 0.0,
+        }
+
+    def get(self, model_name: str) -> Any:
+        """
+        Retorna o modelo solicitado, carregando-o apenas na primeira vez.
+
+        Args:
+            model_name (str): Nome do modelo Whisper
+
+        Returns:
+            Modelo carregado
+        """
+        with self._lock:
+            if model_name in self._models:
+                self._models.move_to_end(model_name)
+                self._stats["hits"] += 1
+                return self._models[model_name]
+            load_lock = self._loading.setdefault(model_name, threading.Lock())
+
+        # Apenas uma thread carrega cada modelo; as demais aguardam o resultado
+        with load_lock:
+            with self._lock:
+                if model_name in self._models:
+                    self._models.move_to_end(model_name)
+                    self._stats["hits"] += 1
+                    return self._models[model_name]
+                self._stats["misses"] += 1
+
+            start_time = time.perf_counter()
+            model = self.model_factory(model_name, device=self.device)
+            load_time = time.perf_counter() - start_time
+
+            with self._lock:
+                self._models[model_name] = model
+                self._memory[model_name] = estimate_model_memory_mb(model, model_name)
+                self._stats["load_count"] += 1
+                self._stats["load_time_seconds"] += load_time
+                self._evict_over_budget(keep=model_name)
+                self._loading.pop(model_name, None)
+
+        logger.info(f"Modelo {model_name} carregado no pool em {load_time:.2f}s")
+        return model
+
+    def _evict_over_budget(self, keep: str) -> None:
+        """Remove os modelos menos usados até respeitar o orçamento"""
+        if self.max_memory_mb is None:
+            return
+        for name in list(self._models):
+            if self.memory_usage_mb() <= self.max_memory_mb:
+                break
+            if name == keep:
+                continue
+            self._remove(name)
+            self._stats["evictions"] += 1
+            logger.info(f"Modelo {name} removido do pool (orçamento de memória)")
+        if self.memory_usage_mb() > self.max_memory_mb:
+            logger.warning(
+                f"Modelo {keep} excede o orçamento de {self.max_memory_mb} MB do pool"
+            )
+
+    def _remove(self, model_name: str) -> None:
+        self._models.pop(model_name, None)
+        self._memory.pop(model_name, None)
+        try:
+            import torch
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+    def evict(self, model_name: str) -> bool:
+        """Remove explicitamente um modelo do pool"""
+        with self._lock:
+            if model_name not in self._models:
+                return False
+            self._remove(model_name)
+            self._stats["evictions"] += 1
+            return True
+
+    def clear(self) -> None:
+        """Remove todos os modelos do pool"""
+        with self._lock:
+            for name in list(self._models):
+                self._remove(name)
+
+    def loaded_models(self) -> List[str]:
+        """Retorna os modelos residentes, do menos ao mais recente"""
+        with self._lock:
+            return list(self._models)
+
+    def memory_usage_mb(self) -> float:
+        """Retorna a memória estimada ocupada pelos modelos residentes"""
+        return sum(self._memory.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores de acerto/falta e tempo de carregamento"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["load_time_seconds"] = round(stats["load_time_seconds"], 3)
+            stats["loaded_models"] = list(self._models)
+            stats["memory_usage_mb"] = round(self.memory_usage_mb(), 1)
+            stats["max_memory_mb"] = self.max_memory_mb
+            return stats
+
+
+WARMUP_PENDING = "pending"
+WARMUP_RUNNING = "warming"
+WARMUP_READY = "ready"
+WARMUP_FAILED = "failed"
+
+
+class ModelWarmup:
+    def __init__(self, pool: ModelPool, model_names: List[str]):
+        """
+        Carrega modelos em uma thread de fundo, para que a aplicação responda
+        (liveness) antes de estar pronta para transcrever (readiness).
+
+        Args:
+            pool (ModelPool): Pool onde os modelos serão carregados
+            model_names (List[str]): Modelos a pré-carregar
+        """
+        self.pool = pool
+        self.model_names = list(model_names)
+        self.status = WARMUP_READY if not self.model_names else WARMUP_PENDING
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ModelWarmup":
+        if self.status == WARMUP_PENDING:
+            self.status = WARMUP_RUNNING
+            self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            for name in self.model_names:
+                self.pool.get(name)
+            self.status = WARMUP_READY
+            logger.info(f"Pré-carregamento concluído: {', '.join(self.model_names)}")
+        except Exception as e:
+            self.error = str(e)
+            self.status = WARMUP_FAILED
+            logger.error(f"Falha no pré-carregamento de modelos: {e}")
+        finally:
+            self.seconds = round(time.perf_counter() - start, 3)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda o fim do pré-carregamento; retorna True se pronto"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.status == WARMUP_READY
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": self.status, "models": self.model_names, "seconds": self.seconds, "error": self.error}
+
+
+def warmup_models_from_env(pool: ModelPool, default_model: str = "base", setting: Optional[str] = None) -> ModelWarmup:
+    """
+    Cria o pré-carregamento conforme MODEL_WARMUP (ou `setting`): vazio/false =
+    carregamento sob demanda, true = modelo padrão, ou uma lista de modelos
+    separada por vírgula.
+    """
+    setting = (get_settings().model_warmup if setting is None else setting).strip().lower()
+    if setting in ("", "0", "false", "no"):
+        names: List[str] = []
+    elif setting in ("1", "true", "yes"):
+        names = [default_model]
+    else:
+        names = [name.strip() for name in setting.split(",") if name.strip()]
+    return ModelWarmup(pool, names)
+
+
+_default_pool: Optional[ModelPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    """Retorna o pool de modelos compartilhado, carregando pelo backend de INFERENCE_BACKEND"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            from .backends import get_inference_backend
+
+            _default_pool = ModelPool(
+                max_memory_mb=get_settings().model_pool_max_memory_mb,
+                model_factory=get_inference_backend().load_model,
+            )
+        return _default_pool
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from loguru import logger
+
+from ..config import get_settings
+
+
+def hash_file(file_path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """Calcula o SHA-256 do conteúdo de um arquivo, lendo em blocos"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: Union[str, Path] = "output/cache", max_memory_entries: int = 256):
+        """
+        Cache de resultados brutos de transcrição endereçado pelo conteúdo do
+        áudio e pelos parâmetros de decodificação.
+
+        Args:
+            directory: Diretório do armazenamento em disco
+            max_memory_entries (int): Entradas mantidas no LRU em memória
+        """
+        self.directory = Path(directory)
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+    def make_key(self, audio_path: Union[str, Path], model_name: str, params: Dict[str, Any],
+                 backend: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Gera a chave do cache a partir do hash do áudio, do modelo, dos
+        parâmetros de decodificação e do backend (nome e precisão), para que
+        processos com backends diferentes não reaproveitem os resultados
+        uns dos outros no mesmo diretório.
+        """
+        audio_hash = hash_file(audio_path)
+        settings = json.dumps({"model": model_name, "params": params, "backend": backend},
+                              sort_keys=True, default=str)
+        return hashlib.sha256(f"{audio_hash}:{settings}".encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retorna o resultado em cache ou None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        except Exception as e:
+            logger.error(f"Erro ao ler cache {path}: {e}")
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._remember(key, result)
+        return result
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Armazena o resultado em memória e em disco (escrita atômica)"""
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, default=_to_builtin)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.error(f"Erro ao gravar cache {path}: {e}")
+
+        with self._lock:
+            self._stats["writes"] += 1
+            self._remember(key, result)
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear_memory(self) -> None:
+        """Esvazia o LRU em memória (o armazenamento em disco é mantido)"""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores de acertos e faltas"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            return stats
+
+
+def _to_builtin(value: Any) -> Any:
+    """Converte tipos NumPy/PyTorch presentes no resultado do Whisper"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+_default_cache: Optional[ResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Retorna o cache compartilhado, ou None se desabilitado por RESULT_CACHE_ENABLED"""
+    global _default_cache
+    settings = get_settings()
+    if not settings.result_cache_enabled:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(
+                directory=settings.result_cache_dir,
+                max_memory_entries=settings.result_cache_memory_entries,
+            )
+        return _default_cache
@@ -0,0 +1,335 @@
+import asyncio
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from ..config import Settings, get_settings
+
+# Segundos de processamento por segundo de áudio em CPU, ponto de partida
+# das estimativas; o agendador ajusta cada fator com os tempos observados
+MODEL_REALTIME_FACTORS = {"tiny": 0.05, "base": 0.1, "small": 0.3, "medium": 0.8, "large": 1.6}
+DEFAULT_REALTIME_FACTOR = 0.3
+
+
+class RateLimitExceededError(Exception):
+    """O cliente excedeu a cota de requisições por minuto"""
+
+    def __init__(self, client_id: str, retry_after: float):
+        self.client_id = client_id
+        self.retry_after = retry_after
+        super().__init__(f"Limite de requisições excedido; tente novamente em {math.ceil(retry_after)}s")
+
+
+class AdmissionRejectedError(Exception):
+    """A transcrição terminaria depois do tempo máximo permitido"""
+
+    def __init__(self, expected_seconds: float, limit_seconds: float, retry_after: Optional[float]):
+        self.expected_seconds = expected_seconds
+        self.limit_seconds = limit_seconds
+        self.retry_after = retry_after
+        super().__init__(
+            f"Tempo estimado ({expected_seconds:.0f}s, incluindo a fila) excede o máximo "
+            f"de {limit_seconds:.0f}s"
+        )
+
+
+class Ticket:
+    def __init__(self, ticket_id: int, client_id: str, model: str, duration: float, cost: float):
+        """Uma transcrição admitida, aguardando ou ocupando uma vaga"""
+        self.id = ticket_id
+        self.client_id = client_id
+        self.model = model
+        self.duration = duration
+        self.cost = cost
+        self.expected_wait = 0.0
+        self.granted: "Future[Ticket]" = Future()
+        self._created = time.perf_counter()
+        self._started: Optional[float] = None
+        self._released = False
+
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        return None if self._started is None else self._started - self._created
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo devolvido ao cliente (estimativas e espera real)"""
+        return {
+            "client_id": self.client_id,
+            "estimated_seconds": round(self.cost, 2),
+            "expected_wait_seconds": round(self.expected_wait, 2),
+            "queue_seconds": round(self.queue_seconds, 3) if self.queue_seconds is not None else None,
+        }
+
+
+class _TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Consome uma ficha; retorna 0 ou os segundos até haver uma disponível"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class FairScheduler:
+    def __init__(self, max_concurrent: int = 2, client_max_concurrent: int = 1,
+                 client_rate_per_minute: float = 0, client_burst: Optional[int] = None,
+                 max_seconds: Optional[float] = None, aging_rate: float = 1.0,
+                 realtime_factors: Optional[Dict[str, float]] = None, smoothing: float = 0.2):
+        """
+        Controle de admissão e escalonamento das transcrições. Cada pedido
+        tem seu custo estimado (duração do áudio x fator do modelo) e espera
+        uma vaga; a próxima vaga vai para o menor custo esperado, descontado
+        do tempo já passado na fila (envelhecimento), entre os clientes que
+        ainda não atingiram seu limite de execuções simultâneas.
+
+        Args:
+            max_concurrent (int): Transcrições executando ao mesmo tempo
+            client_max_concurrent (int): Execuções simultâneas por cliente (0 = sem limite)
+            client_rate_per_minute (float): Pedidos por minuto por cliente (0 = sem limite)
+            client_burst (int): Pedidos seguidos aceitos antes da cota por minuto valer
+            max_seconds (float): Espera + processamento máximo; acima disso o pedido é recusado
+            aging_rate (float): Segundos de custo descontados por segundo de espera
+            realtime_factors (Dict): Fator inicial por modelo (segundos por segundo de áudio)
+            smoothing (float): Peso de cada observação no ajuste dos fatores
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.client_max_concurrent = client_max_concurrent
+        self.client_rate_per_minute = client_rate_per_minute
+        self.client_burst = client_burst or max(1, math.ceil(client_rate_per_minute))
+        self.max_seconds = max_seconds
+        self.aging_rate = aging_rate
+        self.smoothing = smoothing
+        self._factors = dict(realtime_factors or MODEL_REALTIME_FACTORS)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._queued: List[Ticket] = []
+        self._running: Dict[int, Ticket] = {}
+        self._client_running: Dict[str, int] = {}
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._stats = {"admitted": 0, "rejected": 0, "rate_limited": 0, "completed": 0}
+
+    def estimate_cost(self, duration: float, model: str) -> float:
+        """Segundos de processamento esperados para `duration` segundos de áudio"""
+        return duration * self._factors.get(model, DEFAULT_REALTIME_FACTOR)
+
+    def admit(self, client_id: str, duration: float, model: str, enforce_limit: bool = True) -> Ticket:
+        """
+        Admite um pedido e o coloca na fila; a vaga é concedida em
+        `ticket.granted` (use wait/wait_async). Todo ticket admitido deve
+        ser devolvido com release().
+
+        Args:
+            client_id (str): Identificação do cliente (cotas)
+            duration (float): Duração do áudio em segundos
+            model (str): Modelo usado
+            enforce_limit (bool): Recusa se espera + processamento passar de max_seconds
+
+        Raises:
+            RateLimitExceededError: Cota por minuto do cliente esgotada
+            AdmissionRejectedError: O pedido terminaria depois de max_seconds
+        """
+        with self._lock:
+            cost = self.estimate_cost(duration, model)
+            expected_wait = self._expected_wait(cost)
+            if enforce_limit and self.max_seconds is not None and expected_wait + cost > self.max_seconds:
+                self._stats["rejected"] += 1
+                # Se o áudio sozinho já passa do limite, esperar não adianta
+                retry_after = expected_wait + cost - self.max_seconds if cost <= self.max_seconds else None
+                raise AdmissionRejectedError(expected_wait + cost, self.max_seconds, retry_after)
+            if self.client_rate_per_minute > 0:
+                retry_after = self._bucket(client_id).take()
+                if retry_after:
+                    self._stats["rate_limited"] += 1
+                    raise RateLimitExceededError(client_id, retry_after)
+
+            ticket = Ticket(next(self._ids), client_id, model, duration, cost)
+            ticket.expected_wait = expected_wait
+            self._queued.append(ticket)
+            self._stats["admitted"] += 1
+            granted = self._dispatch()
+        self._notify(granted)
+        return ticket
+
+    def wait(self, ticket: Ticket, timeout: Optional[float] = None) -> Ticket:
+        """Bloqueia a thread até a vaga ser concedida"""
+        return ticket.granted.result(timeout)
+
+    async def wait_async(self, ticket: Ticket) -> Ticket:
+        """Aguarda a vaga sem bloquear o event loop; cancelado, devolve o ticket"""
+        try:
+            return await asyncio.wrap_future(ticket.granted)
+        except asyncio.CancelledError:
+            self.release(ticket)
+            raise
+
+    def release(self, ticket: Ticket, succeeded: bool = True) -> None:
+        """
+        Devolve a vaga (ou retira o ticket da fila, se ainda não começou).
+        Execuções bem-sucedidas ajustam o fator de custo do modelo.
+        Chamadas repetidas são ignoradas.
+        """
+        with self._lock:
+            if ticket._released:
+                return
+            ticket._released = True
+            if ticket._started is None:
+                if ticket in self._queued:
+                    self._queued.remove(ticket)
+                ticket.granted.cancel()
+            else:
+                self._running.pop(ticket.id, None)
+                remaining = self._client_running.get(ticket.client_id, 1) - 1
+                if remaining > 0:
+                    self._client_running[ticket.client_id] = remaining
+                else:
+                    self._client_running.pop(ticket.client_id, None)
+                self._stats["completed"] += 1
+                if succeeded and ticket.duration > 0:
+                    self._observe(ticket.model, (time.perf_counter() - ticket._started) / ticket.duration)
+            granted = self._dispatch()
+        self._notify(granted)
+
+    @contextmanager
+    def slot(self, ticket: Ticket) -> Iterator[Ticket]:
+        """Espera a vaga, executa o bloco e a devolve"""
+        succeeded = False
+        try:
+            self.wait(ticket)
+            yield ticket
+            succeeded = True
+        finally:
+            self.release(ticket, succeeded)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "queued": len(self._queued),
+                "running": len(self._running),
+                "max_concurrent": self.max_concurrent,
+                "expected_wait_seconds": round(self._expected_wait(0.0), 2),
+                "realtime_factors": {model: round(f, 4) for model, f in self._factors.items()},
+            }
+
+    def shutdown(self) -> None:
+        """Cancela os pedidos que ainda aguardam vaga"""
+        with self._lock:
+            queued, self._queued = self._queued, []
+        for ticket in queued:
+            ticket._released = True
+            ticket.granted.cancel()
+
+    def _priority(self, ticket: Ticket, now: float) -> float:
+        # Menor custo primeiro; a espera reduz a prioridade efetiva para
+        # que trabalhos longos não fiquem para sempre atrás dos curtos
+        return ticket.cost - self.aging_rate * (now - ticket._created)
+
+    def _dispatch(self) -> List[Ticket]:
+        """Concede as vagas livres (chamado com o lock); retorna os tickets liberados"""
+        granted = []
+        now = time.perf_counter()
+        while self._queued and len(self._running) < self.max_concurrent:
+            eligible = [
+                t for t in self._queued
+                if not self.client_max_concurrent
+                or self._client_running.get(t.client_id, 0) < self.client_max_concurrent
+            ]
+            if not eligible:
+                break
+            ticket = min(eligible, key=lambda t: (self._priority(t, now), t.id))
+            self._queued.remove(ticket)
+            ticket._started = now
+            self._running[ticket.id] = ticket
+            self._client_running[ticket.client_id] = self._client_running.get(ticket.client_id, 0) + 1
+            granted.append(ticket)
+        return granted
+
+    @staticmethod
+    def _notify(granted: List[Ticket]) -> None:
+        # Fora do lock: os callbacks dos Futures (event loop, fila de jobs) rodam aqui
+        for ticket in granted:
+            if not ticket.granted.done():
+                ticket.granted.set_result(ticket)
+
+    def _expected_wait(self, cost: float) -> float:
+        """
+        Espera estimada de um pedido de custo `cost`: o restante das execuções
+        em andamento mais os pedidos da fila que passariam à frente, divididos
+        pelas vagas.
+        """
+        now = time.perf_counter()
+        if len(self._running) < self.max_concurrent and not self._queued:
+            return 0.0
+        ahead = sum(max(t.cost - (now - t._started), 0.0) for t in self._running.values())
+        ahead += sum(t.cost for t in self._queued if self._priority(t, now) <= cost)
+        return ahead / self.max_concurrent
+
+    def _observe(self, model: str, factor: float) -> None:
+        current = self._factors.get(model, DEFAULT_REALTIME_FACTOR)
+        self._factors[model] = (1 - self.smoothing) * current + self.smoothing * factor
+
+    def _bucket(self, client_id: str) -> _TokenBucket:
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            if len(self._buckets) >= 10000:
+                # Descarta clientes inativos (cota cheia, nada em execução)
+                now = time.monotonic()
+                self._buckets = {
+                    cid: b for cid, b in self._buckets.items()
+                    if cid in self._client_running
+                    or b.tokens + (now - b.updated) * b.rate < b.capacity
+                }
+            bucket = self._buckets[client_id] = _TokenBucket(self.client_burst, self.client_rate_per_minute / 60)
+        return bucket
+
+
+_default_scheduler: Optional[FairScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FairScheduler:
+    """
+    Retorna o agendador compartilhado (SCHEDULER_MAX_CONCURRENT,
+    CLIENT_MAX_CONCURRENT, CLIENT_RATE_PER_MINUTE, CLIENT_BURST,
+    SCHEDULER_AGING_RATE e o limite MAX_TRANSCRIPTION_TIME_MINUTES).
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = create_scheduler(get_settings())
+        return _default_scheduler
+
+
+def create_scheduler(settings: Settings) -> FairScheduler:
+    """Cria um agendador com os limites das configurações"""
+    scheduler = FairScheduler(
+        max_concurrent=settings.scheduler_max_concurrent or settings.job_workers,
+        client_max_concurrent=settings.client_max_concurrent,
+        client_rate_per_minute=settings.client_rate_per_minute,
+        client_burst=settings.client_burst,
+        max_seconds=settings.max_transcription_seconds,
+        aging_rate=settings.scheduler_aging_rate,
+    )
+    logger.info(
+        "Agendador: {} vagas, {} por cliente, limite {}",
+        scheduler.max_concurrent, scheduler.client_max_concurrent,
+        f"{scheduler.max_seconds:.0f}s" if scheduler.max_seconds else "nenhum",
+    )
+    return scheduler
@@ -0,0 +1,360 @@
+"""
+Índice de busca das transcrições arquivadas em output/.
+
+Uso:
+    python -m src.core.search_index output/            # indexa arquivos novos ou alterados
+    python -m src.core.search_index output/ --rebuild  # recria o índice do zero
+"""
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from ..config import get_settings
+from ..utils.helpers import configure_logging
+
+TRANSCRIPT_SUFFIX = "_transcription"
+_WORD_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    start_ms INTEGER,
+    end_ms INTEGER,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_doc ON segments (doc_id);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    PRIMARY KEY (term, segment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_segment ON postings (segment_id);
+"""
+
+
+def normalize(text: str) -> str:
+    """Minúsculas e sem acentos: "Ação" e "acao" viram o mesmo termo"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=100_000)
+def _normalize_word(word: str) -> str:
+    return normalize(word)
+
+
+def tokenize(text: str) -> List[str]:
+    """Termos normalizados do texto, na ordem em que aparecem"""
+    # O vocabulário se repete muito: normaliza cada palavra uma única vez
+    return [_normalize_word(word) for word in _WORD_RE.findall(text)]
+
+
+def _to_ms(seconds: Optional[float]) -> Optional[int]:
+    return None if seconds is None else int(round(seconds * 1000))
+
+
+def transcript_segments(result: Dict[str, Any]) -> List[Tuple[Optional[int], Optional[int], str]]:
+    """
+    Segmentos (início e fim em ms, texto) de um resultado de transcrição;
+    sem segmentos, o texto vira um único trecho sem tempo.
+    """
+    segments = result.get("segments") or []
+    if segments:
+        return [(_to_ms(s.get("start")), _to_ms(s.get("end")), s["text"].strip()) for s in segments]
+    text = result.get("corrected_text") or result.get("text") or ""
+    return [(None, None, text.strip())] if text.strip() else []
+
+
+def load_transcript(path: Union[str, Path]) -> List[Tuple[Optional[int], Optional[int], str]]:
+    """
+    Lê os segmentos (início e fim em ms, texto) de uma saída de transcrição:
+    o .json com segmentos ou, na falta dele, o .txt como um único trecho sem tempo.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            return transcript_segments(json.load(f))
+    text = path.read_text(encoding="utf-8").strip()
+    return [(None, None, text)] if text else []
+
+
+def find_transcripts(directory: Union[str, Path]) -> List[Path]:
+    """
+    Saídas de transcrição do diretório (recursivo): o .json de cada
+    transcrição, ou o .txt quando não há .json ao lado.
+    """
+    found = {}
+    for path in sorted(Path(directory).rglob(f"*{TRANSCRIPT_SUFFIX}.*")):
+        if path.suffix not in (".json", ".txt") or not path.is_file():
+            continue
+        base = path.with_suffix("")
+        if path.suffix == ".json" or base not in found:
+            found[base] = path
+    return sorted(found.values())
+
+
+class SearchIndex:
+    # Arquivos indexados por transação em update()
+    UPDATE_BATCH_SIZE = 200
+
+    def __init__(self, path: Union[str, Path] = "output/.search_index.db", max_segments_per_file: int = 50):
+        """
+        Índice invertido em disco (SQLite) das transcrições: cada termo,
+        normalizado sem acentos, aponta para os segmentos em que aparece,
+        com início e fim em milissegundos. Arquivos são (re)indexados
+        individualmente, então o índice cresce a cada transcrição concluída
+        sem reprocessar o arquivo inteiro.
+
+        Args:
+            path: Arquivo do índice
+            max_segments_per_file (int): Segmentos devolvidos por arquivo em cada busca
+        """
+        self.path = Path(path)
+        self.max_segments_per_file = max_segments_per_file
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Uma conexão por operação: seguro entre threads, e o WAL deixa
+        # as buscas rodarem enquanto outro processo indexa
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        # Com WAL, synchronous=NORMAL continua consistente após uma queda
+        # e evita um fsync por arquivo indexado
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_file(self, path: Union[str, Path], force: bool = False) -> bool:
+        """
+        Indexa (ou reindexa) uma saída de transcrição. Arquivos cujo tamanho
+        e data de modificação não mudaram são ignorados.
+
+        Returns:
+            bool: True se o arquivo foi (re)indexado
+        """
+        with self._lock, self._connect() as conn:
+            return self._add(conn, Path(path), force)
+
+    def add_result(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Indexa (ou substitui) um resultado que não está em output/, como o de
+        um job do servidor; `key` aparece como "path" nas buscas.
+        """
+        with self._lock, self._connect() as conn:
+            self._insert(conn, key, 0, 0, transcript_segments(result))
+
+    def _add(self, conn: sqlite3.Connection, path: Path, force: bool) -> bool:
+        stat = path.stat()
+        key = path.as_posix()
+        row = conn.execute("SELECT id, size, mtime_ns FROM documents WHERE path = ?", (key,)).fetchone()
+        if row and not force and (row[1], row[2]) == (stat.st_size, stat.st_mtime_ns):
+            return False
+        self._insert(conn, key, stat.st_size, stat.st_mtime_ns, load_transcript(path))
+        return True
+
+    def _insert(self, conn: sqlite3.Connection, key: str, size: int, mtime_ns: int,
+                segments: List[Tuple[Optional[int], Optional[int], str]]) -> None:
+        """Substitui o documento `key` e seus segmentos e termos"""
+        row = conn.execute("SELECT id FROM documents WHERE path = ?", (key,)).fetchone()
+        if row:
+            self._delete(conn, row[0])
+        doc_id = conn.execute(
+            "INSERT INTO documents (path, size, mtime_ns) VALUES (?, ?, ?)",
+            (key, size, mtime_ns),
+        ).lastrowid
+        # Ids dos segmentos atribuídos aqui para inserir tudo com executemany
+        first_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM segments").fetchone()[0]
+        rows, postings = [], []
+        for position, (start_ms, end_ms, text) in enumerate(segments):
+            rows.append((first_id + position, doc_id, position, start_ms, end_ms, text))
+            postings.extend((term, first_id + position) for term in set(tokenize(text)))
+        conn.executemany(
+            "INSERT INTO segments (id, doc_id, position, start_ms, end_ms, text) VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+        # Inserção ordenada pela chave: menos páginas tocadas na árvore
+        postings.sort()
+        conn.executemany("INSERT OR IGNORE INTO postings (term, segment_id) VALUES (?, ?)", postings)
+        logger.debug("Indexado {} ({} segmentos)", key, len(segments))
+
+    def remove_file(self, path: Union[str, Path]) -> bool:
+        """Remove um arquivo do índice; retorna False se ele não estava indexado"""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT id FROM documents WHERE path = ?", (Path(path).as_posix(),)).fetchone()
+            if row:
+                self._delete(conn, row[0])
+            return row is not None
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, doc_id: int) -> None:
+        conn.execute("DELETE FROM postings WHERE segment_id IN (SELECT id FROM segments WHERE doc_id = ?)", (doc_id,))
+        conn.execute("DELETE FROM segments WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def update(self, directory: Union[str, Path], rebuild: bool = False) -> Dict[str, int]:
+        """
+        Sincroniza o índice com um diretório de saídas: indexa arquivos novos
+        ou alterados e remove os que não existem mais.
+
+        Args:
+            directory: Diretório das transcrições (ex.: output/)
+            rebuild (bool): Descarta o índice atual e indexa tudo de novo
+        """
+        if rebuild:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM postings")
+                conn.execute("DELETE FROM segments")
+                conn.execute("DELETE FROM documents")
+        transcripts = find_transcripts(directory)
+        indexed = failed = 0
+        # Uma transação por lote de arquivos, em vez de uma por arquivo
+        for batch_start in range(0, len(transcripts), self.UPDATE_BATCH_SIZE):
+            with self._lock, self._connect() as conn:
+                conn.execute("BEGIN")
+                for path in transcripts[batch_start:batch_start + self.UPDATE_BATCH_SIZE]:
+                    conn.execute("SAVEPOINT arquivo")
+                    try:
+                        indexed += self._add(conn, path, force=False)
+                    except Exception as e:
+                        # Desfaz só este arquivo; o restante do lote segue
+                        conn.execute("ROLLBACK TO arquivo")
+                        failed += 1
+                        logger.error(f"Erro ao indexar {path}: {e}")
+                    conn.execute("RELEASE arquivo")
+
+        current = {path.as_posix() for path in transcripts}
+        prefix = Path(directory).as_posix().rstrip("/") + "/"
+        with self._connect() as conn:
+            stale = [p for (p,) in conn.execute("SELECT path FROM documents") if p.startswith(prefix) and p not in current]
+        for path in stale:
+            self.remove_file(path)
+        logger.info(f"Índice de busca: {indexed} indexados, {len(stale)} removidos, {failed} falhas")
+        return {"files": len(transcripts), "indexed": indexed, "removed": len(stale), "failed": failed}
+
+    def search(self, query: str, limit: int = 20, phrase: bool = False) -> Dict[str, Any]:
+        """
+        Busca segmentos que contêm todos os termos da consulta (sem
+        diferenciar acentos e maiúsculas).
+
+        Args:
+            query (str): Termos da busca
+            limit (int): Máximo de arquivos retornados
+            phrase (bool): Exige os termos em sequência, como na consulta
+
+        Returns:
+            Dict com os arquivos encontrados e, para cada um, os segmentos
+            (posição, start_ms, end_ms, texto)
+
+        Raises:
+            ValueError: Se a consulta não tiver nenhum termo
+        """
+        terms = tokenize(query)
+        if not terms:
+            raise ValueError("A consulta não contém termos pesquisáveis")
+        unique = list(dict.fromkeys(terms))
+        matching = " INTERSECT ".join("SELECT segment_id FROM postings WHERE term = ?" for _ in unique)
+        sql = (
+            "SELECT d.path, s.position, s.start_ms, s.end_ms, s.text "
+            f"FROM segments s JOIN documents d ON d.id = s.doc_id WHERE s.id IN ({matching}) "
+            "ORDER BY d.path, s.position"
+        )
+        with self._connect() as conn:
+            rows = conn.execute(sql, unique).fetchall()
+
+        files: Dict[str, Dict[str, Any]] = {}
+        total_segments = 0
+        for path, position, start_ms, end_ms, text in rows:
+            if phrase and not _contains_phrase(tokenize(text), terms):
+                continue
+            total_segments += 1
+            entry = files.get(path)
+            if entry is None:
+                if len(files) >= limit:
+                    continue
+                entry = files[path] = {"path": path, "matches": 0, "segments": []}
+            entry["matches"] += 1
+            if len(entry["segments"]) < self.max_segments_per_file:
+                entry["segments"].append({"position": position, "start_ms": start_ms, "end_ms": end_ms, "text": text})
+
+        return {
+            "query": query,
+            "terms": unique,
+            "total_segments": total_segments,
+            "files": list(files.values()),
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            documents, = conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+            segments, = conn.execute("SELECT COUNT(*) FROM segments").fetchone()
+            terms, = conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()
+        return {"documents": documents, "segments": segments, "terms": terms}
+
+
+def _contains_phrase(tokens: List[str], terms: List[str]) -> bool:
+    size = len(terms)
+    return any(tokens[i:i + size] == terms for i in range(len(tokens) - size + 1))
+
+
+_default_index: Optional[SearchIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """Retorna o índice compartilhado (SEARCH_INDEX_PATH), ou None se desabilitado por SEARCH_INDEX_ENABLED"""
+    global _default_index
+    settings = get_settings()
+    if not settings.search_index_enabled:
+        return None
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SearchIndex(settings.search_index_path)
+        return _default_index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Indexa as transcrições de um diretório para a busca")
+    parser.add_argument("directory", nargs="?", default="output", help="Diretório das transcrições")
+    parser.add_argument("--index", default=get_settings().search_index_path,
+                        help="Arquivo do índice")
+    parser.add_argument("--rebuild", action="store_true", help="Recria o índice do zero")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    summary = SearchIndex(args.index).update(args.directory, rebuild=args.rebuild)
+    print(
+        f"Arquivos: {summary['files']} | Indexados: {summary['indexed']} | "
+        f"Removidos: {summary['removed']} | Falhas: {summary['failed']}"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
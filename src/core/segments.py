@@ -0,0 +1,139 @@
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+
+def estimate_confidence(segments: Optional[Iterable[Dict[str, Any]]]) -> Optional[float]:
+    """
+    Confiança média da transcrição: exp da média de avg_logprob dos
+    segmentos, ponderada pela duração. None se o modelo não informou
+    avg_logprob (o Whisper não devolve uma confiança pronta).
+    """
+    total = weight = 0.0
+    for segment in segments or ():
+        logprob = segment.get("avg_logprob")
+        if logprob is None:
+            continue
+        duration = max(segment.get("end", 0.0) - segment.get("start", 0.0), 1e-3)
+        total += logprob * duration
+        weight += duration
+    if not weight:
+        return None
+    return round(math.exp(total / weight), 4)
+
+
+class _TextColumn:
+    """Textos concatenados em uma única string, com os deslocamentos de cada item"""
+
+    __slots__ = ("_text", "_offsets")
+
+    def __init__(self, texts: List[str]):
+        self._text = "".join(texts)
+        self._offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in texts], out=self._offsets[1:])
+
+    def __getitem__(self, index: int) -> str:
+        return self._text[self._offsets[index]:self._offsets[index + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._text.encode("utf-8")) + self._offsets.nbytes
+
+
+class SegmentArray:
+    def __init__(self, segments: Iterable[Dict[str, Any]] = ()):
+        """
+        Segmentos (e timestamps por palavra, se presentes) guardados em
+        colunas numpy, em vez de uma lista de dicts: ocupa uma fração da
+        memória em transcrições de várias horas retidas pelos jobs. Os
+        segmentos voltam a ser dicts apenas ao iterar.
+
+        Args:
+            segments: Segmentos do Whisper (start, end, text, avg_logprob,
+                no_speech_prob e, com word_timestamps, words)
+        """
+        starts, ends, logprobs, no_speech, texts = [], [], [], [], []
+        word_counts: List[int] = []
+        word_starts, word_ends, word_probs, word_texts = [], [], [], []
+        for segment in segments:
+            starts.append(segment["start"])
+            ends.append(segment["end"])
+            logprobs.append(segment.get("avg_logprob", math.nan))
+            no_speech.append(segment.get("no_speech_prob", math.nan))
+            texts.append(segment["text"])
+            words = segment.get("words") or ()
+            word_counts.append(len(words))
+            for word in words:
+                word_starts.append(word["start"])
+                word_ends.append(word["end"])
+                word_probs.append(word.get("probability", math.nan))
+                word_texts.append(word["word"])
+
+        self.start = np.array(starts, dtype=np.float64)
+        self.end = np.array(ends, dtype=np.float64)
+        self.avg_logprob = np.array(logprobs, dtype=np.float32)
+        self.no_speech_prob = np.array(no_speech, dtype=np.float32)
+        self._texts = _TextColumn(texts)
+        self._word_index = np.zeros(len(starts) + 1, dtype=np.int64)
+        np.cumsum(word_counts, out=self._word_index[1:])
+        self.word_start = np.array(word_starts, dtype=np.float64)
+        self.word_end = np.array(word_ends, dtype=np.float64)
+        self.word_probability = np.array(word_probs, dtype=np.float32)
+        self._word_texts = _TextColumn(word_texts)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        segment: Dict[str, Any] = {
+            "id": index,
+            "start": float(self.start[index]),
+            "end": float(self.end[index]),
+            "text": self._texts[index],
+        }
+        for key, column in (("avg_logprob", self.avg_logprob), ("no_speech_prob", self.no_speech_prob)):
+            if not math.isnan(column[index]):
+                segment[key] = round(float(column[index]), 4)
+        words = self.words(index)
+        if words:
+            segment["words"] = words
+        return segment
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def words(self, index: int) -> List[Dict[str, Any]]:
+        """Palavras do segmento, com início, fim e probabilidade"""
+        words = []
+        for w in range(self._word_index[index], self._word_index[index + 1]):
+            word = {
+                "word": self._word_texts[w],
+                "start": float(self.word_start[w]),
+                "end": float(self.word_end[w]),
+            }
+            if not math.isnan(self.word_probability[w]):
+                word["probability"] = round(float(self.word_probability[w]), 4)
+            words.append(word)
+        return words
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    @property
+    def has_words(self) -> bool:
+        return len(self.word_start) > 0
+
+    @property
+    def duration(self) -> float:
+        return float(self.end.max()) if len(self) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.start, self.end, self.avg_logprob, self.no_speech_prob, self._word_index,
+                  self.word_start, self.word_end, self.word_probability)
+        return sum(a.nbytes for a in arrays) + self._texts.nbytes + self._word_texts.nbytes
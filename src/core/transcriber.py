@@ -1,79 +1,410 @@
-import whisper
-import torch
+import os
+import tempfile
+import numpy as np
 from pathlib import Path
 from loguru import logger
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+from ..config import get_settings
 from ..utils.text_processor import TextProcessor
+from .model_pool import ModelPool, get_model_pool
+from .audio import SAMPLE_RATE, DecodedAudio, decode_audio, open_audio
+from .long_audio import LongAudioPool, iter_stitched_segments, plan_windows, transcribe_long_audio
+from .result_cache import ResultCache, get_result_cache
+from .metrics import StageTimer
+from .segments import estimate_confidence
+from .vad import VoiceActivityDetector, vad_enabled_from_env
+from .backends import InferenceBackend, get_inference_backend
 
 class AudioTranscriber:
-    def __init__(self, model_name: str = "base"):
+    def __init__(self, model_name: str = "base", model_pool: Optional[ModelPool] = None,
+                 result_cache: Optional[ResultCache] = None, inference_pool=None, batcher=None,
+                 vad: Union[bool, VoiceActivityDetector, None] = None,
+                 backend: Optional[InferenceBackend] = None, long_audio_pool: Optional[LongAudioPool] = None):
         """
         Initialize the AudioTranscriber with specified model.
         
         Args:
             model_name (str): Whisper model name ('tiny', 'base', 'small', 'medium', 'large')
+            model_pool (ModelPool): Shared model registry (defaults to the process-wide pool, or to a pool
+                for `backend` bounded by MODEL_POOL_MAX_MEMORY_MB)
+            result_cache (ResultCache): Result cache (defaults to the shared cache, if enabled; False disables it)
+            inference_pool (InferencePool): Forked workers sharing the parent's weights (None = in-process inference)
+            batcher (MicroBatcher): Groups concurrent short clips into a single inference pass
+            vad (VoiceActivityDetector): Skips silence before inference (None = VAD_ENABLED, True = default detector)
+            backend (InferenceBackend): Loads models and sets backend-specific params (None = INFERENCE_BACKEND)
+            long_audio_pool (LongAudioPool): Persistent window workers for transcribe_long (None = one pool per call,
+                unless inference_pool is set, whose workers then take the windows)
         """
-        self.model = None
         self.model_name = model_name
+        self.backend = backend or get_inference_backend()
+        if model_pool is None and backend is not None:
+            # Pool próprio para o backend pedido, com o mesmo orçamento de memória do compartilhado
+            model_pool = ModelPool(
+                max_memory_mb=get_settings().model_pool_max_memory_mb,
+                model_factory=backend.load_model,
+            )
+        self.model_pool = model_pool or get_model_pool()
+        # result_cache=False desabilita o cache explicitamente
+        self.result_cache = get_result_cache() if result_cache is None else (result_cache or None)
+        self.inference_pool = inference_pool
+        self.batcher = batcher
+        self.long_audio_pool = long_audio_pool
+        if vad is None:
+            vad = vad_enabled_from_env()
+        self.vad: Optional[VoiceActivityDetector] = VoiceActivityDetector() if vad is True else (vad or None)
         self.text_processor = TextProcessor()
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        self.load_model()
+        self._device: Optional[str] = None
 
-    def load_model(self):
-        """Carrega o modelo Whisper"""
+    @property
+    def device(self) -> str:
+        """Dispositivo de inferência; o torch só é importado na primeira consulta"""
+        if self._device is None:
+            import torch
+
+            self._device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        return self._device
+
+    @property
+    def model(self):
+        """Modelo padrão, carregado sob demanda pelo pool"""
+        return self.load_model()
+
+    def load_model(self, model_name: Optional[str] = None):
+        """Carrega (ou reaproveita do pool) o modelo Whisper"""
+        model_name = model_name or self.model_name
         try:
-            self.model = whisper.load_model(self.model_name)
-            logger.info(f"Modelo {self.model_name} carregado com sucesso no dispositivo {self.device}")
+            return self.model_pool.get(model_name)
         except Exception as e:
             logger.error(f"Erro ao carregar modelo: {e}")
             raise
 
-    def transcribe(self, audio_path: str, **kwargs) -> Dict[str, Any]:
+    def transcribe(self, audio_path: Union[str, DecodedAudio], model_name: Optional[str] = None,
+                   timer: Optional[StageTimer] = None, **kwargs) -> Dict[str, Any]:
         """
         Transcreve o áudio e aplica correções personalizadas.
         
         Args:
-            audio_path (str): Path to audio file
+            audio_path (str): Path to audio file, or a DecodedAudio already decoded by the pipeline
+            model_name (str): Modelo a usar nesta chamada (padrão: self.model_name)
+            timer (StageTimer): Cronômetro da requisição (etapas vad, model_load, inference, correction)
+            vad (bool): Pula o silêncio antes da inferência (padrão: configuração do transcritor)
             
         Returns:
-            Dict containing transcription results
+            Dict containing transcription results ("vad" traz o áudio pulado, se o filtro estiver ativo)
         """
         try:
-            # Configurações padrão
-            default_params = {
-                "language": "pt",
-                "task": "transcribe",
-                "fp16": self.device == "cuda"
-            }
-
-            # Mescla com os parâmetros fornecidos
-            params = {**default_params, **kwargs}
-            
-            # Realiza a transcrição
-            result = self.model.transcribe(audio_path, **params)
-            
-            # Aplica correções ao texto transcrito
-            original_text = result["text"]
-            corrected_text = self.text_processor.apply_corrections(original_text)
-            
-            # Adiciona sugestões de correções
-            suggestions = self.text_processor.suggest_corrections(corrected_text)
+            timer = timer or StageTimer()
+            model_name = model_name or self.model_name
+            detector = self._vad_detector(kwargs.pop("vad", None))
+            params = self._build_params(kwargs)
+            cache_params = {**params, "vad": True} if detector else params
+
+            cache_key, result = self._cache_lookup(audio_path, model_name, cache_params)
+            cached = result is not None
+            if not cached:
+                if detector is not None:
+                    result = self._transcribe_speech(detector, audio_path, model_name, params, timer)
+                else:
+                    result = self._infer(audio_path, model_name, params, timer)
+                self._cache_store(cache_key, result)
             
-            return {
-                "original_text": original_text,
-                "corrected_text": corrected_text,
-                "suggestions": suggestions,
-                "language": result.get("language", ""),
-                "confidence": result.get("confidence", 0)
-            }
+            with timer.stage("correction"):
+                output = self._build_result(result, cached=cached)
+            output["segments"] = result.get("segments", [])
+            if result.get("vad") is not None:
+                output["vad"] = result["vad"]
+            return output
         except Exception as e:
             logger.error(f"Erro na transcrição: {e}")
             raise
 
+    def _infer(self, audio: Union[str, DecodedAudio, np.ndarray], model_name: str, params: Dict[str, Any],
+               timer: StageTimer) -> Dict[str, Any]:
+        """Executa o modelo no pool multiprocesso, no micro-batcher ou no próprio processo"""
+        if self.inference_pool is not None:
+            # Modelo já carregado no processo pai e herdado pelos workers
+            with timer.stage("inference"):
+                return self.inference_pool.transcribe(model_name, self._pool_input(audio), **params)
+        if self._batchable(audio, params):
+            # Clipes curtos concorrentes dividem a mesma passada do modelo
+            with timer.stage("inference"):
+                return self.batcher.transcribe(model_name, self._model_input(audio), **params)
+        with timer.stage("model_load"):
+            model = self.load_model(model_name)
+
+        # Realiza a transcrição (áudio pré-decodificado vai direto ao modelo)
+        with timer.stage("inference"):
+            return model.transcribe(self._model_input(audio), **params)
+
+    def _transcribe_speech(self, detector: VoiceActivityDetector, audio: Union[str, DecodedAudio, np.ndarray],
+                           model_name: str, params: Dict[str, Any], timer: StageTimer) -> Dict[str, Any]:
+        """Transcreve apenas os trechos de fala e devolve os timestamps na linha do tempo original"""
+        with timer.stage("vad"):
+            if isinstance(audio, (str, Path)):
+                with decode_audio(audio) as decoded:
+                    samples = np.array(decoded.samples)
+            else:
+                samples = np.asarray(audio.samples if isinstance(audio, DecodedAudio) else audio)
+            spans = detector.detect(samples)
+            compacted, offsets = detector.compact(samples, spans)
+            summary = detector.summary(len(samples), spans)
+
+        if not spans:
+            # Só silêncio: nada a transcrever (e nada para o modelo alucinar)
+            return {"text": "", "segments": [], "language": params.get("language") or "", "vad": summary}
+        result = dict(self._infer(compacted, model_name, params, timer))
+        result["segments"] = detector.remap_segments(result.get("segments", []), spans, offsets)
+        result["vad"] = summary
+        return result
+
+    def _vad_detector(self, enabled: Optional[bool]) -> Optional[VoiceActivityDetector]:
+        """Detector a usar nesta chamada (None = padrão do transcritor)"""
+        if enabled is None:
+            return self.vad
+        return (self.vad or VoiceActivityDetector()) if enabled else None
+
+    def transcribe_long(self, audio_path: Union[str, DecodedAudio], model_name: Optional[str] = None, workers: Optional[int] = None,
+                        window_seconds: float = 300.0, overlap_seconds: float = 5.0,
+                        timer: Optional[StageTimer] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Transcreve áudios longos em janelas sobrepostas processadas em paralelo.
+        
+        Args:
+            audio_path (str): Path to audio file, or a DecodedAudio
+            model_name (str): Modelo a usar nesta chamada (padrão: self.model_name)
+            workers (int): Número de processos (só sem pool persistente)
+            window_seconds (float): Duração máxima de cada janela
+            overlap_seconds (float): Sobreposição entre janelas
+            timer (StageTimer): Cronômetro da requisição (o carregamento nos workers conta como inference)
+            
+        Returns:
+            Dict containing transcription results and stitched segments
+        """
+        try:
+            timer = timer or StageTimer()
+            model_name = model_name or self.model_name
+            params = self._build_params(kwargs)
+            cache_params = {**params, "window_seconds": window_seconds, "overlap_seconds": overlap_seconds}
+
+            cache_key, result = self._cache_lookup(audio_path, model_name, cache_params)
+            cached = result is not None
+            if not cached:
+                with timer.stage("inference"):
+                    result = transcribe_long_audio(
+                        audio_path,
+                        model_name=model_name,
+                        model_factory=self.model_pool.model_factory,
+                        workers=workers,
+                        window_seconds=window_seconds,
+                        overlap_seconds=overlap_seconds,
+                        pool=self.inference_pool or self.long_audio_pool,
+                        **params
+                    )
+                self._cache_store(cache_key, result)
+            with timer.stage("correction"):
+                output = self._build_result(result, cached=cached)
+            output["segments"] = result["segments"]
+            output["windows"] = result.get("windows")
+            return output
+        except Exception as e:
+            logger.error(f"Erro na transcrição longa: {e}")
+            raise
+
+    def transcribe_stream(self, audio_path: Union[str, DecodedAudio], model_name: Optional[str] = None, window_seconds: float = 30.0,
+                          overlap_seconds: float = 2.0, timer: Optional[StageTimer] = None,
+                          **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Transcreve o áudio em janelas sequenciais, gerando eventos à medida
+        que cada segmento fica pronto.
+        
+        Eventos gerados (campo "event"): "start" (duração e nº de janelas),
+        "segment" (timestamps, texto original e corrigido), "progress"
+        (percentual do áudio processado) e "done" (resultado completo).
+        
+        Args:
+            audio_path (str): Path to audio file, DecodedAudio ou amostras float32 16 kHz
+            model_name (str): Modelo a usar nesta chamada (padrão: self.model_name)
+            window_seconds (float): Duração de cada janela
+            overlap_seconds (float): Sobreposição entre janelas
+            timer (StageTimer): Cronômetro da requisição (etapas acumuladas por janela)
+        """
+        timer = timer or StageTimer()
+        model_name = model_name or self.model_name
+        params = self._build_params(kwargs)
+        cache_params = {**params, "stream": True, "window_seconds": window_seconds, "overlap_seconds": overlap_seconds}
+        cache_key, cached = self._cache_lookup(audio_path, model_name, cache_params)
+
+        if cached is not None:
+            yield {"event": "start", "duration": cached.get("duration"), "windows": cached.get("windows"), "cached": True}
+            for segment in cached["segments"]:
+                yield self._segment_event(segment)
+            yield {"event": "progress", "progress": 100.0, "processed_seconds": cached.get("duration")}
+            yield {"event": "done", "result": self._stream_result(cached, cached=True)}
+            return
+
+        with tempfile.TemporaryDirectory(prefix="stream_") as temp_dir:
+            audio = open_audio(audio_path, os.path.join(temp_dir, "audio.f32"))
+            duration = len(audio) / SAMPLE_RATE
+            windows = plan_windows(audio, window_seconds, overlap_seconds, min(5.0, window_seconds / 4))
+            yield {"event": "start", "duration": round(duration, 3), "windows": len(windows), "cached": False}
+
+            with timer.stage("model_load"):
+                model = self.load_model(model_name)
+            segments: List[Dict[str, Any]] = []
+            language = ""
+
+            def window_results():
+                nonlocal language
+                for start, end in windows:
+                    window_params = dict(params)
+                    if segments and "initial_prompt" not in kwargs:
+                        # Mantém o contexto entre janelas, como condition_on_previous_text
+                        window_params["initial_prompt"] = " ".join(s["text"] for s in segments[-3:])
+                    with timer.stage("inference"):
+                        result = model.transcribe(np.array(audio[start:end]), **window_params)
+                    language = language or result.get("language", "")
+                    yield result
+
+            for segment in iter_stitched_segments(windows, window_results()):
+                segments.append(segment)
+                with timer.stage("correction"):
+                    event = self._segment_event(segment)
+                yield event
+                # Progresso real: até onde o áudio já foi transcrito (fim do segmento),
+                # não o fim da janela, que chega antes do primeiro segmento dela
+                processed = min(segment["end"], duration)
+                yield {
+                    "event": "progress",
+                    "progress": round(min(100.0, 100 * processed / duration), 1) if duration else 100.0,
+                    "processed_seconds": round(processed, 3),
+                }
+
+        result = {
+            "text": " ".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": language,
+            "duration": round(duration, 3),
+            "windows": len(windows),
+        }
+        self._cache_store(cache_key, result)
+        yield {"event": "progress", "progress": 100.0, "processed_seconds": round(duration, 3)}
+        with timer.stage("correction"):
+            final = self._stream_result(result)
+        yield {"event": "done", "result": final}
+
+    def _segment_event(self, segment: Dict[str, Any]) -> Dict[str, Any]:
+        """Evento de streaming de um segmento, com o texto já corrigido"""
+        return {
+            "event": "segment",
+            "id": segment["id"],
+            "start": segment["start"],
+            "end": segment["end"],
+            "text": segment["text"],
+            "corrected_text": self.text_processor.apply_corrections(segment["text"]),
+        }
+
+    def corrected_segments(self, segments: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Segmentos com o texto corrigido pelo dicionário (o original fica em
+        "original_text"), gerados um a um para as exportações de legendas.
+        """
+        for segment in segments:
+            yield {**segment, "text": self.text_processor.apply_corrections(segment["text"]),
+                   "original_text": segment["text"]}
+
+    def _stream_result(self, result: Dict[str, Any], cached: bool = False) -> Dict[str, Any]:
+        output = self._build_result(result, cached=cached)
+        output["duration"] = result.get("duration")
+        return output
+
+    def _build_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Mescla os parâmetros fornecidos com as configurações padrão"""
+        default_params = {
+            "language": "pt",
+            "task": "transcribe",
+            **self.backend.default_params(self.device)
+        }
+        return {**default_params, **kwargs}
+
+    @staticmethod
+    def _model_input(audio: Union[str, DecodedAudio, np.ndarray]):
+        """Caminho do arquivo ou amostras float32 prontas para o modelo"""
+        if isinstance(audio, DecodedAudio):
+            return np.array(audio.samples)
+        return audio
+
+    def _batchable(self, audio: Union[str, DecodedAudio, np.ndarray], params: Dict[str, Any]) -> bool:
+        """Só áudio já decodificado, curto e com opções padrão de decodificação vai para o micro-batcher"""
+        if self.batcher is None or not self.batcher.supports(params):
+            return False
+        samples = audio.samples if isinstance(audio, DecodedAudio) else audio
+        return isinstance(samples, np.ndarray) and self.batcher.accepts(samples)
+
+    @staticmethod
+    def _pool_input(audio: Union[str, DecodedAudio, np.ndarray]):
+        """Entrada para o pool multiprocesso: buffers mapeados seguem pelo caminho"""
+        if isinstance(audio, DecodedAudio):
+            return audio.samples
+        return str(audio) if isinstance(audio, Path) else audio
+
+    def _cache_lookup(self, audio_path: Union[str, DecodedAudio, np.ndarray], model_name: str, params: Dict[str, Any]):
+        """Retorna (chave, resultado bruto em cache ou None)"""
+        if isinstance(audio_path, DecodedAudio):
+            audio_path = audio_path.source_path
+        if self.result_cache is None or not isinstance(audio_path, (str, Path)):
+            return None, None
+        key = self.result_cache.make_key(audio_path, model_name, params, self.backend.cache_identity())
+        return key, self.result_cache.get(key)
+
+    def _cache_store(self, key: Optional[str], result: Dict[str, Any]) -> None:
+        """Guarda o resultado bruto (sem correções) no cache"""
+        if self.result_cache is None or key is None:
+            return
+        self.result_cache.set(key, {
+            "text": result["text"],
+            "segments": result.get("segments", []),
+            "language": result.get("language", ""),
+            "windows": result.get("windows"),
+            "duration": result.get("duration"),
+            "vad": result.get("vad"),
+        })
+
+    def _build_result(self, result: Dict[str, Any], cached: bool = False) -> Dict[str, Any]:
+        """
+        Aplica correções e sugestões ao resultado bruto do modelo.
+        As correções são sempre reaplicadas, inclusive em acertos de cache.
+        """
+        # Aplica correções e gera sugestões na mesma passagem pelos tokens
+        original_text = result["text"]
+        corrected_text, suggestions = self.text_processor.correct_and_suggest(
+            original_text, result.get("segments")
+        )
+        
+        return {
+            "original_text": original_text,
+            "corrected_text": corrected_text,
+            "suggestions": suggestions,
+            "language": result.get("language", ""),
+            "confidence": estimate_confidence(result.get("segments")),
+            "cached": cached
+        }
+
     def add_correction(self, wrong: str, correct: str):
         """Adiciona uma nova correção ao dicionário"""
         self.text_processor.add_correction(wrong, correct)
 
+    def remove_correction(self, wrong: str):
+        """Remove uma correção do dicionário"""
+        self.text_processor.remove_correction(wrong)
+
+    def import_corrections(self, corrections: Dict[str, str], replace: bool = False) -> int:
+        """Importa correções em lote"""
+        return self.text_processor.import_corrections(corrections, replace=replace)
+
+    def export_corrections(self) -> Dict[str, str]:
+        """Exporta o dicionário de correções"""
+        return self.text_processor.export_corrections()
+
     def get_correction_stats(self):
         """Retorna estatísticas sobre as correções"""
         return self.text_processor.get_statistics()
@@ -84,9 +415,17 @@ class AudioTranscriber:
 
     def get_system_info(self) -> Dict[str, Any]:
         """Retorna informações do sistema"""
+        import torch
+
         return {
             "device": self.device,
             "model": self.model_name,
+            "backend": self.backend.get_info(),
+            "model_pool": self.model_pool.get_stats(),
+            "result_cache": self.result_cache.get_stats() if self.result_cache else None,
+            "inference_pool": self.inference_pool.get_stats() if self.inference_pool else None,
+            "micro_batcher": self.batcher.get_stats() if self.batcher else None,
+            "long_audio_pool": self.long_audio_pool.get_stats() if self.long_audio_pool else None,
             "cuda_available": torch.cuda.is_available(),
             "cuda_device_count": torch.cuda.device_count() if torch.cuda.is_available() else 0,
             "cuda_device_name": torch.cuda.get_device_name(0) if torch.cuda.is_available() else None
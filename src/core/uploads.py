@@ -0,0 +1,245 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from loguru import logger
+
+from ..config import get_settings
+from ..utils.helpers import get_temp_path
+
+DATA_FILE = "data.bin"
+SESSION_FILE = "session.json"
+
+
+class UploadError(ValueError):
+    """Requisição inválida no protocolo de upload em partes"""
+
+
+class UploadNotFoundError(KeyError):
+    """Upload inexistente, expirado ou já concluído"""
+
+
+class ChecksumMismatchError(UploadError):
+    """O conteúdo recebido não confere com o SHA-256 informado"""
+
+
+class IncompleteUploadError(UploadError):
+    """Ainda faltam partes para concluir o upload"""
+
+
+class ChunkedUploadStore:
+    def __init__(self, directory: Union[str, Path] = "temp/uploads", max_size: Optional[int] = None,
+                 default_part_size: int = 8 * 1024 * 1024, max_part_size: int = 64 * 1024 * 1024,
+                 ttl_seconds: float = 24 * 3600):
+        """
+        Uploads retomáveis em partes (init / parte / complete). Cada upload
+        tem um diretório com o estado em JSON e um único arquivo de dados já
+        com o tamanho final: cada parte é gravada diretamente no seu
+        deslocamento, então reenviar uma parte apenas a sobrescreve e a
+        conclusão só move o arquivo, sem recopiá-lo.
+
+        Args:
+            directory: Diretório das sessões de upload
+            max_size (int): Tamanho máximo do arquivo final em bytes (None = sem limite)
+            default_part_size (int): Tamanho de parte quando o cliente não informa
+            max_part_size (int): Maior parte aceita (limita a memória por requisição)
+            ttl_seconds (float): Sessões sem atividade por mais tempo são descartadas
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.default_part_size = default_part_size
+        self.max_part_size = max_part_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def init(self, filename: str, size: int, part_size: Optional[int] = None,
+             sha256: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Cria a sessão e reserva o arquivo de dados.
+
+        Args:
+            filename (str): Nome original do arquivo
+            size (int): Tamanho total em bytes
+            part_size (int): Tamanho de cada parte (a última pode ser menor)
+            sha256 (str): Checksum do arquivo inteiro, verificado na conclusão
+            metadata (Dict): Dados devolvidos na conclusão (ex.: modelo)
+        """
+        part_size = part_size or self.default_part_size
+        if size <= 0:
+            raise UploadError("O tamanho do arquivo deve ser positivo")
+        if self.max_size is not None and size > self.max_size:
+            raise UploadError(f"Arquivo muito grande. Tamanho máximo permitido: {self.max_size / 1024 / 1024:.0f}MB")
+        if not 0 < part_size <= self.max_part_size:
+            raise UploadError(f"Tamanho de parte inválido (máximo {self.max_part_size} bytes)")
+        self.cleanup_expired()
+
+        upload_id = uuid.uuid4().hex
+        session_dir = self.directory / upload_id
+        session_dir.mkdir(parents=True)
+        # Arquivo esparso com o tamanho final; as partes preenchem os buracos
+        with open(session_dir / DATA_FILE, "wb") as f:
+            f.truncate(size)
+        session = {
+            "upload_id": upload_id,
+            "filename": Path(filename).name,
+            "size": size,
+            "part_size": part_size,
+            "total_parts": math.ceil(size / part_size),
+            "sha256": sha256.lower() if sha256 else None,
+            "metadata": metadata or {},
+            "parts": {},
+            "created_at": time.time(),
+            "updated_at": time.time(),
+        }
+        self._save(session)
+        logger.info(f"Upload {upload_id} iniciado: {filename} ({size} bytes, {session['total_parts']} partes)")
+        return self._status(session)
+
+    def write_part(self, upload_id: str, index: int, data: bytes, sha256: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Grava a parte `index` (base 0) no seu deslocamento. Pode ser repetida
+        quantas vezes for preciso (ex.: após uma falha de rede).
+
+        Raises:
+            ChecksumMismatchError: Se `sha256` não conferir com os dados
+        """
+        session = self._load(upload_id)
+        if not 0 <= index < session["total_parts"]:
+            raise UploadError(f"Parte {index} fora do intervalo 0..{session['total_parts'] - 1}")
+        offset = index * session["part_size"]
+        expected = min(session["part_size"], session["size"] - offset)
+        if len(data) != expected:
+            raise UploadError(f"A parte {index} deve ter {expected} bytes (recebidos {len(data)})")
+        digest = hashlib.sha256(data).hexdigest()
+        if sha256 and sha256.lower() != digest:
+            raise ChecksumMismatchError(f"Checksum da parte {index} não confere")
+
+        fd = os.open(self.directory / upload_id / DATA_FILE, os.O_WRONLY)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view, offset = view[written:], offset + written
+        finally:
+            os.close(fd)
+
+        with self._lock:
+            session = self._load(upload_id)
+            session["parts"][str(index)] = digest
+            session["updated_at"] = time.time()
+            self._save(session)
+        return {"upload_id": upload_id, "index": index, "sha256": digest, "received_parts": len(session["parts"])}
+
+    def status(self, upload_id: str) -> Dict[str, Any]:
+        """Partes recebidas e faltantes, para o cliente retomar o envio"""
+        return self._status(self._load(upload_id))
+
+    def complete(self, upload_id: str, directory: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Verifica as partes (e o checksum total, se informado no init) e move o
+        arquivo montado para `directory`, onde segue para a transcrição.
+
+        Returns:
+            Dict com o caminho final ("path"), nome original e metadados
+        """
+        with self._lock:
+            session = self._load(upload_id)
+            missing = self._missing(session)
+            if missing:
+                raise IncompleteUploadError(f"Faltam {len(missing)} partes: {missing[:20]}")
+            data_path = self.directory / upload_id / DATA_FILE
+            if session["sha256"]:
+                digest = hashlib.sha256()
+                with open(data_path, "rb") as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(block)
+                if digest.hexdigest() != session["sha256"]:
+                    raise ChecksumMismatchError("Checksum do arquivo montado não confere")
+
+            target = get_temp_path(session["filename"], directory)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Mesmo sistema de arquivos: apenas renomeia
+            shutil.move(str(data_path), str(target))
+            shutil.rmtree(self.directory / upload_id, ignore_errors=True)
+        logger.info(f"Upload {upload_id} concluído: {target}")
+        return {"path": target, "filename": session["filename"], "size": session["size"], "metadata": session["metadata"]}
+
+    def abort(self, upload_id: str) -> None:
+        self._load(upload_id)
+        shutil.rmtree(self.directory / upload_id, ignore_errors=True)
+
+    def cleanup_expired(self) -> int:
+        """Remove sessões abandonadas; retorna quantas foram removidas"""
+        removed = 0
+        deadline = time.time() - self.ttl_seconds
+        for session_dir in self.directory.iterdir():
+            session_file = session_dir / SESSION_FILE
+            try:
+                if session_file.stat().st_mtime < deadline:
+                    shutil.rmtree(session_dir, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _status(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "upload_id": session["upload_id"],
+            "filename": session["filename"],
+            "size": session["size"],
+            "part_size": session["part_size"],
+            "total_parts": session["total_parts"],
+            "received_parts": len(session["parts"]),
+            "missing_parts": self._missing(session),
+        }
+
+    @staticmethod
+    def _missing(session: Dict[str, Any]) -> List[int]:
+        return [i for i in range(session["total_parts"]) if str(i) not in session["parts"]]
+
+    def _load(self, upload_id: str) -> Dict[str, Any]:
+        # O id vira nome de diretório: só aceita o formato gerado no init
+        if len(upload_id) != 32 or not all(c in "0123456789abcdef" for c in upload_id):
+            raise UploadNotFoundError(upload_id)
+        try:
+            with open(self.directory / upload_id / SESSION_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadNotFoundError(upload_id)
+
+    def _save(self, session: Dict[str, Any]) -> None:
+        """Grava o estado atomicamente (sobrevive a reinícios do servidor)"""
+        session_file = self.directory / session["upload_id"] / SESSION_FILE
+        temp_file = session_file.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        os.replace(temp_file, session_file)
+
+
+_default_store: Optional[ChunkedUploadStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_upload_store() -> ChunkedUploadStore:
+    """
+    Retorna o armazenamento de uploads em partes compartilhado
+    (UPLOAD_DIR, MAX_UPLOAD_SIZE_MB, UPLOAD_PART_SIZE_MB).
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            settings = get_settings()
+            _default_store = ChunkedUploadStore(
+                directory=settings.upload_dir,
+                max_size=settings.max_upload_size_mb * 1024 * 1024,
+                default_part_size=settings.upload_part_size_mb * 1024 * 1024,
+            )
+        return _default_store
@@ -0,0 +1,131 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ..config import get_settings
+from .audio import SAMPLE_RATE
+
+Span = Tuple[int, int]
+
+
+class VoiceActivityDetector:
+    def __init__(self, frame_ms: float = 30.0, threshold_db: float = 12.0, floor_db: float = -55.0,
+                 min_speech_ms: float = 250.0, min_silence_ms: float = 600.0, padding_ms: float = 200.0,
+                 gap_ms: float = 300.0, sample_rate: int = SAMPLE_RATE):
+        """
+        Detector de fala por energia (RMS por quadro, em dBFS). Um quadro é
+        fala quando supera o ruído de fundo estimado (percentil 10 da energia)
+        em `threshold_db` e o piso absoluto `floor_db`. Sem pausas de verdade
+        (fala contínua, música), o percentil 10 já é fala: se os quadros altos
+        não se destacam do "ruído" por `threshold_db`, ou se nenhum trecho
+        sobra, o clipe inteiro acima do piso é tratado como fala.
+
+        Args:
+            frame_ms (float): Duração de cada quadro de análise
+            threshold_db (float): Margem acima do ruído de fundo
+            floor_db (float): Energia mínima para considerar fala
+            min_speech_ms (float): Trechos de fala mais curtos são descartados
+            min_silence_ms (float): Pausas mais curtas não separam trechos
+            padding_ms (float): Margem mantida antes e depois de cada trecho
+            gap_ms (float): Silêncio inserido entre trechos no áudio compactado
+        """
+        self.sample_rate = sample_rate
+        self.frame = max(1, int(frame_ms * sample_rate / 1000))
+        self.threshold_db = threshold_db
+        self.floor_db = floor_db
+        self.min_speech = int(min_speech_ms * sample_rate / 1000)
+        self.min_silence = int(min_silence_ms * sample_rate / 1000)
+        self.padding = int(padding_ms * sample_rate / 1000)
+        self.gap = int(gap_ms * sample_rate / 1000)
+
+    def detect(self, audio: np.ndarray) -> List[Span]:
+        """Retorna os trechos de fala como (amostra_inicial, amostra_final)"""
+        num_frames = len(audio) // self.frame
+        if num_frames == 0:
+            return []
+        frames = np.asarray(audio[:num_frames * self.frame], dtype=np.float32).reshape(num_frames, self.frame)
+        energy_db = 10 * np.log10(np.square(frames).mean(axis=1) + 1e-10)
+        noise_db, loud_db = (float(v) for v in np.percentile(energy_db, [10, 90]))
+        whole = [(0, len(audio))] if float(energy_db.max()) > self.floor_db else []
+        if loud_db - noise_db < self.threshold_db:
+            return whole
+        threshold = max(self.floor_db, noise_db + self.threshold_db)
+        voiced = energy_db > threshold
+
+        # Bordas das sequências de quadros com fala
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+        spans: List[Span] = []
+        for start, end in zip(edges[::2] * self.frame, edges[1::2] * self.frame):
+            if spans and start - spans[-1][1] < self.min_silence:
+                spans[-1] = (spans[-1][0], int(end))
+            else:
+                spans.append((int(start), int(end)))
+
+        padded: List[Span] = []
+        for start, end in spans:
+            if end - start < self.min_speech:
+                continue
+            start, end = max(0, start - self.padding), min(len(audio), end + self.padding)
+            if padded and start <= padded[-1][1]:
+                padded[-1] = (padded[-1][0], end)
+            else:
+                padded.append((start, end))
+        return padded or whole
+
+    def compact(self, audio: np.ndarray, spans: List[Span]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Concatena os trechos de fala separados por um curto silêncio.
+        Retorna o áudio compactado e o início de cada trecho nele.
+        """
+        gap = np.zeros(self.gap, dtype=np.float32)
+        parts, offsets, position = [], [], 0
+        for index, (start, end) in enumerate(spans):
+            if index:
+                parts.append(gap)
+                position += self.gap
+            offsets.append(position)
+            parts.append(np.asarray(audio[start:end], dtype=np.float32))
+            position += end - start
+        compacted = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        return compacted, offsets
+
+    def to_original(self, seconds: float, spans: List[Span], offsets: List[int]) -> float:
+        """Converte um instante do áudio compactado para a linha do tempo original"""
+        sample = seconds * self.sample_rate
+        index = max(0, int(np.searchsorted(offsets, sample, side="right")) - 1)
+        start, end = spans[index]
+        # Instantes no silêncio inserido ficam presos ao fim do trecho anterior
+        return min(start + sample - offsets[index], end) / self.sample_rate
+
+    def remap_segments(self, segments: List[Dict[str, Any]], spans: List[Span],
+                       offsets: List[int]) -> List[Dict[str, Any]]:
+        """Ajusta os timestamps dos segmentos para o áudio original"""
+        remapped = []
+        for segment in segments:
+            segment = dict(segment)
+            segment["start"] = round(self.to_original(segment["start"], spans, offsets), 3)
+            segment["end"] = round(max(segment["start"], self.to_original(segment["end"], spans, offsets)), 3)
+            if segment.get("words"):
+                segment["words"] = [
+                    {**word,
+                     "start": round(self.to_original(word["start"], spans, offsets), 3),
+                     "end": round(self.to_original(word["end"], spans, offsets), 3)}
+                    for word in segment["words"]
+                ]
+            remapped.append(segment)
+        return remapped
+
+    def summary(self, total_samples: int, spans: List[Span]) -> Dict[str, Any]:
+        """Quanto do áudio foi mantido e quanto foi pulado"""
+        speech = sum(end - start for start, end in spans)
+        return {
+            "speech_seconds": round(speech / self.sample_rate, 3),
+            "skipped_seconds": round((total_samples - speech) / self.sample_rate, 3),
+            "skipped_ratio": round(1 - speech / total_samples, 3) if total_samples else 0.0,
+            "spans": [[round(s / self.sample_rate, 3), round(e / self.sample_rate, 3)] for s, e in spans],
+        }
+
+
+def vad_enabled_from_env() -> bool:
+    """VAD_ENABLED liga o filtro de silêncio por padrão nas transcrições"""
+    return get_settings().vad_enabled
@@ -0,0 +1,270 @@
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from pathlib import Path
+from typing import Optional
+import time
+
+from loguru import logger
+from pydantic import BaseModel
+
+from ..core.audio import DecodedAudio
+from ..core.jobs import QueueFullError
+from ..core.metrics import StageTimer
+from ..core.scheduler import Ticket
+from ..core.uploads import ChecksumMismatchError, IncompleteUploadError, UploadError, UploadNotFoundError
+from ..services import Services, get_services
+from .common import (
+    admit, decode_upload, discard_upload, index_job_result, save_upload, validate_upload, wait_for_slot
+)
+
+router = APIRouter(prefix="/api/v1")
+
+def run_transcription(services: Services, temp_file: Path, model_size: str, decoded: DecodedAudio,
+                      timer: Optional[StageTimer] = None, language: Optional[str] = None) -> dict:
+    """
+    Executa a transcrição (bloqueante) de um arquivo já decodificado com o
+    transcritor compartilhado e o remove ao final. Sem `language`, o idioma
+    é detectado pelo modelo, como a API sempre fez.
+    """
+    timer = timer or StageTimer()
+    try:
+        timer.record("decode", decoded.decode_seconds)
+        start = time.perf_counter()
+        result = services.transcriber.transcribe(decoded, model_name=model_size, timer=timer, language=language)
+        services.metrics.observe_realtime_factor(time.perf_counter() - start, decoded.duration)
+        logger.bind(
+            model=model_size,
+            audio_duration=round(decoded.duration, 3),
+            stages={name: round(seconds, 4) for name, seconds in timer.steps.items()},
+        ).info("Transcrição concluída")
+        return result
+    finally:
+        # Remover arquivo temporário
+        with timer.stage("cleanup"):
+            decoded.close()
+            temp_file.unlink(missing_ok=True)
+
+def run_transcription_job(services: Services, temp_file: Path, filename: str, model_size: str,
+                          decoded: DecodedAudio, ticket: Ticket, language: Optional[str] = None) -> dict:
+    """Versão da transcrição executada pelo gerenciador de jobs (libera a vaga e indexa o resultado para a busca)"""
+    succeeded = False
+    try:
+        result = run_transcription(services, temp_file, model_size, decoded, language=language)
+        succeeded = True
+    finally:
+        services.scheduler.release(ticket, succeeded)
+    index_job_result(services, result)
+    return {
+        "filename": filename,
+        "text": result["corrected_text"],
+        "language": result.get("language", "")
+    }
+
+@router.post("/transcribe")
+async def transcribe_audio(
+    request: Request,
+    file: UploadFile = File(...),
+    model_size: Optional[str] = "base",
+    language: Optional[str] = None,
+    services: Services = Depends(get_services)
+):
+    """
+    Endpoint para transcrição de áudio nos formatos de ALLOWED_EXTENSIONS.
+    A requisição aguarda uma vaga no agendador compartilhado com a aplicação web.
+    Sem `language`, o idioma é detectado automaticamente.
+    """
+    timer = StageTimer()
+
+    try:
+        validate_upload(services, file.filename, model_size)
+
+        # Salvar em arquivo temporário único, validando o tamanho durante o streaming
+        with timer.stage("upload"):
+            temp_file = await save_upload(services, file)
+        decoded = await decode_upload(services, temp_file)
+        ticket = admit(services, request, decoded, temp_file, model_size)
+
+        succeeded = False
+        try:
+            with timer.stage("schedule"):
+                await wait_for_slot(services, ticket, decoded, temp_file)
+            # Transcrição bloqueante executada fora do event loop
+            result = await run_in_threadpool(
+                run_transcription, services, temp_file, model_size, decoded, timer, language
+            )
+            succeeded = True
+        finally:
+            services.scheduler.release(ticket, succeeded)
+
+        return {
+            "filename": file.filename,
+            "text": result["corrected_text"],
+            "status": "success",
+            "processing_time": timer.get_summary()
+        }
+
+    except Exception as e:
+        timing_summary = timer.get_summary()
+        return {
+            "status": "error",
+            "detail": e.detail if isinstance(e, HTTPException) else str(e),
+            "processing_time": timing_summary
+        }
+
+async def _submit_job(services: Services, request: Request, temp_file: Path, filename: str, model_size: str,
+                      metadata: dict, language: Optional[str] = None) -> dict:
+    """
+    Decodifica o áudio (a duração estima o custo) e enfileira o job atrás da
+    vaga do agendador; o job transcreve o mesmo áudio decodificado (mapeado
+    em disco, sem ocupar memória na fila).
+    """
+    decoded = await decode_upload(services, temp_file)
+    ticket = admit(services, request, decoded, temp_file, model_size, enforce_limit=False)
+    try:
+        job = services.job_manager.submit(
+            run_transcription_job,
+            services,
+            temp_file,
+            filename,
+            model_size,
+            decoded,
+            ticket,
+            language,
+            metadata={**metadata, "client_id": ticket.client_id},
+            start_after=ticket.granted,
+            cleanup=lambda: discard_upload(services, temp_file, decoded, ticket)
+        )
+    except QueueFullError as e:
+        discard_upload(services, temp_file, decoded, ticket)
+        raise HTTPException(status_code=429, detail=str(e))
+    return {"job_id": job.id, "status": job.status, "scheduling": ticket.to_dict()}
+
+@router.post("/jobs", status_code=202)
+async def create_transcription_job(
+    request: Request,
+    file: UploadFile = File(...),
+    model_size: Optional[str] = "base",
+    language: Optional[str] = None,
+    services: Services = Depends(get_services)
+):
+    """
+    Enfileira uma transcrição e retorna imediatamente o id do job.
+    Retorna 429 quando a fila está cheia.
+    """
+    validate_upload(services, file.filename, model_size)
+    temp_file = await save_upload(services, file)
+    return await _submit_job(services, request, temp_file, file.filename, model_size,
+                             {"filename": file.filename, "model": model_size}, language)
+
+class UploadInit(BaseModel):
+    filename: str
+    size: int
+    part_size: Optional[int] = None
+    sha256: Optional[str] = None
+    model_size: str = "base"
+    language: Optional[str] = None
+
+def _upload_error(e: Exception) -> HTTPException:
+    """Converte os erros do protocolo de upload em respostas HTTP"""
+    if isinstance(e, UploadNotFoundError):
+        return HTTPException(status_code=404, detail="Upload não encontrado")
+    if isinstance(e, ChecksumMismatchError):
+        return HTTPException(status_code=422, detail=str(e))
+    if isinstance(e, IncompleteUploadError):
+        return HTTPException(status_code=409, detail=str(e))
+    return HTTPException(status_code=400, detail=str(e))
+
+@router.post("/uploads", status_code=201)
+async def init_upload(body: UploadInit, services: Services = Depends(get_services)):
+    """
+    Inicia um upload em partes. O cliente envia cada parte com
+    PUT /api/v1/uploads/{id}/parts/{n} (cabeçalho X-Content-SHA256 opcional),
+    consulta as partes faltantes com GET e conclui com POST .../complete.
+    """
+    validate_upload(services, body.filename, body.model_size)
+    try:
+        return await run_in_threadpool(
+            services.upload_store.init, body.filename, body.size, body.part_size, body.sha256,
+            {"model_size": body.model_size, "language": body.language}
+        )
+    except UploadError as e:
+        raise _upload_error(e)
+
+@router.put("/uploads/{upload_id}/parts/{index}")
+async def upload_part(
+    upload_id: str,
+    index: int,
+    request: Request,
+    x_content_sha256: Optional[str] = Header(None),
+    services: Services = Depends(get_services)
+):
+    """Recebe uma parte (corpo bruto); reenviar a mesma parte a substitui"""
+    upload_store = services.upload_store
+    length = request.headers.get("content-length")
+    if length is not None:
+        try:
+            declared = int(length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cabeçalho Content-Length inválido")
+        if declared > upload_store.max_part_size:
+            raise HTTPException(status_code=413, detail="Parte maior que o máximo permitido")
+    # O cabeçalho pode faltar ou mentir: o limite vale para o corpo recebido
+    data = bytearray()
+    async for chunk in request.stream():
+        data.extend(chunk)
+        if len(data) > upload_store.max_part_size:
+            raise HTTPException(status_code=413, detail="Parte maior que o máximo permitido")
+    data = bytes(data)
+    try:
+        return await run_in_threadpool(upload_store.write_part, upload_id, index, data, x_content_sha256)
+    except (UploadError, UploadNotFoundError) as e:
+        raise _upload_error(e)
+
+@router.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str, services: Services = Depends(get_services)):
+    """Partes recebidas e faltantes, para retomar um envio interrompido"""
+    try:
+        return services.upload_store.status(upload_id)
+    except UploadNotFoundError as e:
+        raise _upload_error(e)
+
+@router.post("/uploads/{upload_id}/complete", status_code=202)
+async def complete_upload(upload_id: str, request: Request, services: Services = Depends(get_services)):
+    """Monta o arquivo e o enfileira para transcrição (retorna o id do job)"""
+    stats = services.job_manager.get_stats()
+    if stats["queued"] >= stats["max_queue_size"]:
+        # As partes continuam guardadas: o cliente pode tentar concluir depois
+        raise HTTPException(status_code=429, detail="Fila de transcrição cheia")
+    try:
+        upload = await run_in_threadpool(services.upload_store.complete, upload_id, services.settings.input_dir)
+    except (UploadError, UploadNotFoundError) as e:
+        raise _upload_error(e)
+
+    model_size = upload["metadata"].get("model_size", "base")
+    job = await _submit_job(
+        services, request, Path(upload["path"]), upload["filename"], model_size,
+        {"filename": upload["filename"], "model": model_size, "upload_id": upload_id},
+        upload["metadata"].get("language")
+    )
+    return {**job, "upload_id": upload_id}
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+async def abort_upload(upload_id: str, services: Services = Depends(get_services)):
+    """Cancela o upload e descarta as partes recebidas"""
+    try:
+        services.upload_store.abort(upload_id)
+    except UploadNotFoundError as e:
+        raise _upload_error(e)
+
+@router.get("/jobs/{job_id}")
+async def get_transcription_job(job_id: str, services: Services = Depends(get_services)):
+    """Retorna status, tempos e resultado de um job"""
+    job = services.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return job.to_dict()
+
+@router.get("/")
+async def root():
+    """Endpoint de verificação de saúde da API"""
+    return {"status": "online", "message": "API de Transcrição de Áudio"}
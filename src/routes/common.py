@@ -0,0 +1,104 @@
+"""Etapas comuns às rotas web e da API: validação, upload, decodificação e agendamento"""
+import asyncio
+import math
+from pathlib import Path
+from typing import Any, Dict
+
+from fastapi import HTTPException, Request, UploadFile
+from loguru import logger
+
+from ..core.audio import AudioDecodeError, DecodedAudio
+from ..core.jobs import current_job
+from ..core.scheduler import AdmissionRejectedError, RateLimitExceededError, Ticket
+from ..services import Services
+from ..utils.helpers import FileTooLargeError, save_upload_file
+
+
+def validate_upload(services: Services, filename: str, model: str) -> None:
+    """Valida a extensão do arquivo e o modelo pedido (ALLOWED_EXTENSIONS, ALLOWED_MODELS)"""
+    settings = services.settings
+    if Path(filename or "").suffix.lower() not in settings.allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato de arquivo não suportado. Use: {', '.join(settings.allowed_extensions)}"
+        )
+    if model not in settings.allowed_models:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Modelo não suportado. Use: {', '.join(settings.allowed_models)}"
+        )
+
+
+async def save_upload(services: Services, file: UploadFile) -> Path:
+    """Grava o upload em INPUT_DIR, aplicando MAX_FILE_SIZE_MB durante a leitura"""
+    try:
+        return await save_upload_file(file, services.settings.input_dir, max_size=services.settings.max_file_size)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
+async def decode_upload(services: Services, temp_file: Path) -> DecodedAudio:
+    """Decodifica e valida o upload antes de ele ocupar um modelo"""
+    try:
+        return await asyncio.wrap_future(services.audio_pipeline.submit(temp_file))
+    except AudioDecodeError as e:
+        temp_file.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def client_id(request: Request) -> str:
+    """Identificação do cliente nas cotas do agendador: cabeçalho X-Client-ID ou endereço remoto"""
+    return request.headers.get("X-Client-ID") or (request.client.host if request.client else "anonymous")
+
+
+def admit(services: Services, request: Request, decoded: DecodedAudio, temp_file: Path, model: str,
+          enforce_limit: bool = True) -> Ticket:
+    """
+    Estima o custo do áudio decodificado e o coloca na fila do agendador.
+    Pedidos recusados são liberados e o arquivo é removido.
+    """
+    try:
+        return services.scheduler.admit(client_id(request), decoded.duration, model, enforce_limit)
+    except (RateLimitExceededError, AdmissionRejectedError) as e:
+        decoded.close()
+        temp_file.unlink(missing_ok=True)
+        if isinstance(e, RateLimitExceededError):
+            raise HTTPException(status_code=429, detail=str(e),
+                                headers={"Retry-After": str(math.ceil(e.retry_after))})
+        if e.retry_after is None:
+            # Longo demais mesmo com o servidor ocioso: só um job em segundo plano aceita
+            raise HTTPException(status_code=413, detail=f"{e}. Use /jobs para áudios longos")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+
+
+async def wait_for_slot(services: Services, ticket: Ticket, decoded: DecodedAudio, temp_file: Path) -> None:
+    """Aguarda a vaga; se a requisição for abandonada no caminho, descarta o upload"""
+    try:
+        await services.scheduler.wait_async(ticket)
+    except BaseException:
+        decoded.close()
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
+def discard_upload(services: Services, temp_file: Path, decoded: DecodedAudio, ticket: Ticket) -> None:
+    """Limpeza de um job que não chegou a executar: libera a vaga, o áudio decodificado e o arquivo"""
+    services.scheduler.release(ticket, succeeded=False)
+    decoded.close()
+    temp_file.unlink(missing_ok=True)
+
+
+def index_job_result(services: Services, result: Dict[str, Any]) -> None:
+    """
+    Indexa o resultado do job em execução para a busca (/search), com o
+    "path" jobs/<job_id>/<arquivo>. Uma falha no índice não falha o job.
+    """
+    search_index = services.get_search_index()
+    job = current_job()
+    if search_index is None or job is None:
+        return
+    key = f"jobs/{job.id}/{Path(job.metadata.get('filename') or 'audio').name}"
+    try:
+        search_index.add_result(key, result)
+    except Exception as e:
+        logger.error(f"Erro ao indexar {key}: {e}")
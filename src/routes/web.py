@@ -0,0 +1,390 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
+from pathlib import Path
+from typing import Dict, Optional
+from pydantic import BaseModel
+import json
+import time
+from concurrent.futures import Future
+
+from loguru import logger
+
+from ..core.audio import DecodedAudio
+from ..core.model_pool import WARMUP_READY
+from ..core.jobs import QueueFullError, JOB_COMPLETED
+from ..core.segments import SegmentArray
+from ..core.scheduler import Ticket
+from ..core.metrics import StageTimer, PROMETHEUS_CONTENT_TYPE
+from ..services import Services, get_services
+from ..utils.subtitles import EXPORT_FORMATS
+from .common import (
+    admit, decode_upload, discard_upload, index_job_result, save_upload, validate_upload, wait_for_slot
+)
+
+router = APIRouter()
+
+class CorrectionsImport(BaseModel):
+    corrections: Dict[str, str]
+    replace: bool = False
+
+@router.get("/")
+async def home(request: Request):
+    """Render the home page"""
+    return request.app.state.templates.TemplateResponse("index.html", {"request": request})
+
+def _transcribe_file(services: Services, temp_file: Path, model: str, long_audio: bool = False, decoded=None,
+                     timer: Optional[StageTimer] = None, vad: Optional[bool] = None,
+                     word_timestamps: bool = False) -> dict:
+    """
+    Blocking transcription of a saved upload; always removes the file.
+    `decoded` is the pre-decoded audio (or a Future still being decoded);
+    `vad` overrides the silence filter (short audio only);
+    `word_timestamps` adds per-word timings to the segments.
+    """
+    timer = timer or StageTimer()
+    transcriber = services.transcriber
+    try:
+        if isinstance(decoded, Future):
+            # Corrupt files fail here, before any model is loaded
+            decoded = decoded.result()
+        if isinstance(decoded, DecodedAudio):
+            timer.record("decode", decoded.decode_seconds)
+
+        # Start transcription with timing
+        start_time = time.perf_counter()
+
+        options = {} if long_audio or vad is None else {"vad": vad}
+        if word_timestamps:
+            options["word_timestamps"] = True
+        transcribe = transcriber.transcribe_long if long_audio else transcriber.transcribe
+        transcription_result = transcribe(
+            decoded if decoded is not None else str(temp_file),
+            model_name=model,
+            timer=timer,
+            language="pt",
+            task="transcribe",
+            **options
+        )
+
+        processing_time = time.perf_counter() - start_time
+        if isinstance(decoded, DecodedAudio):
+            services.metrics.observe_realtime_factor(processing_time, decoded.duration)
+
+        # Add processing time and per-stage breakdown to result
+        transcription_result["processing_time"] = round(processing_time, 2)
+        transcription_result["timing"] = timer.get_summary()
+        logger.bind(
+            model=model,
+            audio_duration=round(decoded.duration, 3) if isinstance(decoded, DecodedAudio) else None,
+            processing_time=round(processing_time, 4),
+            stages={name: round(seconds, 4) for name, seconds in timer.steps.items()},
+        ).info("Transcription completed")
+
+        return transcription_result
+
+    finally:
+        # Cleanup
+        with timer.stage("cleanup"):
+            if isinstance(decoded, DecodedAudio):
+                decoded.close()
+            if temp_file.exists():
+                temp_file.unlink()
+
+@router.post("/upload")
+async def upload_file(request: Request, file: UploadFile = File(...), model: str = Form("base"),
+                      long_audio: bool = Form(False), vad: Optional[bool] = Form(None),
+                      services: Services = Depends(get_services)):
+    """
+    Handle file upload and transcription (with vad, the result reports the skipped silence).
+    The request waits for a scheduler slot; "scheduling" reports the estimate and the actual wait.
+    """
+    try:
+        validate_upload(services, file.filename, model)
+
+        timer = StageTimer()
+
+        # Stream file to a unique temporary path
+        with timer.stage("upload"):
+            temp_file = await save_upload(services, file)
+        decoded = await decode_upload(services, temp_file)
+        ticket = admit(services, request, decoded, temp_file, model)
+
+        succeeded = False
+        try:
+            with timer.stage("schedule"):
+                await wait_for_slot(services, ticket, decoded, temp_file)
+            # Run the blocking transcription off the event loop
+            result = await run_in_threadpool(
+                _transcribe_file, services, temp_file, model, long_audio, decoded, timer, vad
+            )
+            succeeded = True
+        finally:
+            services.scheduler.release(ticket, succeeded)
+        result["timing"] = timer.get_summary()
+        result["scheduling"] = ticket.to_dict()
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro na transcrição: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _stream_events(services: Services, temp_file: Path, model: str, decoded: DecodedAudio, timer: StageTimer,
+                   ticket: Ticket):
+    """Format transcription events as Server-Sent Events; always removes the file and frees the slot"""
+    start_time = time.perf_counter()
+    duration = decoded.duration
+    succeeded = False
+    try:
+        for event in services.transcriber.transcribe_stream(
+            decoded,
+            model_name=model,
+            timer=timer,
+            language="pt",
+            task="transcribe"
+        ):
+            if event["event"] == "done":
+                processing_time = time.perf_counter() - start_time
+                services.metrics.observe_realtime_factor(processing_time, duration)
+                event["result"]["processing_time"] = round(processing_time, 2)
+                event["result"]["timing"] = timer.get_summary()
+            yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        succeeded = True
+    except Exception as e:
+        logger.error(f"Erro na transcrição em streaming: {e}")
+        yield f"event: error\ndata: {json.dumps({'event': 'error', 'detail': str(e)}, ensure_ascii=False)}\n\n"
+    finally:
+        services.scheduler.release(ticket, succeeded)
+        with timer.stage("cleanup"):
+            decoded.close()
+            if temp_file.exists():
+                temp_file.unlink()
+
+@router.post("/upload/stream")
+async def upload_file_stream(request: Request, file: UploadFile = File(...), model: str = Form("base"),
+                             services: Services = Depends(get_services)):
+    """Handle file upload and stream each transcribed segment as it is produced"""
+    validate_upload(services, file.filename, model)
+    timer = StageTimer()
+    with timer.stage("upload"):
+        temp_file = await save_upload(services, file)
+    decoded = await decode_upload(services, temp_file)
+    timer.record("decode", decoded.decode_seconds)
+    ticket = admit(services, request, decoded, temp_file, model)
+    with timer.stage("schedule"):
+        await wait_for_slot(services, ticket, decoded, temp_file)
+    # Sync generators are iterated in the thread pool by Starlette; the
+    # background task frees the slot even if the stream never starts
+    return StreamingResponse(
+        _stream_events(services, temp_file, model, decoded, timer, ticket),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(services.scheduler.release, ticket)
+    )
+
+def _transcribe_job(services: Services, temp_file: Path, model: str, long_audio: bool, decoded, timer: StageTimer,
+                    word_timestamps: bool = False, ticket: Optional[Ticket] = None) -> dict:
+    """
+    Job version of _transcribe_file: the result is indexed for /search and
+    its segments are kept compact while the job is retained
+    """
+    succeeded = False
+    try:
+        result = _transcribe_file(services, temp_file, model, long_audio, decoded, timer,
+                                  word_timestamps=word_timestamps)
+        succeeded = True
+    finally:
+        if ticket is not None:
+            services.scheduler.release(ticket, succeeded)
+    index_job_result(services, result)
+    result["segments"] = SegmentArray(result.get("segments", []))
+    if ticket is not None:
+        result["scheduling"] = ticket.to_dict()
+    return result
+
+@router.post("/jobs", status_code=202)
+async def create_job(request: Request, file: UploadFile = File(...), model: str = Form("base"),
+                     long_audio: bool = Form(False), word_timestamps: bool = Form(False),
+                     services: Services = Depends(get_services)):
+    """
+    Queue a transcription job and return its id immediately, with the
+    scheduler's cost estimate and expected wait. Jobs are not bound by
+    MAX_TRANSCRIPTION_TIME_MINUTES but share the slots and client quotas.
+    """
+    validate_upload(services, file.filename, model)
+
+    timer = StageTimer()
+    with timer.stage("upload"):
+        temp_file = await save_upload(services, file)
+
+    # The duration is needed to estimate the cost before the job is accepted
+    decoded = await decode_upload(services, temp_file)
+    ticket = admit(services, request, decoded, temp_file, model, enforce_limit=False)
+    try:
+        job = services.job_manager.submit(
+            _transcribe_job,
+            services,
+            temp_file,
+            model,
+            long_audio,
+            decoded,
+            timer,
+            word_timestamps,
+            ticket,
+            metadata={"filename": file.filename, "model": model, "client_id": ticket.client_id},
+            start_after=ticket.granted,
+            cleanup=lambda: discard_upload(services, temp_file, decoded, ticket)
+        )
+    except QueueFullError as e:
+        discard_upload(services, temp_file, decoded, ticket)
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return {"job_id": job.id, "status": job.status, "scheduling": ticket.to_dict()}
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, services: Services = Depends(get_services)):
+    """Get status, timing and result of a transcription job"""
+    job = services.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/export")
+async def export_job(job_id: str, format: str = "srt", services: Services = Depends(get_services)):
+    """
+    Export a finished job as srt, vtt, jsonl (segments with word timestamps),
+    txt or json (full result); subtitle formats are streamed segment by segment,
+    with the dictionary corrections applied like the job's corrected_text.
+    """
+    job = services.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    if job.status != JOB_COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job ainda não concluído (status: {job.status})")
+    if format == "json":
+        return job.to_dict()["result"]
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato não suportado. Use: json, {', '.join(EXPORT_FORMATS)}"
+        )
+    writer, media_type = EXPORT_FORMATS[format]
+    stem = Path(job.metadata.get("filename") or job_id).stem
+    return StreamingResponse(
+        writer(services.transcriber.corrected_segments(job.result.get("segments", []))),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{stem}.{format}"'}
+    )
+
+@router.get("/search")
+async def search_transcripts(q: str, limit: int = 20, phrase: bool = False,
+                             services: Services = Depends(get_services)):
+    """
+    Search the indexed transcripts in output/ and the results of the server's
+    jobs (path jobs/<job_id>/<filename>), accent and case insensitive.
+    Returns the matching files with their segments, timestamps in milliseconds.
+    """
+    search_index = services.get_search_index()
+    if search_index is None:
+        raise HTTPException(status_code=503, detail="Índice de busca desabilitado")
+    try:
+        return await run_in_threadpool(search_index.search, q, max(1, min(limit, 200)), phrase)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/jobs")
+async def get_job_stats(services: Services = Depends(get_services)):
+    """Get queue depth, worker usage and the scheduler state"""
+    return {**services.job_manager.get_stats(), "scheduler": services.scheduler.get_stats()}
+
+@router.get("/system-info")
+async def get_system_info(services: Services = Depends(get_services)):
+    """Get system information including GPU availability"""
+    return services.transcriber.get_system_info()
+
+@router.get("/models")
+async def get_available_models(services: Services = Depends(get_services)):
+    """Get list of available Whisper models"""
+    return {"models": list(services.settings.allowed_models)}
+
+@router.get("/models/pool")
+async def get_model_pool_stats(services: Services = Depends(get_services)):
+    """Get hit/miss/load-time counters of the shared model pool"""
+    return services.model_pool.get_stats()
+
+@router.get("/metrics")
+async def get_metrics_endpoint(format: str = "prometheus", services: Services = Depends(get_services)):
+    """Stage latency percentiles, queue depth and realtime factor (Prometheus text or JSON)"""
+    if format == "json":
+        return services.metrics.snapshot()
+    return PlainTextResponse(services.metrics.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@router.get("/health")
+def health_check():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "healthy"}
+
+@router.get("/ready")
+def readiness_check(services: Services = Depends(get_services)):
+    """Readiness: startup finished and the warm-up models are loaded"""
+    startup_state = services.startup_state
+    ready = startup_state["started"] and services.warmup.status == WARMUP_READY
+    body = {
+        "status": "ready" if ready else "not_ready",
+        "started": startup_state["started"],
+        "ffmpeg": startup_state["ffmpeg"],
+        "warmup": services.warmup.to_dict(),
+        "loaded_models": services.model_pool.loaded_models(),
+    }
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+@router.get("/config")
+def get_config(services: Services = Depends(get_services)):
+    """Effective settings read from the environment and .env at startup"""
+    return services.settings.to_dict()
+
+@router.post("/add-correction")
+async def add_correction(wrong: str = Form(...), correct: str = Form(...),
+                         services: Services = Depends(get_services)):
+    """Adiciona uma nova correção ao dicionário personalizado"""
+    try:
+        await run_in_threadpool(services.transcriber.add_correction, wrong, correct)
+        return {"status": "success", "message": f"Correção adicionada: '{wrong}' -> '{correct}'"}
+    except Exception as e:
+        logger.error(f"Erro ao adicionar correção: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/corrections")
+async def export_corrections(services: Services = Depends(get_services)):
+    """Exporta o dicionário de correções"""
+    return {"corrections": services.transcriber.export_corrections()}
+
+@router.post("/corrections")
+async def import_corrections(payload: CorrectionsImport, services: Services = Depends(get_services)):
+    """Importa correções em lote com uma única escrita do dicionário"""
+    try:
+        total = await run_in_threadpool(
+            services.transcriber.import_corrections, payload.corrections, payload.replace
+        )
+        return {"status": "success", "imported": len(payload.corrections), "total_corrections": total}
+    except Exception as e:
+        logger.error(f"Erro ao importar correções: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/corrections/{wrong}")
+async def remove_correction(wrong: str, services: Services = Depends(get_services)):
+    """Remove uma correção do dicionário"""
+    await run_in_threadpool(services.transcriber.remove_correction, wrong)
+    return {"status": "success", "message": f"Correção removida: '{wrong}'"}
+
+@router.get("/correction-stats")
+async def get_correction_stats(services: Services = Depends(get_services)):
+    """Retorna estatísticas sobre as correções aplicadas"""
+    try:
+        return services.transcriber.get_correction_stats()
+    except Exception as e:
+        logger.error(f"Erro ao obter estatísticas: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,131 @@
+"""
+Componentes compartilhados pelas rotas da aplicação (web e API v1).
+
+Services é criado uma vez por create_app a partir das configurações: um
+único transcritor e pool de modelos, a fila de jobs, o agendador, o
+pipeline de decodificação e os uploads em partes servem os dois routers.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+
+from .config import Settings
+from .core.audio import AudioPipeline
+from .core.backends import get_inference_backend
+from .core.batching import get_micro_batcher
+from .core.inference_pool import get_inference_pool
+from .core.jobs import JobManager
+from .core.long_audio import LongAudioPool
+from .core.metrics import get_metrics
+from .core.model_pool import ModelPool, warmup_models_from_env
+from .core.result_cache import ResultCache
+from .core.scheduler import create_scheduler
+from .core.search_index import SearchIndex
+from .core.transcriber import AudioTranscriber
+from .core.uploads import ChunkedUploadStore
+
+
+class Services:
+    def __init__(self, settings: Settings):
+        """
+        Cria os componentes com as opções de `settings`. Nada pesado é
+        carregado aqui: os modelos vêm sob demanda ou pelo pré-carregamento
+        iniciado em start().
+        """
+        self.settings = settings
+        self.backend = get_inference_backend(settings)
+        self.model_pool = ModelPool(
+            max_memory_mb=settings.model_pool_max_memory_mb,
+            model_factory=self.backend.load_model,
+        )
+        self.result_cache = (
+            ResultCache(settings.result_cache_dir, settings.result_cache_memory_entries)
+            if settings.result_cache_enabled else None
+        )
+        inference_pool = get_inference_pool(self.model_pool, settings)
+        self.transcriber = AudioTranscriber(
+            model_name=settings.default_model,
+            model_pool=self.model_pool,
+            result_cache=self.result_cache or False,
+            inference_pool=inference_pool,
+            # Com o pool multiprocesso o micro-batcher não é usado (e sua thread atrapalharia o fork)
+            batcher=None if inference_pool else get_micro_batcher(self.model_pool, settings),
+            vad=settings.vad_enabled,
+            backend=self.backend,
+            # Workers das janelas de áudio longo, criados no primeiro uso e mantidos
+            long_audio_pool=LongAudioPool(
+                settings.long_audio_workers or None, self.backend.load_model, settings.model_pool_max_memory_mb
+            ),
+        )
+        self.warmup = warmup_models_from_env(self.model_pool, settings.default_model, settings.model_warmup)
+        self.job_manager = JobManager(max_workers=settings.job_workers, max_queue_size=settings.job_queue_size)
+        self.scheduler = create_scheduler(settings)
+        self.audio_pipeline = AudioPipeline(
+            workers=settings.decode_workers,
+            max_duration=settings.max_audio_duration_seconds,
+        )
+        self.upload_store = ChunkedUploadStore(
+            directory=settings.upload_dir,
+            max_size=settings.max_upload_size_mb * 1024 * 1024,
+            default_part_size=settings.upload_part_size_mb * 1024 * 1024,
+        )
+        self.metrics = get_metrics()
+        # Verificações de prontidão preenchidas na inicialização
+        self.startup_state: Dict[str, Any] = {"started": False, "ffmpeg": None}
+        self._search_index: Optional[SearchIndex] = None
+        self._search_index_lock = threading.Lock()
+
+    def get_search_index(self) -> Optional[SearchIndex]:
+        """Índice de busca (aberto no primeiro uso), ou None se desabilitado"""
+        if not self.settings.search_index_enabled:
+            return None
+        with self._search_index_lock:
+            if self._search_index is None:
+                self._search_index = SearchIndex(self.settings.search_index_path)
+            return self._search_index
+
+    def register_gauges(self) -> None:
+        """Gauges da fila, do agendador e do pool lidos a cada coleta de métricas"""
+        self.metrics.register_gauge(
+            "transcription_jobs_queued", lambda: self.job_manager.get_stats()["queued"], "Jobs aguardando execução"
+        )
+        self.metrics.register_gauge(
+            "transcription_jobs_running", lambda: self.job_manager.get_stats()["running"], "Jobs em execução"
+        )
+        self.metrics.register_gauge(
+            "scheduler_queued", lambda: self.scheduler.get_stats()["queued"], "Transcrições aguardando vaga no agendador"
+        )
+        self.metrics.register_gauge(
+            "model_pool_memory_mb", lambda: self.model_pool.memory_usage_mb(), "Memória estimada dos modelos carregados"
+        )
+
+    def start_inference_pool(self) -> None:
+        """
+        Carrega os pesos uma vez e cria os workers (fork) do pool multiprocesso,
+        se configurado. Chamado antes de qualquer outra thread ser criada.
+        """
+        if self.transcriber.inference_pool is not None:
+            self.transcriber.inference_pool.start()
+
+    def start(self) -> None:
+        """Cria os workers de inferência (se ainda não criados) e inicia o pré-carregamento"""
+        self.start_inference_pool()
+        self.warmup.start()
+
+    def shutdown(self) -> None:
+        """Encerra os workers e compacta o journal do dicionário"""
+        self.scheduler.shutdown()
+        self.job_manager.shutdown()
+        self.audio_pipeline.shutdown()
+        if self.transcriber.inference_pool is not None:
+            self.transcriber.inference_pool.shutdown()
+        if self.transcriber.batcher is not None:
+            self.transcriber.batcher.shutdown()
+        self.transcriber.long_audio_pool.shutdown()
+        self.transcriber.text_processor.flush()
+
+
+def get_services(request: Request) -> Services:
+    """Dependência das rotas: os componentes da aplicação que atende a requisição"""
+    return request.app.state.services
@@ -0,0 +1,234 @@
+import re
+import string
+from typing import Dict, List, Optional, Tuple
+
+# Pontuação que pode estar anexada às palavras ("(vc," -> "(", "vc", ",")
+PUNCTUATION = string.punctuation + "«»“”‘’„…–—¿¡"
+
+# Padrões comuns aplicados após as correções do dicionário
+COMMON_PATTERNS: Dict[str, str] = {
+    r'\b(\w+)(\s+)\1\b': r'\1',  # Remove palavras duplicadas
+    r'\s+': ' ',  # Remove espaços extras
+}
+
+_VALUE = object()
+
+
+class CorrectionEngine:
+    def __init__(self, corrections: Optional[Dict[str, str]] = None, patterns: Optional[Dict[str, str]] = None):
+        """
+        Motor de correção em passagem única: uma trie de tokens sobre o
+        dicionário personalizado permite corrigir expressões de várias
+        palavras, sempre preferindo a correspondência mais longa.
+
+        Args:
+            corrections (Dict[str, str]): Mapeamento incorreto -> correto
+            patterns (Dict[str, str]): Padrões regex -> substituição, compilados uma vez
+        """
+        self._trie: Dict = {}
+        self._max_phrase_words = 1
+        patterns = COMMON_PATTERNS if patterns is None else patterns
+        self._patterns: List[Tuple["re.Pattern", str]] = [
+            (re.compile(pattern), replacement) for pattern, replacement in patterns.items()
+        ]
+        # Com os padrões padrão, a remoção de duplicatas é feita sobre os tokens
+        self._default_patterns = patterns == COMMON_PATTERNS
+        for wrong, correct in (corrections or {}).items():
+            self.add(wrong, correct)
+
+    def add(self, wrong: str, correct: str) -> None:
+        """Adiciona (ou substitui) uma correção"""
+        words = wrong.lower().split()
+        if not words:
+            return
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node[_VALUE] = correct
+        self._max_phrase_words = max(self._max_phrase_words, len(words))
+
+    def remove(self, wrong: str) -> bool:
+        """Remove uma correção, podando os nós que ficarem vazios"""
+        words = wrong.lower().split()
+        path = []
+        node = self._trie
+        for word in words:
+            if word not in node:
+                return False
+            path.append((node, word))
+            node = node[word]
+        if _VALUE not in node:
+            return False
+        del node[_VALUE]
+        for parent, word in reversed(path):
+            if parent[word]:
+                break
+            del parent[word]
+        return True
+
+    def apply(self, text: str) -> str:
+        """Aplica as correções do dicionário e os padrões comuns ao texto"""
+        tokens = self._apply_dictionary(text)
+        if self._default_patterns:
+            return ' '.join(collapse_repeated_words(tokens))
+        return self._apply_patterns(tokens)
+
+    def apply_tokens(self, text: str) -> List[str]:
+        """Como apply, mas retorna os tokens do texto corrigido (reaproveitados pelas sugestões)"""
+        tokens = self._apply_dictionary(text)
+        if self._default_patterns:
+            return collapse_repeated_words(tokens)
+        return self._apply_patterns(tokens).split()
+
+    def _apply_patterns(self, tokens: List[str]) -> str:
+        text = ' '.join(tokens)
+        for pattern, replacement in self._patterns:
+            text = pattern.sub(replacement, text)
+        return text.strip()
+
+    def _apply_dictionary(self, text: str) -> List[str]:
+        """Retorna os tokens (sem espaços) do texto com as correções aplicadas"""
+        tokens = text.split()
+        trie = self._trie
+        if not trie:
+            return tokens
+
+        # Uma única chamada a lower() para o texto inteiro
+        lowered = text.lower().split()
+        if len(lowered) != len(tokens):
+            lowered = [token.lower() for token in tokens]
+
+        get = trie.get
+        max_words = self._max_phrase_words
+        output: List[str] = []
+        extend = output.extend
+        # Só visita em Python os tokens que podem casar: presentes na trie ou
+        # com pontuação/caracteres não alfanuméricos anexados
+        candidates = [i for i, low in enumerate(lowered) if low in trie or not low.isalnum()]
+        i = 0
+        total = len(tokens)
+        for position in candidates:
+            if position < i:
+                continue  # já consumido por uma expressão de várias palavras
+            if position > i:
+                extend(tokens[i:position])
+            i = position
+            low = lowered[i]
+            token = tokens[i]
+            node = get(low)
+            lead_len = trail_len = 0
+            if node is None:
+                # Tenta novamente sem a pontuação anexada à palavra
+                core = low.strip(PUNCTUATION)
+                if not core or core == low:
+                    output.append(token)
+                    i += 1
+                    continue
+                node = get(core)
+                if node is None:
+                    output.append(token)
+                    i += 1
+                    continue
+                lead_len = len(token) - len(token.lstrip(PUNCTUATION))
+                trail_len = len(token) - len(token.rstrip(PUNCTUATION))
+
+            best_value = node.get(_VALUE)
+            best_end = i + 1
+            best_trail = trail_len
+
+            # Estende a correspondência para expressões de várias palavras
+            if not trail_len and max_words > 1 and len(node) > (best_value is not None):
+                j = i + 1
+                while j < total and j - i < max_words:
+                    following = lowered[j]
+                    child = node.get(following)
+                    following_trail = 0
+                    if child is None:
+                        core = following.rstrip(PUNCTUATION)
+                        if not core or core == following:
+                            break
+                        child = node.get(core)
+                        if child is None:
+                            break
+                        following_trail = len(following) - len(core)
+                    node = child
+                    if _VALUE in node:
+                        best_value, best_end, best_trail = node[_VALUE], j + 1, following_trail
+                    if following_trail:
+                        break
+                    j += 1
+
+            if best_value is None:
+                output.append(token)
+                i += 1
+                continue
+
+            first_core = token[lead_len:len(token) - trail_len]
+            last_token = tokens[best_end - 1]
+            trail = last_token[len(last_token) - best_trail:] if best_trail else ''
+            extend(f"{token[:lead_len]}{_match_case(first_core, best_value)}{trail}".split())
+            i = best_end
+        extend(tokens[i:])
+        return output
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+_TRAILING_WORD = re.compile(r'\w+$')
+
+
+def collapse_repeated_words(tokens: List[str]) -> List[str]:
+    """
+    Equivalente, sobre tokens sem espaços, a aplicar
+    re.sub(r'\b(\w+)(\s+)\1\b', r'\1', ...) seguido de re.sub(r'\s+', ' ', ...)
+    ao texto unido por espaços, mas sem reescanear o texto inteiro.
+    """
+    total = len(tokens)
+    if total < 2:
+        return list(tokens)
+    # Pares que podem formar repetição: o seguinte começa com o anterior
+    # (tokens alfanuméricos) ou o anterior tem pontuação e precisa de verificação
+    candidates = [
+        k for k, (previous, token) in enumerate(zip(tokens, tokens[1:]), 1)
+        if token.startswith(previous) or not previous.isalnum()
+    ]
+    output: List[str] = []
+    extend = output.extend
+    last = 0
+    # Posição do último token a partir da qual uma nova repetição pode começar
+    # (o re.sub retoma a busca logo após o fim de cada substituição)
+    eligible_from = 0
+    for k in candidates:
+        if k > last:
+            extend(tokens[last:k])
+            eligible_from = 0
+        token = tokens[k]
+        last = k + 1
+        previous = output[-1]
+        if previous.isalnum():
+            word_start = 0
+        elif _is_word_char(previous[-1]):
+            word_start = _TRAILING_WORD.search(previous).start()
+        else:
+            word_start = -1
+        if word_start >= eligible_from:
+            size = len(previous) - word_start
+            if token.startswith(previous[word_start:]) and (len(token) == size or not _is_word_char(token[size])):
+                output[-1] = previous + token[size:]
+                eligible_from = len(previous)
+                continue
+        output.append(token)
+        eligible_from = 0
+    extend(tokens[last:])
+    return output
+
+
+def _match_case(original: str, correction: str) -> str:
+    """Preserva a capitalização original se possível"""
+    if original.isupper():
+        return correction.upper()
+    if original[:1].isupper():
+        return correction.capitalize()
+    return correction
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from loguru import logger
+
+OP_SET = "set"
+OP_DELETE = "delete"
+
+
+class DictionaryStore:
+    def __init__(self, path: Union[str, Path], compact_every: int = 500):
+        """
+        Persistência do dicionário personalizado: um snapshot JSON mais um
+        journal append-only com as alterações feitas desde o último snapshot.
+
+        Args:
+            path: Caminho do snapshot JSON
+            compact_every (int): Entradas no journal que disparam a compactação
+        """
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.compact_every = compact_every
+        self._journal_entries = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, str]:
+        """Lê o snapshot e reaplica o journal"""
+        data: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+        entries = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Última linha incompleta após uma queda: ignora
+                        logger.warning(f"Entrada inválida ignorada no journal {self.journal_path}")
+                        continue
+                    if entry.get("op") == OP_SET:
+                        data[entry["wrong"]] = entry["correct"]
+                    elif entry.get("op") == OP_DELETE:
+                        data.pop(entry["wrong"], None)
+                    entries += 1
+        self._journal_entries = entries
+        return data
+
+    def append(self, operations: Iterable[Tuple[str, str, Optional[str]]]) -> bool:
+        """
+        Registra operações (op, wrong, correct) no journal de forma durável.
+
+        Returns:
+            bool: True se o journal atingiu o limite e deve ser compactado
+        """
+        lines = []
+        for op, wrong, correct in operations:
+            entry = {"op": op, "wrong": wrong}
+            if op == OP_SET:
+                entry["correct"] = correct
+            lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        with self._lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_entries += len(lines)
+            return self._journal_entries >= self.compact_every
+
+    def compact(self, data: Dict[str, str]) -> None:
+        """Grava um novo snapshot atomicamente e descarta o journal"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".json.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_entries = 0
+
+    @property
+    def journal_entries(self) -> int:
+        return self._journal_entries
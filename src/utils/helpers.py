@@ -1,21 +1,104 @@
+import itertools
+import json
 import os
 import shutil
+import uuid
 from pathlib import Path
-from typing import Union, List
-import subprocess
+from typing import Dict, Union, List, Optional
+import aiofiles
 from loguru import logger
 import sys
 
-# Configure logger
-logger.remove()
-logger.add(
-    "logs/app.log",
-    rotation="500 MB",
-    retention="10 days",
-    level="INFO",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
-)
-logger.add(sys.stderr, level="INFO")
+from ..config import get_settings
+
+_logging_configured = False
+_sample_every = 100
+_sample_counters: Dict[str, "itertools.count"] = {}
+
+TEXT_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
+
+def _json_format(record) -> str:
+    """
+    Format a record as one JSON line. With enqueue=True this runs on the
+    logging thread, off the request path.
+    """
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "module": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        **{key: value for key, value in record["extra"].items() if key != "_json"},
+    }
+    if record["exception"] is not None:
+        entry["exception"] = repr(record["exception"].value)
+    record["extra"]["_json"] = json.dumps(entry, ensure_ascii=False, default=str)
+    return "{extra[_json]}\n"
+
+def configure_logging(log_file: Union[str, Path, None] = None, level: Optional[str] = None,
+                      json_format: Optional[bool] = None, enqueue: Optional[bool] = None,
+                      sample_every: Optional[int] = None) -> None:
+    """
+    Configure the log sinks (file + stderr). Called by the applications at
+    startup instead of at import time; repeated calls are ignored. Unset
+    arguments come from the process settings (get_settings()).
+    
+    Args:
+        log_file: Path of the rotating log file (default: LOG_FILE)
+        level: Minimum log level (default: LOG_LEVEL)
+        json_format: One JSON object per line in the file, with the bound
+            fields (job_id, model, audio_duration, stages...) (default: LOG_FORMAT=json)
+        enqueue: Write through a background queue so callers never block on
+            file I/O (default: LOG_ENQUEUE)
+        sample_every: Keep 1 of every N sampled high-frequency events (default: LOG_SAMPLE_EVERY)
+    """
+    global _logging_configured, _sample_every
+    if _logging_configured:
+        return
+    settings = get_settings()
+    log_file = log_file or settings.log_file
+    level = (level or settings.log_level).upper()
+    if json_format is None:
+        json_format = settings.log_json
+    if enqueue is None:
+        enqueue = settings.log_enqueue
+    _sample_every = max(1, sample_every or settings.log_sample_every)
+
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    logger.remove()
+    logger.add(
+        str(log_file),
+        rotation="500 MB",
+        retention="10 days",
+        level=level,
+        format=_json_format if json_format else TEXT_FORMAT,
+        enqueue=enqueue,
+    )
+    logger.add(sys.stderr, level=level, enqueue=enqueue)
+    _logging_configured = True
+
+def shutdown_logging() -> None:
+    """Wait for the queued log records to be written"""
+    logger.complete()
+
+def log_sampled(event: str, message: str, *args, level: str = "INFO", **fields) -> None:
+    """
+    Log a high-frequency event only once every LOG_SAMPLE_EVERY occurrences
+    (always the first one); the record carries the running count.
+    
+    Args:
+        event: Event name, also the sampling key
+        message: Message with {} placeholders, formatted only when emitted
+        level: Log level
+    """
+    counter = _sample_counters.get(event)
+    if counter is None:
+        counter = _sample_counters.setdefault(event, itertools.count(1))
+    occurrences = next(counter)
+    if (occurrences - 1) % _sample_every:
+        return
+    logger.bind(event=event, occurrences=occurrences, **fields).log(level, message, *args)
 
 def setup_directories(dirs: List[Union[str, Path]]) -> None:
     """
@@ -26,7 +109,7 @@ def setup_directories(dirs: List[Union[str, Path]]) -> None:
     """
     for dir_path in dirs:
         Path(dir_path).mkdir(parents=True, exist_ok=True)
-        logger.info(f"Directory ensured: {dir_path}")
+        logger.debug("Directory ensured: {}", dir_path)
 
 def safe_delete_file(file_path: Union[str, Path]) -> bool:
     """
@@ -41,7 +124,7 @@ def safe_delete_file(file_path: Union[str, Path]) -> bool:
     try:
         if os.path.exists(file_path):
             os.remove(file_path)
-            logger.info(f"Successfully deleted file: {file_path}")
+            log_sampled("file_deleted", "Successfully deleted file: {}", file_path, level="DEBUG")
             return True
     except Exception as e:
         logger.error(f"Error deleting file {file_path}: {str(e)}")
@@ -49,18 +132,16 @@ def safe_delete_file(file_path: Union[str, Path]) -> bool:
 
 def check_ffmpeg() -> bool:
     """
-    Check if FFmpeg is installed and accessible.
+    Check if FFmpeg is installed and accessible, without spawning it.
     
     Returns:
         bool: True if FFmpeg is available
     """
-    try:
-        subprocess.run(['ffmpeg', '-version'], capture_output=True)
+    if shutil.which('ffmpeg'):
         logger.info("FFmpeg is available")
         return True
-    except FileNotFoundError:
-        logger.error("FFmpeg not found in system PATH")
-        return False
+    logger.error("FFmpeg not found in system PATH")
+    return False
 
 def validate_audio_file(file_path: Union[str, Path]) -> bool:
     """
@@ -85,18 +166,75 @@ def validate_audio_file(file_path: Union[str, Path]) -> bool:
         
     return True
 
-def get_temp_path(filename: str) -> Path:
+class FileTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(
+            f"Arquivo muito grande. Tamanho máximo permitido: {max_size/1024/1024}MB"
+        )
+
+def get_temp_path(filename: str, directory: Union[str, Path] = "input") -> Path:
     """
-    Generate temporary file path.
+    Generate a unique temporary file path.
     
     Args:
         filename: Original filename
+        directory: Directory for the temporary file
         
     Returns:
         Path: Path object for temporary file
     """
-    temp_dir = Path("input")
-    return temp_dir / f"temp_{filename}"
+    temp_dir = Path(directory)
+    return temp_dir / f"temp_{uuid.uuid4().hex}_{Path(filename).name}"
+
+async def save_upload_file(
+    upload,
+    directory: Union[str, Path] = "input",
+    max_size: Optional[int] = None,
+    chunk_size: int = 1024 * 1024
+) -> Path:
+    """
+    Stream an uploaded file to a unique temporary path in chunks.
+    
+    Args:
+        upload: FastAPI/Starlette UploadFile
+        directory: Directory for the temporary file
+        max_size: Maximum size in bytes (None = unlimited)
+        chunk_size: Bytes read per chunk
+        
+    Returns:
+        Path: Path of the saved file
+        
+    Raises:
+        FileTooLargeError: If the upload exceeds max_size
+    """
+    # Reject early when the size is already known
+    known_size = getattr(upload, "size", None)
+    if max_size is not None and known_size is not None and known_size > max_size:
+        raise FileTooLargeError(max_size)
+
+    temp_path = get_temp_path(upload.filename, directory)
+    temp_path.parent.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if max_size is not None and written > max_size:
+                    raise FileTooLargeError(max_size)
+                await out.write(chunk)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+    return temp_path
 
 def clean_temp_files(directory: Union[str, Path]) -> None:
     """
@@ -0,0 +1,71 @@
+import json
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Tuple
+
+
+def format_timestamp(seconds: float, separator: str = ",") -> str:
+    """Formata segundos como HH:MM:SS,mmm (SRT) ou HH:MM:SS.mmm (VTT)"""
+    milliseconds = int(round(max(seconds, 0.0) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
+
+
+def iter_srt(segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Gera as legendas SRT bloco a bloco, sem montar o arquivo inteiro"""
+    for index, segment in enumerate(segments, 1):
+        separator = "\n" if index > 1 else ""
+        yield (
+            f"{separator}{index}\n"
+            f"{format_timestamp(segment['start'])} --> {format_timestamp(segment['end'])}\n"
+            f"{segment['text'].strip()}\n"
+        )
+
+
+def iter_vtt(segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Gera as legendas WebVTT bloco a bloco"""
+    yield "WEBVTT\n"
+    for segment in segments:
+        yield (
+            f"\n{format_timestamp(segment['start'], '.')} --> {format_timestamp(segment['end'], '.')}\n"
+            f"{segment['text'].strip()}\n"
+        )
+
+
+def iter_jsonl(segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Um segmento (com as palavras, se houver) por linha JSON"""
+    for segment in segments:
+        yield json.dumps(segment, ensure_ascii=False) + "\n"
+
+
+def iter_text(segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Texto corrido, uma linha por segmento"""
+    for segment in segments:
+        yield segment["text"].strip() + "\n"
+
+
+# formato -> (gerador, content-type)
+EXPORT_FORMATS: Dict[str, Tuple[Callable[..., Iterator[str]], str]] = {
+    "srt": (iter_srt, "application/x-subrip"),
+    "vtt": (iter_vtt, "text/vtt"),
+    "jsonl": (iter_jsonl, "application/x-ndjson"),
+    "txt": (iter_text, "text/plain"),
+}
+
+
+def write_stream(chunks: Iterable[str], out: IO[str]) -> int:
+    """Grava os blocos à medida que são gerados; retorna o total de caracteres"""
+    written = 0
+    for chunk in chunks:
+        written += out.write(chunk)
+    return written
+
+
+def to_srt(segments: Iterable[Dict[str, Any]]) -> str:
+    """Converte segmentos (start, end, text) em legendas SRT"""
+    return "".join(iter_srt(segments))
+
+
+def to_vtt(segments: Iterable[Dict[str, Any]]) -> str:
+    """Converte segmentos (start, end, text) em legendas WebVTT"""
+    return "".join(iter_vtt(segments))
@@ -0,0 +1,205 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .correction_engine import PUNCTUATION
+
+# Repetições de até este número de palavras ("eu acho que eu acho que")
+MAX_REPEATED_WORDS = 4
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """Todas as variantes da palavra com até `distance` caracteres removidos"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Distância de Damerau-Levenshtein (transposições adjacentes), interrompida
+    assim que ultrapassa `limit` (retorna limit + 1).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SuggestionEngine:
+    def __init__(self, corrections: Optional[Dict[str, str]] = None, max_distance: int = 1,
+                 min_word_length: int = 4, low_confidence_logprob: float = -1.0,
+                 max_suggestions: int = 200, cache_size: int = 50000):
+        """
+        Sugestões de revisão geradas sobre os tokens já corrigidos, em uma
+        única passagem: repetições de palavras ou expressões, palavras a uma
+        pequena distância de edição de termos do dicionário (índice de
+        deleções simétricas) e segmentos com baixa confiança do Whisper.
+
+        O custo por token é constante: as consultas ao índice são memorizadas
+        por palavra (o vocabulário de uma transcrição é pequeno em relação ao
+        número de palavras) e o total de sugestões é limitado.
+
+        Args:
+            corrections (Dict[str, str]): Mapeamento incorreto -> correto
+            max_distance (int): Distância de edição máxima das sugestões
+            min_word_length (int): Palavras mais curtas não recebem sugestões por semelhança
+            low_confidence_logprob (float): avg_logprob abaixo do qual o segmento é sinalizado
+            max_suggestions (int): Limite de sugestões por texto
+            cache_size (int): Palavras memorizadas entre chamadas
+        """
+        self.max_distance = max_distance
+        self.min_word_length = min_word_length
+        self.low_confidence_logprob = low_confidence_logprob
+        self.max_suggestions = max_suggestions
+        self.cache_size = cache_size
+        # termo -> correção sugerida (a própria forma correta, para os valores)
+        self._terms: Dict[str, str] = {}
+        self._known: Set[str] = set()
+        self._index: Dict[str, Set[str]] = {}
+        self._cache: "OrderedDict[str, Optional[Tuple[str, int]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        for wrong, correct in (corrections or {}).items():
+            self.add(wrong, correct)
+
+    def add(self, wrong: str, correct: str) -> None:
+        """Indexa a forma incorreta e a correta (apenas termos de uma palavra)"""
+        wrong = wrong.lower()
+        if len(wrong.split()) == 1:
+            self._index_term(wrong, correct)
+        for word in correct.lower().split():
+            self._known.add(word)
+            self._index_term(word, word)
+        self._cache.clear()
+
+    def remove(self, wrong: str) -> None:
+        wrong = wrong.lower()
+        # Formas corretas de outras entradas continuam indexadas
+        if self._terms.get(wrong, wrong) == wrong:
+            return
+        del self._terms[wrong]
+        for variant in _deletes(wrong, self.max_distance):
+            terms = self._index.get(variant)
+            if terms is not None:
+                terms.discard(wrong)
+                if not terms:
+                    del self._index[variant]
+        self._cache.clear()
+
+    def _index_term(self, term: str, suggestion: str) -> None:
+        if len(term) < self.min_word_length - self.max_distance or not term.isalpha():
+            return
+        # Formas corretas têm prioridade sobre variantes incorretas
+        if self._terms.get(term) == term:
+            return
+        self._terms[term] = suggestion
+        for variant in _deletes(term, self.max_distance):
+            self._index.setdefault(variant, set()).add(term)
+
+    def lookup(self, word: str) -> Optional[Tuple[str, int]]:
+        """Correção sugerida para a palavra (minúscula) e a distância, ou None"""
+        with self._cache_lock:
+            if word in self._cache:
+                self._cache.move_to_end(word)
+                return self._cache[word]
+        match = None
+        if len(word) >= self.min_word_length and word.isalpha() and word not in self._known and word not in self._terms:
+            candidates: Set[str] = set()
+            for variant in _deletes(word, self.max_distance):
+                candidates.update(self._index.get(variant, ()))
+            best = None
+            for term in sorted(candidates):
+                distance = edit_distance(word, term, self.max_distance)
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (term, distance)
+            if best is not None:
+                match = (self._terms[best[0]], best[1])
+        with self._cache_lock:
+            self._cache[word] = match
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return match
+
+    def suggest(self, tokens: List[str], segments: Optional[Iterable[Dict]] = None) -> List[Dict]:
+        """
+        Sugestões para os tokens do texto corrigido e, se fornecidos, para os
+        segmentos do Whisper (baixa confiança).
+        """
+        suggestions: List[Dict] = []
+        words = [token.strip(PUNCTUATION).lower() for token in tokens]
+        total = len(words)
+        # Posições onde uma palavra reaparece a até MAX_REPEATED_WORDS de distância
+        repeat_starts: Set[int] = set()
+        for size in range(1, MAX_REPEATED_WORDS + 1):
+            repeat_starts.update(i for i, pair in enumerate(zip(words, words[size:])) if pair[0] == pair[1])
+        matches: Dict[str, Optional[Tuple[str, int]]] = {}
+        i = 0
+        while i < total and len(suggestions) < self.max_suggestions:
+            word = words[i]
+            if not word:
+                i += 1
+                continue
+            repeated = self._repetition_size(words, i) if i in repeat_starts else 0
+            if repeated:
+                suggestions.append({
+                    "type": "repetition",
+                    "original": " ".join(tokens[i:i + 2 * repeated]),
+                    "suggestion": " ".join(tokens[i:i + repeated]),
+                    "position": i,
+                })
+                i += 2 * repeated
+                continue
+            if word in matches:
+                match = matches[word]
+            else:
+                match = matches[word] = self.lookup(word)
+            if match is not None:
+                suggestions.append({
+                    "type": "similar_word",
+                    "original": tokens[i],
+                    "suggestion": match[0],
+                    "distance": match[1],
+                    "position": i,
+                })
+            i += 1
+
+        for segment in segments or ():
+            if len(suggestions) >= self.max_suggestions:
+                break
+            logprob = segment.get("avg_logprob")
+            if logprob is not None and logprob < self.low_confidence_logprob:
+                suggestions.append({
+                    "type": "low_confidence",
+                    "original": segment.get("text", "").strip(),
+                    "suggestion": None,
+                    "start": segment.get("start"),
+                    "end": segment.get("end"),
+                    "avg_logprob": round(logprob, 3),
+                })
+        return suggestions
+
+    @staticmethod
+    def _repetition_size(words: List[str], i: int) -> int:
+        """Tamanho da menor expressão em i repetida logo em seguida (0 = nenhuma)"""
+        word = words[i]
+        for size in range(1, MAX_REPEATED_WORDS + 1):
+            if i + 2 * size > len(words):
+                break
+            # Compara a expressão inteira só quando a primeira palavra se repete
+            if words[i + size] == word and words[i:i + size] == words[i + size:i + 2 * size]:
+                return size
+        return 0
@@ -1,94 +1,125 @@
-from typing import Dict, List
-import re
-import json
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
 from pathlib import Path
 from loguru import logger
+from .correction_engine import CorrectionEngine
+from .suggestion_engine import SuggestionEngine
+from .helpers import log_sampled
+from .dictionary_store import DictionaryStore, OP_SET, OP_DELETE
 
 class TextProcessor:
-    def __init__(self, custom_dict_path: str = None):
+    def __init__(self, custom_dict_path: str = None, compact_every: int = 500):
         self.custom_dict_path = custom_dict_path or Path("config/custom_dictionary.json")
+        self._lock = threading.RLock()
+        self._store = DictionaryStore(self.custom_dict_path, compact_every=compact_every)
         self.custom_dict: Dict[str, str] = self._load_custom_dictionary()
         self.common_patterns = {
             r'\b(\w+)(\s+)\1\b': r'\1',  # Remove palavras duplicadas
             r'\s+': ' ',  # Remove espaços extras
         }
+        self._engine = CorrectionEngine(self.custom_dict, self.common_patterns)
+        self._suggester = SuggestionEngine(self.custom_dict)
 
     def _load_custom_dictionary(self) -> Dict[str, str]:
-        """Carrega o dicionário personalizado de correções"""
+        """Carrega o dicionário personalizado de correções (snapshot + journal)"""
         try:
-            if Path(self.custom_dict_path).exists():
-                with open(self.custom_dict_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
+            return self._store.load()
         except Exception as e:
             logger.error(f"Erro ao carregar dicionário personalizado: {e}")
             return {}
 
     def save_custom_dictionary(self) -> None:
-        """Salva o dicionário personalizado em arquivo"""
-        Path(self.custom_dict_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(self.custom_dict_path, 'w', encoding='utf-8') as f:
-            json.dump(self.custom_dict, f, ensure_ascii=False, indent=2)
+        """Salva o dicionário personalizado em arquivo (escrita atômica)"""
+        with self._lock:
+            self._store.compact(dict(self.custom_dict))
 
     def add_correction(self, wrong: str, correct: str) -> None:
         """Adiciona uma nova correção ao dicionário"""
-        self.custom_dict[wrong.lower()] = correct
-        self.save_custom_dictionary()
-        logger.info(f"Adicionada correção: '{wrong}' -> '{correct}'")
+        with self._lock:
+            self.custom_dict[wrong.lower()] = correct
+            self._engine.add(wrong, correct)
+            self._suggester.add(wrong, correct)
+            if self._store.append([(OP_SET, wrong.lower(), correct)]):
+                self.save_custom_dictionary()
+        log_sampled("correction_added", "Adicionada correção: '{}' -> '{}'", wrong, correct)
 
     def remove_correction(self, wrong: str) -> None:
         """Remove uma correção do dicionário"""
-        if wrong.lower() in self.custom_dict:
+        with self._lock:
+            if wrong.lower() not in self.custom_dict:
+                return
             del self.custom_dict[wrong.lower()]
+            self._engine.remove(wrong)
+            self._suggester.remove(wrong)
+            if self._store.append([(OP_DELETE, wrong.lower(), None)]):
+                self.save_custom_dictionary()
+        log_sampled("correction_removed", "Removida correção para: '{}'", wrong)
+
+    def import_corrections(self, corrections: Dict[str, str], replace: bool = False) -> int:
+        """
+        Importa várias correções de uma vez, com uma única escrita em disco.
+        O dicionário e o motor de correção são trocados atomicamente, então
+        transcrições concorrentes nunca veem uma importação pela metade.
+        
+        Args:
+            corrections (Dict[str, str]): Mapeamento incorreto -> correto
+            replace (bool): Substitui o dicionário inteiro em vez de mesclar
+            
+        Returns:
+            int: Total de correções após a importação
+        """
+        with self._lock:
+            custom_dict = {} if replace else dict(self.custom_dict)
+            custom_dict.update({wrong.lower(): correct for wrong, correct in corrections.items()})
+            engine = CorrectionEngine(custom_dict, self.common_patterns)
+            suggester = SuggestionEngine(custom_dict)
+            self.custom_dict, self._engine, self._suggester = custom_dict, engine, suggester
             self.save_custom_dictionary()
-            logger.info(f"Removida correção para: '{wrong}'")
+        logger.info(f"Importadas {len(corrections)} correções")
+        return len(custom_dict)
+
+    def export_corrections(self) -> Dict[str, str]:
+        """Retorna uma cópia consistente do dicionário"""
+        with self._lock:
+            return dict(self.custom_dict)
+
+    def flush(self) -> None:
+        """Compacta o journal pendente no snapshot JSON"""
+        with self._lock:
+            if self._store.journal_entries:
+                self.save_custom_dictionary()
 
     def apply_corrections(self, text: str) -> str:
-        """Aplica todas as correções ao texto"""
-        # Aplica correções do dicionário personalizado
-        words = text.split()
-        corrected_words = []
-        
-        for word in words:
-            word_lower = word.lower()
-            if word_lower in self.custom_dict:
-                # Preserva capitalização original se possível
-                if word.isupper():
-                    corrected_words.append(self.custom_dict[word_lower].upper())
-                elif word[0].isupper():
-                    corrected_words.append(self.custom_dict[word_lower].capitalize())
-                else:
-                    corrected_words.append(self.custom_dict[word_lower])
-            else:
-                corrected_words.append(word)
-        
-        text = ' '.join(corrected_words)
-        
-        # Aplica padrões comuns de correção
-        for pattern, replacement in self.common_patterns.items():
-            text = re.sub(pattern, replacement, text)
-        
-        return text.strip()
+        """
+        Aplica todas as correções ao texto em uma única passagem, incluindo
+        expressões de várias palavras e palavras com pontuação anexada.
+        """
+        return self._engine.apply(text)
 
     def get_statistics(self) -> Dict:
         """Retorna estatísticas sobre as correções aplicadas"""
+        corrections = self.export_corrections()
         return {
-            "total_corrections": len(self.custom_dict),
-            "corrections": self.custom_dict
+            "total_corrections": len(corrections),
+            "corrections": corrections
         }
 
-    def suggest_corrections(self, text: str) -> List[Dict]:
-        """Sugere possíveis correções baseadas em padrões comuns"""
-        suggestions = []
-        words = text.split()
+    def correct_and_suggest(self, text: str, segments: Optional[Iterable[Dict]] = None) -> Tuple[str, List[Dict]]:
+        """
+        Aplica as correções e gera as sugestões sobre os mesmos tokens, sem
+        reprocessar o texto corrigido.
         
-        # Identifica palavras repetidas próximas
-        for i in range(len(words) - 1):
-            if words[i].lower() == words[i + 1].lower():
-                suggestions.append({
-                    "type": "repetition",
-                    "original": f"{words[i]} {words[i+1]}",
-                    "suggestion": words[i]
-                })
-        
-        return suggestions
+        Args:
+            text (str): Texto transcrito
+            segments: Segmentos do Whisper (com avg_logprob) para sinalizar trechos de baixa confiança
+            
+        Returns:
+            Tuple com o texto corrigido e a lista de sugestões
+        """
+        engine, suggester = self._engine, self._suggester
+        tokens = engine.apply_tokens(text)
+        return ' '.join(tokens), suggester.suggest(tokens, segments)
+
+    def suggest_corrections(self, text: str, segments: Optional[Iterable[Dict]] = None) -> List[Dict]:
+        """Sugere repetições, palavras parecidas com as do dicionário e trechos de baixa confiança"""
+        return self._suggester.suggest(text.split(), segments)
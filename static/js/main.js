@@ -41,10 +41,10 @@ document.addEventListener('DOMContentLoaded', function() {
             // Show progress UI
             uploadForm.classList.add('d-none');
             progressContainer.classList.remove('d-none');
-            updateProgress(50, 'Processando transcrição...');
+            updateProgress(0, 'Enviando arquivo...');
 
-            // Upload and process file
-            const response = await fetch('/upload', {
+            // Upload and stream segments as they are transcribed
+            const response = await fetch('/upload/stream', {
                 method: 'POST',
                 body: formData
             });
@@ -53,11 +53,43 @@ document.addEventListener('DOMContentLoaded', function() {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
-            const data = await response.json();
+            resultContainer.classList.remove('d-none');
+            transcriptionResult.innerHTML = `
+                <div class="card mb-3">
+                    <div class="card-header">
+                        <h5>Transcrição em andamento</h5>
+                    </div>
+                    <div class="card-body">
+                        <div id="liveSegments"></div>
+                    </div>
+                </div>
+            `;
+            const liveSegments = document.getElementById('liveSegments');
+            let data = null;
+
+            await readEventStream(response, (eventName, payload) => {
+                if (eventName === 'start') {
+                    updateProgress(0, `Transcrevendo ${formatTime(payload.duration || 0)} de áudio...`);
+                } else if (eventName === 'segment') {
+                    const line = document.createElement('p');
+                    line.className = 'mb-1';
+                    line.textContent = `[${formatTime(payload.start)} - ${formatTime(payload.end)}] ${payload.corrected_text}`;
+                    liveSegments.appendChild(line);
+                } else if (eventName === 'progress') {
+                    updateProgress(payload.progress, `Processando transcrição... ${Math.round(payload.progress)}%`);
+                } else if (eventName === 'done') {
+                    data = payload.result;
+                } else if (eventName === 'error') {
+                    throw new Error(payload.detail);
+                }
+            });
+
+            if (!data) {
+                throw new Error('Transcrição interrompida');
+            }
             
             // Show result
             updateProgress(100, 'Transcrição concluída!');
-            resultContainer.classList.remove('d-none');
             transcriptionResult.innerHTML = `
                 <div class="card mb-3">
                     <div class="card-header">
@@ -119,6 +151,44 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     // Helper functions
+    async function readEventStream(response, onEvent) {
+        // Parse Server-Sent Events from a fetch response body
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventName = 'message';
+                let dataLines = [];
+                frame.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) {
+                        eventName = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        dataLines.push(line.slice(5).trim());
+                    }
+                });
+                if (dataLines.length > 0) {
+                    onEvent(eventName, JSON.parse(dataLines.join('\n')));
+                }
+            }
+        }
+    }
+
+    function formatTime(seconds) {
+        const minutes = Math.floor(seconds / 60);
+        const secs = Math.floor(seconds % 60);
+        return `${String(minutes).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+    }
+
     function updateProgress(percent, message) {
         progressBar.style.width = `${percent}%`;
         progressBar.setAttribute('aria-valuenow', percent);
@@ -0,0 +1,21 @@
+import dataclasses
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def isolated_logging(tmp_path, monkeypatch):
+    """configure_logging grava em tmp_path; os handlers do loguru são restaurados ao final"""
+    from loguru import logger
+    from src import config
+    from src.utils import helpers
+
+    log_file = tmp_path / "logs" / "app.log"
+    monkeypatch.setattr(config, "_settings", dataclasses.replace(config.get_settings(), log_file=str(log_file)))
+    monkeypatch.setattr(helpers, "_logging_configured", False)
+    monkeypatch.setattr(helpers, "_sample_every", helpers._sample_every)
+    yield log_file
+    helpers.shutdown_logging()
+    logger.remove()
+    logger.add(sys.stderr)
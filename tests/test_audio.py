@@ -0,0 +1,58 @@
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio
+from src.core.audio import SAMPLE_RATE, AudioDecodeError, AudioPipeline, decode_audio
+from src.core.model_pool import ModelPool
+from src.core.transcriber import AudioTranscriber
+
+
+def write_wav(path, audio, channels=1):
+    samples = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+    if channels == 2:
+        samples = np.repeat(samples, 2)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+
+
+def test_decode_wav_in_process_to_memmap(tmp_path):
+    audio = make_synthetic_audio(3)
+    path = tmp_path / "a.wav"
+    write_wav(path, audio, channels=2)
+
+    decoded = decode_audio(path)
+    temp_dir = decoded._temp_dir
+    assert isinstance(decoded.samples, np.memmap)
+    assert decoded.duration == pytest.approx(3.0)
+    assert np.allclose(decoded.samples, audio, atol=1e-3)
+
+    decoded.close()
+    assert not os.path.exists(temp_dir)
+
+
+def test_decode_rejects_corrupt_and_too_long_files(tmp_path):
+    corrupt = tmp_path / "corrupt.wav"
+    corrupt.write_bytes(b"RIFF\x00\x00not really audio")
+    with pytest.raises(AudioDecodeError):
+        decode_audio(corrupt)
+
+    path = tmp_path / "long.wav"
+    write_wav(path, make_synthetic_audio(5))
+    with pytest.raises(AudioDecodeError):
+        AudioPipeline(workers=1, max_duration=2).submit(path).result()
+
+
+def test_transcribe_passes_decoded_samples_to_model(tmp_path):
+    path = tmp_path / "a.wav"
+    write_wav(path, make_synthetic_audio(10))
+    transcriber = AudioTranscriber(model_pool=ModelPool(model_factory=make_stub_factory()), result_cache=False)
+
+    with decode_audio(path) as decoded:
+        result = transcriber.transcribe(decoded)
+    assert result["original_text"]
@@ -0,0 +1,49 @@
+import pytest
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+from benchmarks.stub_model import make_stub_factory
+from src.core.backends import CPUInt8Backend, create_backend
+from src.core.model_pool import ModelPool
+from src.core.transcriber import AudioTranscriber
+
+
+def test_int8_backend_quantizes_linear_layers():
+    torch.manual_seed(0)
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=100, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+        n_vocab=100, n_text_ctx=16, n_text_state=64, n_text_head=2, n_text_layer=1,
+    )
+    model = Whisper(dims).eval()
+    mel = torch.randn(1, 80, 200)
+    with torch.no_grad():
+        expected = model.encoder(mel)
+
+    quantized = CPUInt8Backend().prepare(model)
+    query = quantized.encoder.blocks[0].attn.query
+    assert type(query) is torch.ao.nn.quantized.dynamic.Linear
+    with torch.no_grad():
+        features = quantized.encoder(mel)
+    assert features.shape == expected.shape
+    assert torch.nn.functional.cosine_similarity(features.flatten(), expected.flatten(), dim=0) > 0.95
+
+
+def test_backend_selects_inference_params():
+    transcriber = AudioTranscriber(
+        model_pool=ModelPool(model_factory=make_stub_factory()), result_cache=False, backend=CPUInt8Backend(2)
+    )
+    transcriber._device = "cuda"
+    assert transcriber._build_params({})["fp16"] is False
+    assert transcriber.get_system_info()["backend"]["intra_op_threads"] == 2
+    with pytest.raises(ValueError):
+        create_backend("onnx")
+
+
+def test_backend_only_transcriber_keeps_the_memory_budget(monkeypatch):
+    from src import config
+
+    monkeypatch.setattr(config, "_settings", config.Settings(model_pool_max_memory_mb=768))
+    backend = CPUInt8Backend()
+    transcriber = AudioTranscriber(result_cache=False, backend=backend)
+    assert transcriber.model_pool.max_memory_mb == 768
+    assert transcriber.model_pool.model_factory == backend.load_model
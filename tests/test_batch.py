@@ -0,0 +1,63 @@
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio, write_wav
+from src import config
+from src.batch import run_batch
+from src.config import Settings
+from src.utils.subtitles import to_srt, to_vtt
+
+
+def test_subtitle_formats():
+    segments = [{"start": 0.0, "end": 3661.5, "text": " olá"}]
+    assert to_srt(segments) == "1\n00:00:00,000 --> 01:01:01,500\nolá\n"
+    assert to_vtt(segments).startswith("WEBVTT\n\n00:00:00.000 --> 01:01:01.500\nolá")
+
+
+def test_run_batch_writes_outputs_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "_settings", Settings(result_cache_enabled=False))
+    input_dir = tmp_path / "input"
+    (input_dir / "sub").mkdir(parents=True)
+    write_wav(str(input_dir / "a.wav"), make_synthetic_audio(6))
+    write_wav(str(input_dir / "sub" / "b.wav"), make_synthetic_audio(4))
+    (input_dir / "notes.txt").write_text("ignorado")
+    output_dir = tmp_path / "output"
+
+    summary = run_batch(input_dir, output_dir, model_factory=make_stub_factory())
+    assert summary["transcribed"] == 2 and not summary["failed"]
+    assert summary["audio_seconds"] == 10.0
+    for suffix in ("txt", "json", "srt", "vtt"):
+        assert (output_dir / f"a_transcription.{suffix}").exists()
+        assert (output_dir / "sub" / f"b_transcription.{suffix}").exists()
+
+    summary = run_batch(input_dir, output_dir, model_factory=make_stub_factory())
+    assert summary["transcribed"] == 0 and summary["skipped"] == 2
+
+
+def test_run_batch_updates_search_index(tmp_path, monkeypatch):
+    from src.core.search_index import SearchIndex
+
+    monkeypatch.setattr(config, "_settings", Settings(result_cache_enabled=False))
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    write_wav(str(input_dir / "a.wav"), make_synthetic_audio(3))
+    index = SearchIndex(tmp_path / "index.db")
+    run_batch(input_dir, tmp_path / "output", model_factory=make_stub_factory(), search_index=index)
+    assert index.get_stats()["documents"] == 1
+
+
+def test_run_batch_uses_configured_backend_budget_and_extensions(tmp_path, monkeypatch):
+    from src import batch
+
+    monkeypatch.setattr(config, "_settings", Settings(
+        result_cache_enabled=False, allowed_extensions=(".wav",), inference_backend="cpu-int8",
+        model_pool_max_memory_mb=512,
+    ))
+    monkeypatch.setattr(batch, "_worker_transcriber", None)
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    write_wav(str(input_dir / "a.wav"), make_synthetic_audio(3))
+    write_wav(str(input_dir / "b.flac"), make_synthetic_audio(3))
+
+    summary = run_batch(input_dir, tmp_path / "output", model_factory=make_stub_factory())
+    assert summary["transcribed"] == 1
+    # Mesmo backend (e identidade no cache) e orçamento de memória do servidor
+    assert batch._worker_transcriber.backend.name == "cpu-int8"
+    assert batch._worker_transcriber.model_pool.max_memory_mb == 512
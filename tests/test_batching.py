@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio
+from src.core.batching import MicroBatcher
+from src.core.model_pool import ModelPool
+from src.core.transcriber import AudioTranscriber
+
+
+def test_concurrent_clips_share_one_pass_per_group():
+    pool = ModelPool(model_factory=make_stub_factory())
+    batcher = MicroBatcher(pool, max_batch_size=4, max_wait_ms=200)
+    clips = [make_synthetic_audio(3, seed=i) for i in range(4)]
+    try:
+        futures = [batcher.submit("base", clip, language="pt") for clip in clips]
+        futures.append(batcher.submit("base", clips[0], language="en"))
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        batcher.shutdown(wait=True)
+
+    # Os quatro clipes em "pt" completam um lote; "en" vai em outro, após a espera
+    assert pool.get("base").batch_sizes == [4, 1]
+    assert results[-1]["language"] == "en"
+    assert all(r["text"] for r in results)
+    assert batcher.get_stats()["mean_batch_size"] == 2.5
+
+
+def test_transcriber_routes_short_clips_through_batcher():
+    pool = ModelPool(model_factory=make_stub_factory())
+    batcher = MicroBatcher(pool, max_batch_size=3, max_wait_ms=500)
+    transcriber = AudioTranscriber(model_pool=pool, result_cache=False, batcher=batcher)
+    transcriber.text_processor.apply_corrections = lambda text: text
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(transcriber.transcribe, [make_synthetic_audio(5, seed=i) for i in range(3)]))
+        # Clipes acima da janela de 30 s seguem pelo caminho normal
+        long_result = transcriber.transcribe(make_synthetic_audio(40))
+    finally:
+        batcher.shutdown(wait=True)
+
+    assert pool.get("base").batch_sizes == [3]
+    assert len(results) == 3 and long_result["segments"][-1]["end"] == pytest.approx(40.0)
+    with pytest.raises(ValueError):
+        batcher.submit("base", np.zeros(31 * 16000, dtype=np.float32))
+
+
+def test_word_timestamps_bypass_batcher():
+    pool = ModelPool(model_factory=make_stub_factory())
+    batcher = MicroBatcher(pool, max_batch_size=2, max_wait_ms=10)
+    transcriber = AudioTranscriber(model_pool=pool, result_cache=False, batcher=batcher)
+    try:
+        result = transcriber.transcribe(make_synthetic_audio(12), word_timestamps=True)
+    finally:
+        batcher.shutdown(wait=True)
+
+    # O lote devolveria um único segmento sem palavras; o caminho normal mantém os segmentos
+    assert pool.get("base").batch_sizes == []
+    assert len(result["segments"]) > 1
+    assert not MicroBatcher.supports({"language": "pt", "word_timestamps": True})
+    assert MicroBatcher.supports({"language": "pt", "task": "transcribe", "fp16": False, "word_timestamps": False})
@@ -0,0 +1,53 @@
+import pytest
+
+from src.config import Settings
+
+
+def test_settings_from_env_and_dotenv(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("DEFAULT_MODEL_SIZE=small\nJOB_WORKERS=4\nMAX_TRANSCRIPTION_TIME_MINUTES=2\n")
+    monkeypatch.setenv("JOB_WORKERS", "8")  # o ambiente prevalece sobre o .env
+    monkeypatch.setenv("ALLOWED_EXTENSIONS", ".wav, .OGG")
+    monkeypatch.setenv("VAD_ENABLED", "yes")
+    monkeypatch.setenv("MODEL_POOL_MAX_MEMORY_MB", "")
+    for name in ("DEFAULT_MODEL_SIZE", "MAX_TRANSCRIPTION_TIME_MINUTES"):
+        # setenv registra a variável para ser removida ao fim: o .env carregado não vaza para outros testes
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+
+    settings = Settings.from_env(env_file)
+    assert settings.default_model == "small"
+    assert settings.job_workers == 8
+    assert settings.max_transcription_seconds == 120
+    assert settings.allowed_extensions == (".wav", ".ogg")
+    assert settings.vad_enabled is True
+    assert settings.model_pool_max_memory_mb is None
+    assert settings.to_dict()["client_burst"] is None
+
+
+def test_invalid_number_is_reported(monkeypatch):
+    monkeypatch.setenv("JOB_WORKERS", "dois")
+    with pytest.raises(ValueError, match="JOB_WORKERS"):
+        Settings.from_env(None)
+
+
+def test_create_app_shares_components_between_routers(tmp_path):
+    from fastapi.testclient import TestClient
+
+    from src import config
+    from src.app_factory import create_app
+
+    previous = config._settings
+    try:
+        app = create_app(Settings(job_workers=1, upload_dir=str(tmp_path / "uploads"),
+                                  allowed_models=("tiny", "base")))
+        client = TestClient(app)
+        assert client.get("/config").json()["job_workers"] == 1
+        assert client.get("/models").json() == {"models": ["tiny", "base"]}
+        assert client.get("/jobs").json()["max_workers"] == 1
+        assert client.get("/api/v1/").json()["status"] == "online"
+        response = client.post("/api/v1/uploads", json={"filename": "a.wav", "size": 10, "model_size": "large"})
+        assert response.status_code == 400
+        app.state.services.shutdown()
+    finally:
+        config._settings = previous
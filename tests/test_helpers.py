@@ -0,0 +1,96 @@
+import asyncio
+import io
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from src.utils.helpers import save_upload_file, FileTooLargeError, get_temp_path
+
+
+def make_upload(data: bytes, filename: str = "audio.wav") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+def test_save_upload_file_streams_to_unique_paths(tmp_path):
+    data = b"x" * 10_000
+    first = asyncio.run(save_upload_file(make_upload(data), tmp_path, chunk_size=1024))
+    second = asyncio.run(save_upload_file(make_upload(data), tmp_path, chunk_size=1024))
+    assert first != second
+    assert first.read_bytes() == data
+    assert first.name.startswith("temp_") and first.name.endswith("_audio.wav")
+
+
+def test_save_upload_file_rejects_oversized_upload(tmp_path):
+    with pytest.raises(FileTooLargeError):
+        asyncio.run(save_upload_file(make_upload(b"x" * 5000), tmp_path, max_size=4096, chunk_size=1024))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_temp_path_strips_directories():
+    path = get_temp_path("../../etc/passwd", "input")
+    assert path.parent.name == "input"
+    assert path.name.endswith("_passwd")
+
+
+def test_structured_logging_and_sampling(tmp_path, monkeypatch):
+    import json
+
+    from loguru import logger
+    from src.utils import helpers
+
+    monkeypatch.setattr(helpers, "_logging_configured", False)
+    monkeypatch.setattr(helpers, "_sample_every", helpers._sample_every)
+    log_file = tmp_path / "app.log"
+    try:
+        helpers.configure_logging(log_file, json_format=True, enqueue=True, sample_every=10)
+        with logger.contextualize(job_id="abc"):
+            logger.bind(model="base", audio_duration=12.5, stages={"inference": 0.4}).info("Transcription completed")
+        for i in range(25):
+            helpers.log_sampled("test_event", "evento {}", i)
+        helpers.shutdown_logging()
+    finally:
+        logger.remove()
+        monkeypatch.setattr(helpers, "_logging_configured", False)
+        logger.add(__import__("sys").stderr)
+
+    records = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert records[0]["job_id"] == "abc" and records[0]["stages"] == {"inference": 0.4}
+    sampled = [r for r in records if r.get("event") == "test_event"]
+    assert [r["occurrences"] for r in sampled] == [1, 11, 21]
+    assert sampled[1]["message"] == "evento 10"
+
+
+def test_logging_defaults_come_from_settings(tmp_path, monkeypatch):
+    from loguru import logger
+    from src import config
+    from src.utils import helpers
+
+    (tmp_path / ".env").write_text("LOG_FILE=from_dotenv.log\nLOG_FORMAT=Text\nLOG_ENQUEUE=false\n")
+    monkeypatch.chdir(tmp_path)
+    for name in ("LOG_FILE", "LOG_FORMAT", "LOG_ENQUEUE"):
+        # setenv registra a variável para ser removida ao fim, apagando o que o .env carregou
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    monkeypatch.setattr(config, "_settings", config.Settings.from_env(tmp_path / ".env"))
+    monkeypatch.setattr(helpers, "_logging_configured", False)
+    monkeypatch.setattr(helpers, "_sample_every", helpers._sample_every)
+    try:
+        helpers.configure_logging()
+        logger.info("lido das configurações")
+    finally:
+        logger.remove()
+        monkeypatch.setattr(helpers, "_logging_configured", False)
+        logger.add(__import__("sys").stderr)
+
+    assert config.get_settings().log_json is False
+    assert "| INFO | lido das configurações" in (tmp_path / "from_dotenv.log").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("name, value", [("LOG_SAMPLE_EVERY", "0"), ("LOG_SAMPLE_EVERY", "dez"),
+                                         ("LOG_FORMAT", "xml"), ("LOG_LEVEL", "verbose")])
+def test_invalid_logging_settings_are_reported(monkeypatch, name, value):
+    from src.config import Settings
+
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match=name):
+        Settings.from_env(None)
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio
+from src.core.audio import open_audio
+from src.core.inference_pool import InferencePool
+from src.core.model_pool import ModelPool
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requer fork")
+
+
+def test_workers_share_model_loaded_by_parent(tmp_path):
+    loads = []
+    stub = make_stub_factory()
+
+    def factory(model_name, device=None):
+        loads.append(os.getpid())
+        return stub(model_name, device=device)
+
+    pool = InferencePool(2, ["base"], model_pool=ModelPool(model_factory=factory)).start()
+    try:
+        audio = open_audio(make_synthetic_audio(10), tmp_path / "audio.f32")
+        results = [pool.transcribe("base", audio, language="pt") for _ in range(4)]
+    finally:
+        pool.shutdown(wait=True)
+
+    # Carregado uma única vez, no processo pai; a inferência roda nos workers
+    assert loads == [os.getpid()]
+    assert all(r["worker_pid"] != os.getpid() for r in results)
+    # Os pids vêm dos próprios workers, informados na inicialização
+    worker_pids = pool.get_stats()["worker_pids"]
+    assert len(set(worker_pids)) == 2 and os.getpid() not in worker_pids
+    assert {r["worker_pid"] for r in results} <= set(worker_pids)
+    assert results[0]["text"] and isinstance(audio, np.memmap)
+
+
+def test_long_audio_windows_run_on_forked_workers():
+    from src.core.long_audio import transcribe_long_audio
+
+    pool = InferencePool(2, ["base"], model_pool=ModelPool(model_factory=make_stub_factory())).start()
+    try:
+        result = transcribe_long_audio(make_synthetic_audio(60), model_name="base", window_seconds=20,
+                                       overlap_seconds=1, search_seconds=4, pool=pool)
+    finally:
+        pool.shutdown(wait=True)
+    assert result["windows"] > 1 and result["workers"] == 2
+    assert abs(result["segments"][-1]["end"] - 60) < 1
+
+
+def test_services_skip_the_micro_batcher_with_forked_workers(tmp_path):
+    from src.config import Settings
+    from src.services import Services
+
+    services = Services(Settings(serving_processes=1, micro_batch_max_size=4, result_cache_enabled=False,
+                                 upload_dir=str(tmp_path / "uploads")))
+    try:
+        # Nenhuma thread do batcher ativa quando o fork acontecer na inicialização
+        assert services.transcriber.inference_pool is not None
+        assert services.transcriber.batcher is None
+    finally:
+        services.shutdown()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from src.core.jobs import JobManager, QueueFullError, JOB_COMPLETED, JOB_FAILED
+
+
+def wait_for(job, timeout=5):
+    deadline = time.time() + timeout
+    while job.status not in (JOB_COMPLETED, JOB_FAILED) and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_job_completes_with_result_and_timing():
+    manager = JobManager(max_workers=1, max_queue_size=4)
+    job = wait_for(manager.submit(lambda x: x * 2, 21))
+    data = job.to_dict()
+    assert data["status"] == JOB_COMPLETED
+    assert data["result"] == 42
+    assert data["timing"]["run_seconds"] is not None
+    manager.shutdown()
+
+
+def test_failed_job_reports_error():
+    manager = JobManager(max_workers=1)
+
+    def fail():
+        raise ValueError("arquivo corrompido")
+
+    job = wait_for(manager.submit(fail))
+    assert job.to_dict()["error"] == "arquivo corrompido"
+    manager.shutdown()
+
+
+def test_queue_full_raises():
+    manager = JobManager(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+    running = manager.submit(release.wait)
+    while running.status != "running":
+        time.sleep(0.01)
+    manager.submit(lambda: None)
+    with pytest.raises(QueueFullError):
+        manager.submit(lambda: None)
+    release.set()
+    manager.shutdown(wait=True)
+
+
+def test_job_waits_for_start_after():
+    from concurrent.futures import Future
+
+    manager = JobManager(max_workers=1)
+    gate = Future()
+    job = manager.submit(lambda: "ok", start_after=gate)
+    time.sleep(0.05)
+    assert job.status == "queued" and manager.get_stats()["queued"] == 1
+    gate.set_result(None)
+    assert wait_for(job).result == "ok"
+
+    cleaned = []
+    cancelled = Future()
+    job = manager.submit(lambda: "nunca", start_after=cancelled, cleanup=lambda: cleaned.append("cancelado"))
+    cancelled.cancel()
+    assert job.status == JOB_FAILED and manager.get_stats()["queued"] == 0
+
+    failed = Future()
+    job = manager.submit(lambda: "nunca", start_after=failed, cleanup=lambda: cleaned.append("falhou"))
+    failed.set_exception(RuntimeError("agendador encerrado"))
+    assert job.status == JOB_FAILED and cleaned == ["cancelado", "falhou"]
+    manager.shutdown()
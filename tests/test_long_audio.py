@@ -0,0 +1,82 @@
+import functools
+import os
+
+import numpy as np
+
+from benchmarks.stub_model import StubWhisperModel, make_stub_factory, make_synthetic_audio
+from src.core.long_audio import SAMPLE_RATE, LongAudioPool, plan_windows, stitch_results, transcribe_long_audio
+
+
+def _logged_stub(model_name, device=None, log_path=None):
+    """Fábrica stub que registra cada carregamento (com o pid do worker)"""
+    with open(log_path, "a") as log:
+        log.write(f"{os.getpid()}\n")
+    return StubWhisperModel(model_name)
+
+
+def test_plan_windows_cut_at_silence():
+    # 4 s de fala + 1 s de pausa: os cortes devem cair nas pausas
+    audio = make_synthetic_audio(60)
+    windows = plan_windows(audio, window_seconds=12, overlap_seconds=1, search_seconds=3)
+    assert windows[0][0] == 0
+    assert windows[-1][1] == len(audio)
+    for start, end in windows[:-1]:
+        cut_second = end / SAMPLE_RATE
+        assert cut_second % 5 >= 4  # dentro da pausa
+        assert end - start <= 12 * SAMPLE_RATE
+
+
+def test_stitch_results_deduplicates_overlap():
+    windows = [(0, 12 * SAMPLE_RATE), (10 * SAMPLE_RATE, 20 * SAMPLE_RATE)]
+    results = [
+        {"language": "pt", "segments": [
+            {"start": 0.0, "end": 5.0, "text": " bom dia a todos"},
+            {"start": 5.0, "end": 10.5, "text": " vamos começar a reunião"},
+            {"start": 10.5, "end": 12.0, "text": " de hoje"},
+        ]},
+        {"segments": [
+            {"start": 0.0, "end": 0.8, "text": " reunião de hoje"},
+            {"start": 1.2, "end": 6.0, "text": " a reunião de hoje sobre vendas"},
+        ]},
+    ]
+    stitched = stitch_results(windows, results)
+    assert stitched["text"] == "bom dia a todos vamos começar a reunião de hoje sobre vendas"
+    assert [s["start"] for s in stitched["segments"]] == [0.0, 5.0, 11.2]
+    assert stitched["language"] == "pt"
+
+
+def test_transcribe_long_audio_with_stub_model():
+    audio = make_synthetic_audio(120)
+    result = transcribe_long_audio(
+        audio,
+        model_name="stub",
+        model_factory=make_stub_factory(),
+        workers=2,
+        window_seconds=30,
+        overlap_seconds=2,
+        search_seconds=5,
+    )
+    starts = [s["start"] for s in result["segments"]]
+    assert result["windows"] > 1
+    assert starts == sorted(starts)
+    assert all(a["end"] <= b["start"] + 1e-6 for a, b in zip(result["segments"], result["segments"][1:]))
+    assert abs(result["duration"] - 120) < 0.01
+
+
+def test_long_audio_pool_keeps_worker_models_between_calls(tmp_path):
+    loads = tmp_path / "loads.txt"
+    pool = LongAudioPool(1, functools.partial(_logged_stub, log_path=str(loads)))
+    try:
+        for seed in (0, 1):
+            result = transcribe_long_audio(
+                make_synthetic_audio(60, seed=seed), model_name="stub", window_seconds=20,
+                overlap_seconds=1, search_seconds=4, pool=pool,
+            )
+            assert result["windows"] > 1 and result["segments"]
+        assert pool.get_stats()["running"]
+    finally:
+        pool.shutdown(wait=True)
+
+    # Um único processo, que carregou o modelo uma vez para as duas chamadas
+    pids = loads.read_text().split()
+    assert len(pids) == 1 and int(pids[0]) != os.getpid()
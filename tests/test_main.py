@@ -1,8 +1,24 @@
+import dataclasses
+import os
+import subprocess
+import sys
+import time
+
+import pytest
 from fastapi.testclient import TestClient
 from src.main import app
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def search_index(tmp_path, monkeypatch):
+    """Jobs concluídos são indexados: cada teste usa um índice próprio, fora de output/"""
+    from src.core.search_index import SearchIndex
+
+    index = SearchIndex(tmp_path / "index.db")
+    monkeypatch.setattr(app.state.services, "get_search_index", lambda: index)
+    return index
+
 def test_read_main():
     response = client.get("/")
     assert response.status_code == 200
@@ -12,3 +28,219 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
+
+def test_unknown_job():
+    response = client.get("/jobs/inexistente")
+    assert response.status_code == 404
+
+def test_metrics_endpoint():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "transcription_jobs_queued" in response.text
+    assert "gauges" in client.get("/metrics", params={"format": "json"}).json()
+
+def test_readiness_separate_from_liveness(isolated_logging, monkeypatch):
+    # O startup configura o logging com as configurações da aplicação
+    services = app.state.services
+    monkeypatch.setattr(services, "settings", dataclasses.replace(services.settings, log_file=str(isolated_logging)))
+    with TestClient(app) as started:
+        response = started.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["warmup"]["status"] == "ready"
+    assert isolated_logging.exists()
+
+def test_import_is_lazy_and_fast():
+    # Importar a aplicação não deve carregar torch/whisper nem o modelo
+    code = (
+        "import sys, time; start = time.perf_counter(); import src.main; "
+        "print(time.perf_counter() - start, 'torch' in sys.modules, 'whisper' in sys.modules)"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    seconds, torch_loaded, whisper_loaded = output.split()
+    assert torch_loaded == "False" and whisper_loaded == "False"
+    assert float(seconds) < float(os.getenv("IMPORT_TIME_TARGET_SECONDS", "3.0"))
+
+def test_export_finished_job(monkeypatch):
+    from src.core.jobs import JobManager, JOB_COMPLETED
+    from src.core.segments import SegmentArray
+
+    job_manager = JobManager(max_workers=1)
+    monkeypatch.setattr(app.state.services, "job_manager", job_manager)
+    # As legendas levam o texto corrigido, como o corrected_text do job
+    monkeypatch.setattr(app.state.services.transcriber.text_processor, "apply_corrections",
+                        lambda text: text.replace("olá", "oi"))
+
+    segments = [{"start": 0.0, "end": 1.5, "text": " olá", "avg_logprob": -0.2,
+                 "words": [{"word": " olá", "start": 0.1, "end": 1.2, "probability": 0.9}]}]
+    job = job_manager.submit(lambda: {"text": "olá", "segments": SegmentArray(segments)},
+                             metadata={"filename": "aula.mp3"})
+    for _ in range(500):
+        if job.status == JOB_COMPLETED:
+            break
+        time.sleep(0.01)
+
+    srt = client.get(f"/jobs/{job.id}/export", params={"format": "srt"})
+    assert srt.status_code == 200
+    assert srt.text == "1\n00:00:00,000 --> 00:00:01,500\noi\n"
+    assert 'filename="aula.srt"' in srt.headers["content-disposition"]
+    assert client.get(f"/jobs/{job.id}/export", params={"format": "vtt"}).text.startswith("WEBVTT")
+    jsonl = client.get(f"/jobs/{job.id}/export", params={"format": "jsonl"}).text
+    assert '"words"' in jsonl and '"original_text": " olá"' in jsonl
+    assert client.get(f"/jobs/{job.id}/export", params={"format": "json"}).json()["segments"][0]["words"]
+    assert client.get(f"/jobs/{job.id}/export", params={"format": "doc"}).status_code == 400
+    assert client.get("/jobs/inexistente/export").status_code == 404
+    job_manager.shutdown()
+
+def test_search_endpoint(tmp_path, monkeypatch):
+    import json
+    from src.core.search_index import SearchIndex
+
+    transcript = tmp_path / "a_transcription.json"
+    transcript.write_text(json.dumps({"segments": [{"start": 1.0, "end": 2.0, "text": " Sessão aberta"}]}))
+    index = SearchIndex(tmp_path / "index.db")
+    index.add_file(transcript)
+    monkeypatch.setattr(app.state.services, "get_search_index", lambda: index)
+
+    response = client.get("/search", params={"q": "sessao"})
+    assert response.status_code == 200
+    assert response.json()["files"][0]["segments"][0]["start_ms"] == 1000
+    assert client.get("/search", params={"q": "?"}).status_code == 400
+
+def test_upload_is_scheduled_and_rejected_past_limit(tmp_path, monkeypatch):
+    from benchmarks.stub_model import make_stub_factory, make_synthetic_audio, write_wav
+    from src.core.audio import AudioPipeline
+    from src.core.model_pool import ModelPool
+    from src.core.scheduler import FairScheduler
+    from src.core.transcriber import AudioTranscriber
+
+    services = app.state.services
+    monkeypatch.setattr(services, "transcriber", AudioTranscriber(
+        model_pool=ModelPool(model_factory=make_stub_factory()), result_cache=False))
+    scheduler = FairScheduler(max_concurrent=1, max_seconds=60, realtime_factors={"base": 1.0}, smoothing=0)
+    monkeypatch.setattr(services, "scheduler", scheduler)
+    monkeypatch.setattr(services, "audio_pipeline", AudioPipeline())
+    audio = tmp_path / "a.wav"
+    write_wav(str(audio), make_synthetic_audio(5))
+
+    with open(audio, "rb") as f:
+        response = client.post("/upload", files={"file": ("a.wav", f, "audio/wav")}, headers={"X-Client-ID": "x"})
+    assert response.status_code == 200
+    scheduling = response.json()["scheduling"]
+    assert scheduling["client_id"] == "x" and scheduling["estimated_seconds"] == 5.0
+    assert scheduler.get_stats()["running"] == 0
+
+    # Com uma vaga ocupada por 58s, mais 5s passariam do limite de 60s
+    busy = scheduler.admit("y", 58, "base")
+    with open(audio, "rb") as f:
+        response = client.post("/upload", files={"file": ("a.wav", f, "audio/wav")})
+    assert response.status_code == 503 and int(response.headers["retry-after"]) >= 1
+    scheduler.release(busy)
+
+def test_api_detects_language_and_decodes_jobs_once(tmp_path, monkeypatch):
+    from benchmarks.stub_model import make_stub_factory, make_synthetic_audio, write_wav
+    from src.core.audio import AudioPipeline
+    from src.core.jobs import JobManager
+    from src.core.model_pool import ModelPool
+    from src.core.scheduler import FairScheduler
+    from src.core.transcriber import AudioTranscriber
+
+    services = app.state.services
+    pool = ModelPool(model_factory=make_stub_factory())
+    calls = []
+    model = pool.get("base")
+    transcribe = model.transcribe
+    model.transcribe = lambda audio, **params: calls.append(params) or transcribe(audio, **params)
+    monkeypatch.setattr(services, "transcriber", AudioTranscriber(model_pool=pool, result_cache=False))
+    monkeypatch.setattr(services, "scheduler", FairScheduler(max_concurrent=1, client_max_concurrent=0))
+    monkeypatch.setattr(services, "job_manager", JobManager(max_workers=1))
+    pipeline = AudioPipeline()
+    submitted = []
+    submit = pipeline.submit
+    monkeypatch.setattr(pipeline, "submit", lambda path: submitted.append(path) or submit(path))
+    monkeypatch.setattr(services, "audio_pipeline", pipeline)
+    audio = tmp_path / "a.wav"
+    write_wav(str(audio), make_synthetic_audio(3))
+
+    # Como antes da unificação, a API não fixa o idioma: o modelo o detecta
+    with open(audio, "rb") as f:
+        response = client.post("/api/v1/transcribe", files={"file": ("a.wav", f, "audio/wav")})
+    assert response.json()["status"] == "success"
+    assert calls[-1]["language"] is None and calls[-1]["task"] == "transcribe"
+    with open(audio, "rb") as f:
+        client.post("/api/v1/transcribe", params={"language": "en"}, files={"file": ("a.wav", f, "audio/wav")})
+    assert calls[-1]["language"] == "en"
+
+    # O job reaproveita o áudio decodificado na admissão
+    submitted.clear()
+    with open(audio, "rb") as f:
+        job_id = client.post("/api/v1/jobs", files={"file": ("a.wav", f, "audio/wav")}).json()["job_id"]
+    for _ in range(500):
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.01)
+    assert job["status"] == "completed" and job["result"]["text"]
+    assert len(submitted) == 1 and not submitted[0].exists()
+    services.job_manager.shutdown()
+
+def test_full_queue_returns_429_and_discards_the_upload(tmp_path, monkeypatch):
+    from benchmarks.stub_model import make_synthetic_audio, write_wav
+    from src.core.audio import AudioPipeline
+    from src.core.jobs import QueueFullError
+    from src.core.scheduler import FairScheduler
+
+    services = app.state.services
+    scheduler = FairScheduler(max_concurrent=1)
+    monkeypatch.setattr(services, "scheduler", scheduler)
+    monkeypatch.setattr(services, "audio_pipeline", AudioPipeline())
+    uploads = []
+
+    def full_queue(fn, services, temp_file, *args, **kwargs):
+        # O arquivo já sumiu: a limpeza não pode esconder o 429
+        uploads.append(temp_file)
+        temp_file.unlink()
+        raise QueueFullError("Fila de transcrição cheia")
+
+    monkeypatch.setattr(services.job_manager, "submit", full_queue)
+    audio = tmp_path / "a.wav"
+    write_wav(str(audio), make_synthetic_audio(3))
+
+    for path in ("/jobs", "/api/v1/jobs"):
+        with open(audio, "rb") as f:
+            response = client.post(path, files={"file": ("a.wav", f, "audio/wav")})
+        assert response.status_code == 429
+    assert len(uploads) == 2 and not any(path.exists() for path in uploads)
+    assert scheduler.get_stats()["running"] == 0 and scheduler.get_stats()["queued"] == 0
+
+def test_job_results_are_indexed_for_search(tmp_path, monkeypatch, search_index):
+    from benchmarks.stub_model import make_stub_factory, make_synthetic_audio, write_wav
+    from src.core.audio import AudioPipeline
+    from src.core.jobs import JobManager
+    from src.core.model_pool import ModelPool
+    from src.core.scheduler import FairScheduler
+    from src.core.transcriber import AudioTranscriber
+
+    services = app.state.services
+    monkeypatch.setattr(services, "transcriber", AudioTranscriber(
+        model_pool=ModelPool(model_factory=make_stub_factory()), result_cache=False))
+    monkeypatch.setattr(services, "scheduler", FairScheduler(max_concurrent=1, client_max_concurrent=0))
+    monkeypatch.setattr(services, "job_manager", JobManager(max_workers=1))
+    monkeypatch.setattr(services, "audio_pipeline", AudioPipeline())
+    audio = tmp_path / "reuniao.wav"
+    write_wav(str(audio), make_synthetic_audio(6))
+
+    job_ids = []
+    for path in ("/jobs", "/api/v1/jobs"):
+        with open(audio, "rb") as f:
+            job_ids.append(client.post(path, files={"file": ("reuniao.wav", f, "audio/wav")}).json()["job_id"])
+    for job_id in job_ids:
+        for _ in range(500):
+            if client.get(f"/jobs/{job_id}").json()["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.01)
+
+    assert search_index.get_stats()["documents"] == 2
+    found = client.get("/search", params={"q": "trecho"}).json()["files"]
+    assert sorted(entry["path"] for entry in found) == sorted(f"jobs/{job_id}/reuniao.wav" for job_id in job_ids)
+    assert found[0]["segments"][0]["start_ms"] == 0
+    services.job_manager.shutdown()
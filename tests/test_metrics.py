@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from src.core.metrics import MetricsRegistry, StageTimer
+
+
+def test_stage_timer_records_sub_second_durations():
+    registry = MetricsRegistry()
+    timer = StageTimer(registry)
+    for _ in range(3):
+        with timer.stage("inference"):
+            time.sleep(0.01)
+    timer.record("decode", 0.25)
+
+    summary = timer.get_summary()
+    assert summary["steps"]["inference"]["step_duration"] >= 0.03
+    assert summary["steps"]["decode"]["step_duration"] == 0.25
+    stages = registry.snapshot()["histograms"]["transcription_stage_seconds"]
+    assert stages["stage=inference"]["count"] == 3
+
+
+def test_percentiles_and_prometheus_output():
+    registry = MetricsRegistry()
+    for value in range(1, 101):
+        registry.observe("latency", value / 100)
+    registry.observe_realtime_factor(5.0, 10.0)
+    registry.register_gauge("queue_depth", lambda: 4)
+
+    latency = registry.snapshot()["histograms"]["latency"]["total"]
+    assert latency["p50"] == pytest.approx(0.505)
+    assert latency["p99"] == pytest.approx(0.9901)
+
+    text = registry.render_prometheus()
+    assert "# TYPE latency summary" in text
+    assert 'latency{quantile="0.95"}' in text
+    assert "latency_count 100" in text
+    assert "transcription_realtime_factor_last 0.5" in text
+    assert "queue_depth 4.0" in text
+
+
+def test_prometheus_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.inc("requests", client='a"b\\c\nd')
+    assert 'requests{client="a\\"b\\\\c\\nd"} 1.0' in registry.render_prometheus()
@@ -0,0 +1,76 @@
+import threading
+
+from src.core.model_pool import ModelPool, ModelWarmup, WARMUP_FAILED, WARMUP_READY
+
+
+class StubModel:
+    def __init__(self, name):
+        self.name = name
+
+
+def make_factory(calls):
+    def factory(model_name, device=None):
+        calls.append(model_name)
+        return StubModel(model_name)
+    return factory
+
+
+def test_model_loaded_once():
+    calls = []
+    pool = ModelPool(model_factory=make_factory(calls))
+    first = pool.get("base")
+    second = pool.get("base")
+    assert first is second
+    assert calls == ["base"]
+    stats = pool.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["load_count"] == 1
+
+
+def test_lru_eviction_over_budget():
+    calls = []
+    # tiny=150 MB, base=290 MB, small=970 MB (estimativas)
+    pool = ModelPool(max_memory_mb=500, model_factory=make_factory(calls))
+    pool.get("tiny")
+    pool.get("base")
+    pool.get("tiny")  # tiny passa a ser o mais recente
+    pool.get("small")
+    assert pool.loaded_models() == ["small"]
+    assert pool.get_stats()["evictions"] == 2
+
+    pool = ModelPool(max_memory_mb=500, model_factory=make_factory(calls))
+    pool.get("base")
+    pool.get("tiny")
+    pool.get("base")
+    pool.get("tiny")
+    assert pool.loaded_models() == ["base", "tiny"]
+
+
+def test_concurrent_requests_share_single_load():
+    calls = []
+    pool = ModelPool(model_factory=make_factory(calls))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get("base"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ["base"]
+    assert all(r is results[0] for r in results)
+
+
+def test_warmup_loads_models_in_background():
+    calls = []
+    pool = ModelPool(model_factory=make_factory(calls))
+    warmup = ModelWarmup(pool, ["tiny", "base"]).start()
+    assert warmup.wait(timeout=5)
+    assert warmup.status == WARMUP_READY
+    assert pool.loaded_models() == ["tiny", "base"]
+
+    def broken(model_name, device=None):
+        raise RuntimeError("sem pesos")
+
+    failed = ModelWarmup(ModelPool(model_factory=broken), ["base"]).start()
+    assert not failed.wait(timeout=5)
+    assert failed.status == WARMUP_FAILED and "sem pesos" in failed.error
@@ -0,0 +1,57 @@
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio, write_wav
+from src.core.model_pool import ModelPool
+from src.core.result_cache import ResultCache
+from src.core.transcriber import AudioTranscriber
+from src.utils.text_processor import TextProcessor
+
+
+def test_cache_roundtrip_memory_and_disk(tmp_path):
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"RIFF....")
+    cache = ResultCache(tmp_path / "cache", max_memory_entries=1)
+    key = cache.make_key(audio, "base", {"language": "pt"})
+    assert key != cache.make_key(audio, "base", {"language": "en"})
+    assert cache.get(key) is None
+
+    cache.set(key, {"text": "olá"})
+    assert cache.get(key) == {"text": "olá"}
+
+    # Nova instância lê do disco
+    fresh = ResultCache(tmp_path / "cache")
+    assert fresh.get(key) == {"text": "olá"}
+    assert fresh.get_stats()["disk_hits"] == 1
+
+
+def test_transcriber_reuses_cached_result_and_reapplies_corrections(tmp_path):
+    audio_path = tmp_path / "audio.wav"
+    write_wav(str(audio_path), make_synthetic_audio(10))
+    pool = ModelPool(model_factory=make_stub_factory())
+    transcriber = AudioTranscriber(model_pool=pool, result_cache=ResultCache(tmp_path / "cache"))
+    transcriber.text_processor = TextProcessor(custom_dict_path=str(tmp_path / "dict.json"))
+
+    first = transcriber.transcribe(str(audio_path))
+    assert first["cached"] is False
+
+    transcriber.add_correction("trecho", "parte")
+    second = transcriber.transcribe(str(audio_path))
+    assert second["cached"] is True
+    assert pool.get("base").calls == 1
+    assert second["original_text"] == first["original_text"]
+    assert "parte" in second["corrected_text"]
+
+
+def test_other_backend_misses_the_cache(tmp_path):
+    from src.core.backends import CPUInt8Backend, InferenceBackend
+
+    audio_path = tmp_path / "audio.wav"
+    write_wav(str(audio_path), make_synthetic_audio(5))
+    cache = ResultCache(tmp_path / "cache")
+    pool = ModelPool(model_factory=make_stub_factory())
+    fp32 = AudioTranscriber(model_pool=pool, result_cache=cache, backend=InferenceBackend())
+    int8 = AudioTranscriber(model_pool=pool, result_cache=cache, backend=CPUInt8Backend())
+    fp32._device = int8._device = "cpu"
+
+    assert fp32.transcribe(str(audio_path))["cached"] is False
+    assert int8.transcribe(str(audio_path))["cached"] is False
+    assert int8.transcribe(str(audio_path))["cached"] is True
+    assert pool.get("base").calls == 2
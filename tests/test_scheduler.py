@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from src.core.scheduler import AdmissionRejectedError, FairScheduler, RateLimitExceededError
+
+
+def test_shortest_expected_first_across_clients():
+    scheduler = FairScheduler(max_concurrent=1, client_max_concurrent=0, aging_rate=0)
+    running = scheduler.admit("a", 60, "base")
+    assert running.granted.done()
+    long_job = scheduler.admit("b", 600, "base")
+    short_job = scheduler.admit("c", 10, "base")
+    assert short_job.expected_wait < long_job.expected_wait + short_job.cost
+
+    scheduler.release(running)
+    assert short_job.granted.done() and not long_job.granted.done()
+    scheduler.release(short_job)
+    assert long_job.granted.done()
+
+
+def test_aging_lets_long_jobs_through():
+    scheduler = FairScheduler(max_concurrent=1, client_max_concurrent=0, aging_rate=1.0)
+    running = scheduler.admit("a", 10, "base")
+    long_job = scheduler.admit("b", 600, "base")
+    long_job._created -= 120  # esperou 2 min: 60s de custo - 120s de envelhecimento
+    short_job = scheduler.admit("c", 100, "base")
+    scheduler.release(running)
+    assert long_job.granted.done() and not short_job.granted.done()
+
+
+def test_per_client_concurrency_quota():
+    scheduler = FairScheduler(max_concurrent=2, client_max_concurrent=1)
+    first = scheduler.admit("heavy", 300, "base")
+    second = scheduler.admit("heavy", 300, "base")
+    other = scheduler.admit("light", 600, "base")
+    assert first.granted.done() and other.granted.done()
+    assert not second.granted.done()
+    scheduler.release(first)
+    assert second.granted.done()
+
+
+def test_rate_limit_per_client():
+    scheduler = FairScheduler(max_concurrent=4, client_max_concurrent=0, client_rate_per_minute=60, client_burst=1)
+    scheduler.admit("a", 1, "tiny")
+    with pytest.raises(RateLimitExceededError) as error:
+        scheduler.admit("a", 1, "tiny")
+    assert 0 < error.value.retry_after <= 1
+    scheduler.admit("b", 1, "tiny")
+    assert scheduler.get_stats()["rate_limited"] == 1
+
+
+def test_rejects_work_past_the_time_limit():
+    scheduler = FairScheduler(max_concurrent=1, client_max_concurrent=0, max_seconds=60,
+                              realtime_factors={"base": 1.0})
+    with pytest.raises(AdmissionRejectedError) as error:
+        scheduler.admit("a", 120, "base")
+    assert error.value.retry_after is None
+
+    running = scheduler.admit("a", 50, "base")
+    with pytest.raises(AdmissionRejectedError) as error:
+        scheduler.admit("b", 30, "base")
+    assert error.value.retry_after == pytest.approx(20, abs=1)
+    # Jobs em segundo plano não têm limite de tempo
+    assert scheduler.admit("b", 30, "base", enforce_limit=False).expected_wait == pytest.approx(50, abs=1)
+    scheduler.release(running)
+
+
+def test_release_before_start_and_learned_factor():
+    scheduler = FairScheduler(max_concurrent=1, client_max_concurrent=0, realtime_factors={"base": 1.0},
+                              smoothing=1.0)
+    running = scheduler.admit("a", 10, "base")
+    waiting = scheduler.admit("b", 10, "base")
+    scheduler.release(waiting)
+    assert waiting.granted.cancelled() and scheduler.get_stats()["queued"] == 0
+
+    with scheduler.slot(running):
+        time.sleep(0.05)
+    assert scheduler.estimate_cost(100, "base") < 10
+
+
+def test_slot_blocks_threads_until_granted():
+    scheduler = FairScheduler(max_concurrent=1, client_max_concurrent=0)
+    first = scheduler.admit("a", 10, "base")
+    second = scheduler.admit("b", 10, "base")
+    order = []
+
+    def worker():
+        with scheduler.slot(second):
+            order.append("second")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    order.append("first")
+    scheduler.release(first)
+    thread.join(timeout=5)
+    assert order == ["first", "second"]
@@ -0,0 +1,69 @@
+import json
+import os
+
+import pytest
+
+from src.core.search_index import SearchIndex, main, normalize
+
+
+def write_transcript(path, segments):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"text": "", "segments": segments}, ensure_ascii=False), encoding="utf-8")
+
+
+def test_normalize_removes_accents():
+    assert normalize("Ação Rápida") == "acao rapida"
+
+
+def test_search_is_accent_insensitive_with_ms_timestamps(tmp_path):
+    output = tmp_path / "output"
+    write_transcript(output / "a_transcription.json", [
+        {"start": 0.0, "end": 2.5, "text": " Reunião de conformidade"},
+        {"start": 2.5, "end": 4.25, "text": " A auditoria começa amanhã"},
+    ])
+    write_transcript(output / "sub" / "b_transcription.json", [
+        {"start": 10.0, "end": 12.0, "text": " começa a reuniao"},
+    ])
+    (output / "c_transcription.txt").write_text("reunião sem segmentos", encoding="utf-8")
+    index = SearchIndex(tmp_path / "index.db")
+    assert index.update(output)["indexed"] == 3
+
+    result = index.search("REUNIAO")
+    assert result["total_segments"] == 3
+    first = result["files"][0]
+    assert first["path"].endswith("a_transcription.json")
+    assert first["segments"][0]["start_ms"] == 0 and first["segments"][0]["end_ms"] == 2500
+    assert index.search("começa auditoria")["total_segments"] == 1
+    assert index.search("a reunião", phrase=True)["files"][0]["path"].endswith("b_transcription.json")
+    with pytest.raises(ValueError):
+        index.search("!!")
+
+
+def test_incremental_update_and_rebuild(tmp_path, isolated_logging):
+    output = tmp_path / "output"
+    path = output / "a_transcription.json"
+    write_transcript(path, [{"start": 0.0, "end": 1.0, "text": " contrato"}])
+    index_path = tmp_path / "index.db"
+    index = SearchIndex(index_path)
+    assert index.add_file(path) and not index.add_file(path)
+
+    write_transcript(path, [{"start": 0.0, "end": 1.0, "text": " proposta revisada"}])
+    os.utime(path, ns=(1, 1))
+    assert index.update(output)["indexed"] == 1
+    assert index.search("contrato")["total_segments"] == 0
+    assert index.search("proposta")["total_segments"] == 1
+
+    path.unlink()
+    assert index.update(output)["removed"] == 1
+    assert index.get_stats()["documents"] == 0
+
+    write_transcript(output / "b_transcription.json", [{"start": 1.0, "end": 2.0, "text": " novo"}])
+    assert main([str(output), "--index", str(index_path), "--rebuild"]) == 0
+    assert SearchIndex(index_path).search("novo")["total_segments"] == 1
+
+    # Um arquivo inválido não impede a indexação dos demais
+    (output / "c_transcription.json").write_text("{", encoding="utf-8")
+    write_transcript(output / "d_transcription.json", [{"start": 0.0, "end": 1.0, "text": " ata"}])
+    summary = index.update(output, rebuild=True)
+    assert summary["failed"] == 1 and summary["indexed"] == 2
+    assert index.search("ata")["total_segments"] == 1
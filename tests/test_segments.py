@@ -0,0 +1,46 @@
+import math
+
+from src.core.segments import SegmentArray, estimate_confidence
+from src.utils.subtitles import iter_jsonl, iter_srt, to_srt, write_stream
+
+
+def make_segments():
+    return [
+        {"id": 0, "seek": 0, "start": 0.0, "end": 2.0, "text": " olá mundo", "avg_logprob": -0.1,
+         "no_speech_prob": 0.01, "tokens": [1, 2, 3],
+         "words": [{"word": " olá", "start": 0.0, "end": 0.8, "probability": 0.9},
+                   {"word": " mundo", "start": 0.9, "end": 2.0, "probability": 0.8}]},
+        {"id": 1, "seek": 0, "start": 2.0, "end": 6.0, "text": " tudo bem", "avg_logprob": -0.5},
+    ]
+
+
+def test_segment_array_round_trip():
+    array = SegmentArray(make_segments())
+    assert len(array) == 2 and array.has_words
+    first, second = array.to_list()
+    assert first["text"] == " olá mundo" and first["end"] == 2.0
+    assert [w["word"] for w in first["words"]] == [" olá", " mundo"]
+    assert first["words"][1]["probability"] == 0.8
+    assert "words" not in second and "no_speech_prob" not in second
+    assert "tokens" not in first
+    assert array[-1]["text"] == " tudo bem"
+    assert array.duration == 6.0
+    # Mesmas legendas que a lista original
+    assert to_srt(array) == to_srt(make_segments())
+
+
+def test_confidence_from_avg_logprob():
+    expected = math.exp((-0.1 * 2 + -0.5 * 4) / 6)
+    assert estimate_confidence(make_segments()) == round(expected, 4)
+    assert estimate_confidence([{"start": 0.0, "end": 1.0, "text": "x"}]) is None
+    assert estimate_confidence(None) is None
+
+
+def test_streaming_writers(tmp_path):
+    array = SegmentArray(make_segments())
+    path = tmp_path / "out.srt"
+    with open(path, "w", encoding="utf-8") as out:
+        written = write_stream(iter_srt(array), out)
+    assert written == len(path.read_text(encoding="utf-8"))
+    lines = list(iter_jsonl(array))
+    assert len(lines) == 2 and '"words"' in lines[0]
@@ -0,0 +1,88 @@
+from src.utils.text_processor import TextProcessor
+
+
+def make_processor(tmp_path, corrections=None):
+    processor = TextProcessor(custom_dict_path=str(tmp_path / "dict.json"))
+    for wrong, correct in (corrections or {}).items():
+        processor.add_correction(wrong, correct)
+    return processor
+
+
+def test_corrections_preserve_case_and_punctuation(tmp_path):
+    processor = make_processor(tmp_path, {"vc": "você", "tbm": "também"})
+    assert processor.apply_corrections("Vc vai, tbm? VC (vc).") == "Você vai, também? VOCÊ (você)."
+
+
+def test_multi_word_phrases_prefer_longest_match(tmp_path):
+    processor = make_processor(tmp_path, {"a gente": "nós", "a gente vai": "vamos", "o q": "o que"})
+    assert processor.apply_corrections("a gente vai ver o q houve") == "vamos ver o que houve"
+    assert processor.apply_corrections("a gente, vai") == "nós, vai"
+    # Pontuação no meio interrompe a expressão
+    assert processor.apply_corrections("o, q") == "o, q"
+
+
+def test_engine_updated_incrementally(tmp_path):
+    processor = make_processor(tmp_path, {"a gente": "nós"})
+    processor.remove_correction("a gente")
+    assert processor.apply_corrections("a gente") == "a gente"
+    processor.add_correction("neh", "né")
+    assert processor.apply_corrections("isso neh neh") == "isso né"
+
+
+def test_collapse_repeated_words_matches_regex_patterns():
+    import random
+    import re
+    from src.utils.correction_engine import collapse_repeated_words
+
+    rng = random.Random(0)
+    alphabet = ["a", "b", "ab", "a_", "é", ".", "a.", "(a", ",", "a,a", "b.a", "1"]
+    for _ in range(5000):
+        tokens = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 2))) for _ in range(rng.randint(1, 6))]
+        text = " ".join(tokens)
+        expected = re.sub(r'\s+', ' ', re.sub(r'\b(\w+)(\s+)\1\b', r'\1', text)).strip()
+        assert " ".join(collapse_repeated_words(tokens)) == expected
+
+
+def test_journal_replayed_and_compacted(tmp_path):
+    path = tmp_path / "dict.json"
+    processor = TextProcessor(custom_dict_path=str(path), compact_every=3)
+    processor.add_correction("vc", "você")
+    processor.add_correction("tbm", "também")
+    assert not path.exists()  # apenas o journal foi gravado
+
+    # Um novo processo reconstrói o dicionário a partir do journal
+    assert TextProcessor(custom_dict_path=str(path)).export_corrections() == {"vc": "você", "tbm": "também"}
+
+    processor.remove_correction("vc")  # 3ª entrada: compacta
+    assert path.exists()
+    assert not path.with_suffix(".journal").exists()
+    assert TextProcessor(custom_dict_path=str(path)).export_corrections() == {"tbm": "também"}
+
+
+def test_import_corrections_merges_or_replaces(tmp_path):
+    processor = make_processor(tmp_path, {"vc": "você"})
+    total = processor.import_corrections({"TBM": "também", "pq": "porque"})
+    assert total == 3
+    assert processor.apply_corrections("vc tbm") == "você também"
+    processor.import_corrections({"pq": "porque"}, replace=True)
+    assert processor.export_corrections() == {"pq": "porque"}
+    assert TextProcessor(custom_dict_path=str(tmp_path / "dict.json")).export_corrections() == {"pq": "porque"}
+
+
+def test_suggestions_from_single_pass(tmp_path):
+    processor = make_processor(tmp_path, {"vc": "você", "reuniao": "reunião"})
+    segments = [
+        {"start": 0.0, "end": 2.0, "text": " vc tem reuniao", "avg_logprob": -0.2},
+        {"start": 2.0, "end": 4.0, "text": " amanhã cedo", "avg_logprob": -1.4},
+    ]
+    corrected, suggestions = processor.correct_and_suggest(
+        "vc tem reuniao amanhã, eu acho que eu acho que sim. A reunião da reuniã", segments
+    )
+    assert corrected == "você tem reunião amanhã, eu acho que eu acho que sim. A reunião da reuniã"
+    by_type = {s["type"]: s for s in suggestions}
+    assert by_type["repetition"]["suggestion"] == "eu acho que"
+    assert by_type["similar_word"]["original"] == "reuniã"
+    assert by_type["similar_word"]["suggestion"] == "reunião"
+    assert by_type["low_confidence"]["start"] == 2.0
+    # Palavras corretas do dicionário não são sinalizadas
+    assert [s["original"] for s in suggestions if s["type"] == "similar_word"] == ["reuniã"]
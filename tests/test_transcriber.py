@@ -0,0 +1,37 @@
+from benchmarks.stub_model import make_stub_factory, make_synthetic_audio
+from src.core.model_pool import ModelPool
+from src.core.transcriber import AudioTranscriber
+from src.utils.text_processor import TextProcessor
+
+
+def make_transcriber(tmp_path):
+    transcriber = AudioTranscriber(model_pool=ModelPool(model_factory=make_stub_factory()), result_cache=False)
+    transcriber.text_processor = TextProcessor(custom_dict_path=str(tmp_path / "dict.json"))
+    return transcriber
+
+
+def test_transcribe_stream_emits_segments_progress_and_result(tmp_path):
+    transcriber = make_transcriber(tmp_path)
+    transcriber.add_correction("trecho", "parte")
+    events = list(transcriber.transcribe_stream(make_synthetic_audio(90), window_seconds=30, overlap_seconds=2))
+
+    assert events[0]["event"] == "start"
+    assert events[0]["windows"] > 1
+    segments = [e for e in events if e["event"] == "segment"]
+    progress = [e["progress"] for e in events if e["event"] == "progress"]
+    assert segments and segments[0]["corrected_text"].startswith("parte")
+    assert progress == sorted(progress) and progress[-1] == 100.0
+    assert events[-1]["event"] == "done"
+    assert events[-1]["result"]["original_text"] == " ".join(s["text"] for s in segments)
+
+
+def test_stream_progress_rises_within_a_window(tmp_path):
+    transcriber = make_transcriber(tmp_path)
+    # 12 s cabem em uma única janela de 30 s, com segmentos de 5 s
+    events = list(transcriber.transcribe_stream(make_synthetic_audio(12, pause_seconds=0.0),
+                                                window_seconds=30, overlap_seconds=2))
+
+    assert events[0]["windows"] == 1
+    progress = [e["progress"] for e in events if e["event"] == "progress"]
+    assert progress[:3] == [41.7, 83.3, 100.0]
+    assert progress[0] < 100.0
@@ -0,0 +1,77 @@
+import hashlib
+import os
+
+import pytest
+
+from src.core.uploads import (
+    ChecksumMismatchError, ChunkedUploadStore, IncompleteUploadError, UploadNotFoundError
+)
+
+
+def test_parts_can_be_retried_and_assembled_in_place(tmp_path):
+    store = ChunkedUploadStore(tmp_path / "uploads", max_size=10_000)
+    data = os.urandom(2500)
+    session = store.init("reuniao.wav", len(data), part_size=1000, sha256=hashlib.sha256(data).hexdigest())
+    upload_id = session["upload_id"]
+    assert session["total_parts"] == 3
+
+    store.write_part(upload_id, 2, data[2000:])
+    with pytest.raises(ChecksumMismatchError):
+        store.write_part(upload_id, 0, data[:1000], sha256=hashlib.sha256(b"outro").hexdigest())
+    assert store.status(upload_id)["missing_parts"] == [0, 1]
+    with pytest.raises(IncompleteUploadError):
+        store.complete(upload_id, tmp_path / "temp")
+
+    # Reenvio da parte após a falha, fora de ordem
+    store.write_part(upload_id, 1, data[1000:2000], sha256=hashlib.sha256(data[1000:2000]).hexdigest())
+    store.write_part(upload_id, 0, data[:1000])
+    upload = store.complete(upload_id, tmp_path / "temp")
+
+    assert upload["path"].read_bytes() == data
+    assert upload["path"].name.endswith("_reuniao.wav")
+    with pytest.raises(UploadNotFoundError):
+        store.status(upload_id)
+
+
+def test_api_upload_protocol(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    monkeypatch.setattr(app.state.services, "upload_store", ChunkedUploadStore(tmp_path / "uploads", max_size=10_000))
+    client = TestClient(app)
+    response = client.post("/api/v1/uploads", json={"filename": "a.wav", "size": 1500, "part_size": 1000})
+    assert response.status_code == 201
+    upload_id = response.json()["upload_id"]
+
+    part = b"x" * 1000
+    bad = client.put(f"/api/v1/uploads/{upload_id}/parts/0", content=part, headers={"X-Content-SHA256": "0" * 64})
+    assert bad.status_code == 422
+    ok = client.put(
+        f"/api/v1/uploads/{upload_id}/parts/0", content=part,
+        headers={"X-Content-SHA256": hashlib.sha256(part).hexdigest()},
+    )
+    assert ok.status_code == 200
+    assert client.get(f"/api/v1/uploads/{upload_id}").json()["missing_parts"] == [1]
+    assert client.post(f"/api/v1/uploads/{upload_id}/complete").status_code == 409
+    assert client.delete(f"/api/v1/uploads/{upload_id}").status_code == 204
+    assert client.get(f"/api/v1/uploads/{upload_id}").status_code == 404
+    assert client.post("/api/v1/uploads", json={"filename": "a.wav", "size": 20_000}).status_code == 400
+
+
+def test_api_rejects_malformed_or_oversized_parts(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    store = ChunkedUploadStore(tmp_path / "uploads", max_size=10_000, max_part_size=1000)
+    monkeypatch.setattr(app.state.services, "upload_store", store)
+    client = TestClient(app)
+    upload_id = client.post("/api/v1/uploads", json={"filename": "a.wav", "size": 1500, "part_size": 1000}).json()["upload_id"]
+
+    url = f"/api/v1/uploads/{upload_id}/parts/0"
+    assert client.put(url, content=b"x" * 1000, headers={"Content-Length": "mil"}).status_code == 400
+    assert client.put(url, content=b"x" * 1000, headers={"Content-Length": "5000"}).status_code == 413
+    # Corpo em streaming (sem Content-Length): o limite vale para os bytes recebidos
+    assert client.put(url, content=iter([b"x" * 600, b"x" * 600])).status_code == 413
+    assert client.get(f"/api/v1/uploads/{upload_id}").json()["missing_parts"] == [0, 1]
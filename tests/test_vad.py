@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from benchmarks.stub_model import make_stub_factory
+from src.core.audio import SAMPLE_RATE
+from src.core.model_pool import ModelPool
+from src.core.transcriber import AudioTranscriber
+from src.core.vad import VoiceActivityDetector
+
+
+def _call_audio():
+    """20 s de silêncio, 6 s de fala, 30 s de silêncio e 4 s de fala"""
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 1e-4, 60 * SAMPLE_RATE).astype(np.float32)
+    for start, end in ((20, 26), (56, 60)):
+        audio[start * SAMPLE_RATE:end * SAMPLE_RATE] = rng.normal(0, 0.1, (end - start) * SAMPLE_RATE)
+    return audio
+
+
+def test_detects_speech_and_maps_timestamps_back():
+    detector = VoiceActivityDetector(padding_ms=0)
+    audio = _call_audio()
+    spans = detector.detect(audio)
+
+    assert [(round(s / SAMPLE_RATE), round(e / SAMPLE_RATE)) for s, e in spans] == [(20, 26), (56, 60)]
+    compacted, offsets = detector.compact(audio, spans)
+    assert len(compacted) == pytest.approx(10 * SAMPLE_RATE + detector.gap, abs=2 * detector.frame)
+    # 7 s no áudio compactado = 1 s dentro do segundo trecho (após 6 s + 0,3 s de pausa)
+    assert detector.to_original(7.3, spans, offsets) == pytest.approx(57.0, abs=0.05)
+    assert detector.summary(len(audio), spans)["skipped_seconds"] == pytest.approx(50.0, abs=0.1)
+
+
+def test_transcriber_skips_silence():
+    transcriber = AudioTranscriber(model_pool=ModelPool(model_factory=make_stub_factory()), result_cache=False)
+    transcriber.text_processor.apply_corrections = lambda text: text
+
+    result = transcriber.transcribe(_call_audio(), vad=True)
+    assert result["vad"]["skipped_seconds"] > 45
+    assert all(19.5 <= s["start"] <= s["end"] <= 60.5 for s in result["segments"])
+    assert result["segments"][-1]["start"] >= 55
+
+    silent = transcriber.transcribe(np.zeros(10 * SAMPLE_RATE, dtype=np.float32), vad=True)
+    assert silent["original_text"] == "" and silent["vad"]["speech_seconds"] == 0
+
+
+def test_audio_without_pauses_is_all_speech():
+    detector = VoiceActivityDetector()
+    rng = np.random.default_rng(1)
+    # Fala contínua com volume variando pouco: nenhum quadro é silêncio
+    envelope = 0.1 * (1 + 0.3 * np.sin(np.linspace(0, 40, 20 * SAMPLE_RATE)))
+    audio = (rng.normal(0, 1, 20 * SAMPLE_RATE) * envelope).astype(np.float32)
+    assert detector.detect(audio) == [(0, len(audio))]
+
+    transcriber = AudioTranscriber(model_pool=ModelPool(model_factory=make_stub_factory()), result_cache=False)
+    result = transcriber.transcribe(audio, vad=True)
+    assert result["original_text"] and result["vad"]["skipped_seconds"] == 0